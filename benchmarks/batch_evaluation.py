@@ -0,0 +1,33 @@
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from chess.batch_evaluation import PackedPositions, evaluate_batch, pack_positions
+from chess.bitboard import BitBoard
+from chess.perft import load_perft_positions
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure batched evaluation throughput.")
+    parser.add_argument("-n", "--positions", type=int, default=1_000_000,
+                        help="count of positions in the batch (default: 1000000)")
+    args = parser.parse_args(argv)
+
+    bitboards = [BitBoard.from_fen(position.fen) for position in load_perft_positions()]
+    started_at = time.perf_counter()
+    packed = pack_positions(bitboards * (args.positions // len(bitboards) + 1))
+    packed = PackedPositions(codes=packed.codes[:args.positions], turns=packed.turns[:args.positions])
+    seconds = time.perf_counter() - started_at
+    print(f"pack      {seconds:>8.2f}s {args.positions / seconds * 60:>14,.0f} positions/min")
+
+    started_at = time.perf_counter()
+    scores = evaluate_batch(packed)
+    seconds = time.perf_counter() - started_at
+    print(f"evaluate  {seconds:>8.2f}s {args.positions / seconds * 60:>14,.0f} positions/min")
+    assert len(scores) == args.positions and scores.dtype == np.int32
+
+
+if __name__ == "__main__":
+    main()
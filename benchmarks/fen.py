@@ -0,0 +1,36 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+from chess.bitboard import BitBoard
+from chess.game import Game
+from chess.perft import PERFT_POSITIONS_PATH, load_perft_positions
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure FEN parsing and export cost per position.")
+    parser.add_argument("-n", "--repeat", type=int, default=2000,
+                        help="times every position is parsed (default: 2000)")
+    parser.add_argument("--file", type=Path, default=PERFT_POSITIONS_PATH,
+                        help="EPD file with positions")
+    args = parser.parse_args(argv)
+
+    fens = [position.fen for position in load_perft_positions(args.file)] * args.repeat
+    for name, parse in (("BitBoard.from_fen", BitBoard.from_fen), ("Game.from_fen", Game.from_fen)):
+        started_at = time.perf_counter()
+        for fen in fens:
+            parse(fen)
+        seconds = time.perf_counter() - started_at
+        print(f"{name:<20} {seconds / len(fens) * 1e6:>8.1f} us/position")
+
+    games = [Game.from_fen(fen) for fen in fens[:len(fens) // args.repeat]] * args.repeat
+    started_at = time.perf_counter()
+    for game in games:
+        game.to_fen()
+    seconds = time.perf_counter() - started_at
+    print(f"{'Game.to_fen':<20} {seconds / len(games) * 1e6:>8.1f} us/position")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import random
+import tempfile
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Optional
+
+from chess.bitboard import STARTING_FEN, decode_move
+from chess.exceptions import CheckMate, Stalemate
+from chess.game import Game
+from chess.journal import DEFAULT_CHECKPOINT_INTERVAL, MoveJournal, recover_games
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare recovery of journaled games with replaying their moves by the rules.")
+    parser.add_argument("-g", "--games", type=int, default=20, help="played games (default: 20)")
+    parser.add_argument("-p", "--plies", type=int, default=100, help="moves per game at most (default: 100)")
+    parser.add_argument("-c", "--checkpoint-interval", type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help=f"moves between checkpoints (default: {DEFAULT_CHECKPOINT_INTERVAL})")
+    parser.add_argument("--seed", type=int, default=0, help="seed of random moves (default: 0)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    games: dict[int, list[int]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "games.journal"
+        started_at = time.perf_counter()
+        with MoveJournal(path, args.checkpoint_interval) as journal:
+            for game_id in range(1, args.games + 1):
+                game = Game.from_fen(STARTING_FEN)
+                journal.add_game(game_id, game)
+                moves = games[game_id] = []
+                for _ in range(args.plies):
+                    paths = game.legal_moves()
+                    if not paths:
+                        break
+                    move_path = rng.choice(paths)
+                    with suppress(CheckMate, Stalemate):
+                        game.move(move_path.from_, move_path.to, move_path.promotion)
+                    journal.record_move(game_id, game)
+                    moves.append(game.last_move)
+        plies = sum(map(len, games.values()))
+        print(f"played       {plies} moves in {len(games)} games, journal {path.stat().st_size}B "
+              f"in {time.perf_counter() - started_at:.2f}s")
+
+        started_at = time.perf_counter()
+        recovered = recover_games(path)
+        recovery_time = time.perf_counter() - started_at
+        print(f"recovery     {recovery_time * 1000:>10.1f}ms")
+
+    started_at = time.perf_counter()
+    for game_id, moves in games.items():
+        game = Game.from_fen(STARTING_FEN)
+        for move in moves:
+            move_path = decode_move(move)
+            with suppress(CheckMate, Stalemate):
+                game.move(move_path.from_, move_path.to, move_path.promotion)
+        assert game.to_fen() == recovered[game_id].to_fen()
+    replay_time = time.perf_counter() - started_at
+    print(f"Game.move    {replay_time * 1000:>10.1f}ms  {replay_time / recovery_time:.1f}x slower")
+
+
+if __name__ == "__main__":
+    main()
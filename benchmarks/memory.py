@@ -0,0 +1,32 @@
+import argparse
+import gc
+import tracemalloc
+from typing import Optional
+
+from chess.board import Board
+from chess.enums import Color
+from chess.game import Game
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure memory held by live started games.")
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="count of live games (default: 1000)")
+    args = parser.parse_args(argv)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = []
+    for _ in range(args.games):
+        game = Game(Board(), Color.WHITE)
+        game.start_game()
+        games.append(game)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{len(games)} games, {used / len(games):.0f} bytes per game")
+
+
+if __name__ == "__main__":
+    main()
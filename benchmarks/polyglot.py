@@ -0,0 +1,38 @@
+import argparse
+import random
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from chess.polyglot import OpeningBook
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure Polyglot book lookup time.")
+    parser.add_argument("-n", "--entries", type=int, default=1_000_000,
+                        help="entries of generated book (default: 1000000)")
+    parser.add_argument("--lookups", type=int, default=100_000,
+                        help="count of lookups (default: 100000)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    keys = sorted(rng.getrandbits(64) for _ in range(args.entries))
+    entry = struct.Struct(">QHHI")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "book.bin"
+        with open(path, "wb") as file:
+            file.writelines(entry.pack(key, 0, 1, 0) for key in keys)
+        with OpeningBook(path) as book:
+            for name, lookup_keys in (("hit", rng.choices(keys, k=args.lookups)),
+                                      ("miss", [rng.getrandbits(64) for _ in range(args.lookups)])):
+                started_at = time.perf_counter()
+                for key in lookup_keys:
+                    book.entries(key)
+                seconds = time.perf_counter() - started_at
+                print(f"{name:<5} {seconds / args.lookups * 1e6:>6.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
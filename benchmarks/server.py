@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from chess.server import GameServer, generate_load
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        path = args.unix
+        if args.port is None and path is None:
+            # No server address, so the server is run in this process on a Unix socket
+            path = str(Path(directory) / "chess.sock")
+            server = await GameServer().start(path=path)
+        report = await generate_load(args.games, args.moves, args.host, args.port or 0, path, seed=0)
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    print(f"{args.games} games, {report.moves} moves, {report.seconds:.2f}s, {report.moves_per_second:.0f} moves/s")
+    print(f"client p50 {report.p50 * 1000:.2f}ms  p99 {report.p99 * 1000:.2f}ms")
+    print(f"server {report.server_stats}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play random games against game server and measure move latency.")
+    parser.add_argument("-g", "--games", type=int, default=200,
+                        help="count of concurrent games (default: 200)")
+    parser.add_argument("-m", "--moves", type=int, default=40,
+                        help="max moves of every game (default: 40)")
+    parser.add_argument("--host", default="127.0.0.1", help="server host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="server port, server is started in this process if no address")
+    parser.add_argument("--unix", help="server Unix socket path")
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
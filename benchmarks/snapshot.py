@@ -0,0 +1,37 @@
+import argparse
+import pickle
+import time
+from typing import Callable, Optional
+
+from chess.game import Game
+from chess.perft import load_perft_positions
+
+
+def _measure(name: str, function: Callable[[], object], repeat: int) -> None:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    print(f"{name:<12} {(time.perf_counter() - started_at) / repeat * 1e6:>10.1f}us")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare game snapshot with pickle by size and speed.")
+    parser.add_argument("-n", "--repeat", type=int, default=200,
+                        help="encodings and decodings of every game (default: 200)")
+    args = parser.parse_args(argv)
+
+    games = [Game.from_fen(position.fen) for position in load_perft_positions()]
+    snapshots = [game.to_bytes() for game in games]
+    pickles = [pickle.dumps(game) for game in games]
+    print(f"size         {sum(map(len, snapshots)) / len(games):>10.1f}B snapshot  "
+          f"{sum(map(len, pickles)) / len(games):>10.1f}B pickle")
+    repeat = args.repeat
+    _measure("to_bytes", lambda: [game.to_bytes() for game in games], repeat)
+    _measure("pickle.dumps", lambda: [pickle.dumps(game) for game in games], repeat)
+    _measure("from_bytes", lambda: [Game.from_bytes(data) for data in snapshots], repeat)
+    _measure("pickle.loads", lambda: [pickle.loads(data) for data in pickles], repeat)
+    print(f"times are per {len(games)} games")
+
+
+if __name__ == "__main__":
+    main()
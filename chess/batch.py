@@ -0,0 +1,79 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Final, Iterable, Iterator, Optional
+
+from .pgn import PgnGame, ReplayResult, read_games, replay
+
+DEFAULT_CHUNK_SIZE: Final[int] = 64
+# Chunks submitted ahead per worker, keeps workers busy while results are merged.
+CHUNKS_PER_WORKER: Final[int] = 2
+
+
+def _replay_chunk(games: list[PgnGame]) -> list[ReplayResult]:
+    """Replays `games` in worker process.
+
+    Args:
+        games (list[PgnGame])
+
+    Returns:
+        list[ReplayResult]
+    """
+
+    return [replay(game) for game in games]
+
+
+def validate_games(games: Iterable[PgnGame], workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ReplayResult]:
+    """Replays `games` in a process pool and yields their results in input order.
+
+    Games are sent to workers in chunks of `chunk_size`. Larger chunks cost
+    less interprocess overhead per game, smaller ones balance load better.
+    Only `workers * CHUNKS_PER_WORKER` chunks are in flight at once, so
+    `games` may be a lazy stream of any length.
+
+    Args:
+        games (Iterable[PgnGame])
+        workers (Optional[int]): count of worker processes, CPU count if None
+        chunk_size (int): count of games sent to worker at once
+
+    Raises:
+        ValueError: raised if `chunk_size` or `workers` is not positive.
+
+    Yields:
+        ReplayResult
+    """
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if chunk_size < 1 or workers < 1:
+        raise ValueError("chunk_size and workers must be positive")
+    games = iter(games)
+    max_pending = workers * CHUNKS_PER_WORKER
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque[Future[list[ReplayResult]]] = deque()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(games, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_replay_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def validate_pgn(lines: Iterable[str], workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ReplayResult]:
+    """Reads games of PGN text and yields their results in input order.
+
+    Args:
+        lines (Iterable[str]): PGN lines, e.g. text file
+        workers (Optional[int]): count of worker processes, CPU count if None
+        chunk_size (int): count of games sent to worker at once
+
+    Returns:
+        Iterator[ReplayResult]
+    """
+
+    return validate_games(read_games(lines), workers, chunk_size)
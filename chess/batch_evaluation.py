@@ -0,0 +1,232 @@
+from typing import Final, Iterable, NamedTuple, Union
+
+import numpy as np
+
+from .bitboard import (BISHOP, BLACK, EMPTY, KNIGHT, PIECE_TYPES, QUEEN, ROOK,
+                       WHITE, BitBoard, color_index)
+from .board import Board
+from .enums import Color
+from .piece_square import PIECE_SQUARE_TABLES, PIECE_VALUES
+from .mailbox import Mailbox
+
+# Centipawns per square a piece can move to by piece type index.
+MOBILITY_WEIGHTS: Final[tuple[int, ...]] = (0, 4, 5, 2, 1, 0)
+
+_KNIGHT_STEPS: Final[tuple[tuple[int, int], ...]] = (
+    (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_BISHOP_STEPS: Final[tuple[tuple[int, int], ...]] = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+_ROOK_STEPS: Final[tuple[tuple[int, int], ...]] = ((0, 1), (1, 0), (0, -1), (-1, 0))
+_SLIDER_STEPS: Final[tuple[tuple[int, tuple[tuple[int, int], ...]], ...]] = (
+    (BISHOP, _BISHOP_STEPS), (ROOK, _ROOK_STEPS), (QUEEN, _BISHOP_STEPS + _ROOK_STEPS))
+# Mask of files a square may land on after move by `dx` columns, so moves don't wrap around the board.
+_FILE_MASKS: Final[dict[int, np.uint64]] = {
+    dx: np.uint64(sum(0x0101010101010101 << x for x in range(8) if 0 <= x - dx < 8)) for dx in range(-2, 3)}
+_BYTE_COUNTS: Final[np.ndarray] = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def _code_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Returns material and piece-square scores from white view indexed by `code + 1`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (13,) material and (13, 64) piece-square tables
+    """
+
+    material = np.zeros(13, dtype=np.int32)
+    piece_square = np.zeros((13, 64), dtype=np.int32)
+    mirrored = np.arange(64) ^ 56
+    for piece_type, (value, table) in enumerate(zip(PIECE_VALUES, PIECE_SQUARE_TABLES)):
+        material[1 + piece_type], material[7 + piece_type] = value, -value
+        piece_square[1 + piece_type] = table
+        piece_square[7 + piece_type] = -np.array(table)[mirrored]
+    return material, piece_square
+
+
+# Index 0 is EMPTY square, so codes are looked up as `table[codes + 1]`.
+_MATERIAL_TABLE, _PIECE_SQUARE_TABLE = _code_tables()
+_SQUARES: Final[np.ndarray] = np.arange(64)
+
+
+class PackedPositions(NamedTuple):
+    codes: np.ndarray  # (N, 64) int8 piece codes(color * 6 + piece type) or EMPTY by square
+    turns: np.ndarray  # (N,) int8 color index of side to move
+
+
+def pack_positions(positions: Iterable[Union[BitBoard, Mailbox]]) -> PackedPositions:
+    """Packs `positions` into arrays, one row per position.
+
+    Args:
+        positions (Iterable[Union[BitBoard, Mailbox]])
+
+    Returns:
+        PackedPositions
+    """
+
+    codes: list[list[int]] = []
+    turns: list[int] = []
+    for position in positions:
+        codes.append(position.piece_codes())
+        turns.append(color_index(position.turn))
+    return PackedPositions(codes=np.array(codes, dtype=np.int8).reshape(-1, 64),
+                           turns=np.array(turns, dtype=np.int8))
+
+
+def pack_boards(boards: Iterable[Board], turns: Iterable[Color]) -> PackedPositions:
+    """Packs pieces of `boards` into arrays, one row per board.
+
+    Args:
+        boards (Iterable[Board])
+        turns (Iterable[Color]): side to move of every board
+
+    Returns:
+        PackedPositions
+    """
+
+    rows: list[list[int]] = []
+    for board in boards:
+        row = [EMPTY] * 64
+        for piece in board.get_pieces():
+            pos = piece.pos
+            row[pos.y * 8 + pos.x] = color_index(piece.color) * 6 + PIECE_TYPES.index(type(piece))
+        rows.append(row)
+    return PackedPositions(codes=np.array(rows, dtype=np.int8).reshape(-1, 64),
+                           turns=np.array([color_index(turn) for turn in turns], dtype=np.int8))
+
+
+def piece_planes(codes: np.ndarray) -> np.ndarray:
+    """Returns one hot planes of pieces.
+
+    Args:
+        codes (np.ndarray): (N, 64) piece codes
+
+    Returns:
+        np.ndarray: (N, 12, 8, 8) bool array indexed by piece code, y and x
+    """
+
+    return (codes[:, None, :] == np.arange(12, dtype=np.int8)[None, :, None]).reshape(-1, 12, 8, 8)
+
+
+def material_scores(codes: np.ndarray) -> np.ndarray:
+    """Returns material balance in centipawns from white view.
+
+    Args:
+        codes (np.ndarray): (N, 64) piece codes
+
+    Returns:
+        np.ndarray: (N,) int32
+    """
+
+    return _MATERIAL_TABLE[codes + 1].sum(axis=1, dtype=np.int32)
+
+
+def piece_square_scores(codes: np.ndarray) -> np.ndarray:
+    """Returns piece-square bonuses balance in centipawns from white view.
+
+    Args:
+        codes (np.ndarray): (N, 64) piece codes
+
+    Returns:
+        np.ndarray: (N,) int32
+    """
+
+    return _PIECE_SQUARE_TABLE[codes + 1, _SQUARES].sum(axis=1, dtype=np.int32)
+
+
+def _bitboards(codes: np.ndarray, code: int) -> np.ndarray:
+    """Returns 64-bit masks of squares with `code` pieces, bit of square `y * 8 + x` is set.
+
+    Args:
+        codes (np.ndarray): (N, 64) piece codes
+        code (int)
+
+    Returns:
+        np.ndarray: (N,) uint64
+    """
+
+    return np.packbits(codes == code, axis=1, bitorder="little").view("<u8").ravel()
+
+
+def _shift(bitboards: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Returns `bitboards` moved by `dx` columns and `dy` rows, squares moved off the board are dropped.
+
+    Args:
+        bitboards (np.ndarray): (N,) uint64
+        dx (int)
+        dy (int)
+
+    Returns:
+        np.ndarray
+    """
+
+    shift = dy * 8 + dx
+    shifted = bitboards << np.uint64(shift) if shift > 0 else bitboards >> np.uint64(-shift)
+    return shifted & _FILE_MASKS[dx]
+
+
+def _pop_count(bitboards: np.ndarray) -> np.ndarray:
+    """Returns count of set bits of every mask.
+
+    Args:
+        bitboards (np.ndarray): (N,) uint64
+
+    Returns:
+        np.ndarray: (N,) int32
+    """
+
+    return _BYTE_COUNTS[bitboards.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int32)
+
+
+def mobility_scores(codes: np.ndarray) -> np.ndarray:
+    """Returns weighted mobility balance of knights, bishops, rooks and queens from white view.
+
+    Mobility is count of pseudo legal moves to free or enemy cells. Pieces
+    are packed into one 64-bit mask per position and piece code, and rays of
+    all sliders of one type are walked together for the whole batch, a step
+    at a time, stopping on occupied cells.
+
+    Args:
+        codes (np.ndarray): (N, 64) piece codes
+
+    Returns:
+        np.ndarray: (N,) int32
+    """
+
+    empty = _bitboards(codes, EMPTY)
+    white = np.packbits((codes >= 0) & (codes < 6), axis=1, bitorder="little").view("<u8").ravel()
+    black = ~(empty | white)
+    scores = np.zeros(len(codes), dtype=np.int32)
+    for color, sign, targets in ((WHITE, 1, empty | black), (BLACK, -1, empty | white)):
+        code = color * 6
+        knights = _bitboards(codes, code + KNIGHT)
+        for dx, dy in _KNIGHT_STEPS:
+            scores += sign * MOBILITY_WEIGHTS[KNIGHT] * _pop_count(_shift(knights, dx, dy) & targets)
+        for piece_type, steps in _SLIDER_STEPS:
+            sliders = _bitboards(codes, code + piece_type)
+            if not sliders.any():
+                continue
+            for dx, dy in steps:
+                ray = sliders
+                for _ in range(7):
+                    ray = _shift(ray, dx, dy)
+                    scores += sign * MOBILITY_WEIGHTS[piece_type] * _pop_count(ray & targets)
+                    ray &= empty
+                    if not ray.any():
+                        break
+    return scores
+
+
+def evaluate_batch(positions: PackedPositions) -> np.ndarray:
+    """Returns static scores of packed positions in centipawns for side to move.
+
+    Score is sum of material, piece-square and mobility terms, all computed
+    for the whole batch at once.
+
+    Args:
+        positions (PackedPositions)
+
+    Returns:
+        np.ndarray: (N,) int32
+    """
+
+    codes = positions.codes
+    scores = material_scores(codes) + piece_square_scores(codes) + mobility_scores(codes)
+    return np.where(positions.turns == WHITE, scores, -scores)
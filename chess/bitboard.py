@@ -0,0 +1,1238 @@
+import abc
+from typing import Final, Iterator, Optional, TypeVar
+
+from .board import Board
+from .enums import Color
+from .exceptions import FenParseError
+from .move_path import MovePath
+from .pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+from .position import Position
+from .piece_square import ENDGAME_SCORES, MIDDLEGAME_SCORES, PHASES
+from .zobrist import (BLACK_TO_MOVE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS,
+                      PIECE_KEYS)
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WHITE, BLACK = 0, 1
+EMPTY: Final[int] = -1
+
+PIECE_TYPES: Final[tuple[type[Piece], ...]] = (
+    Pawn, Knight, Bishop, Rook, Queen, King)
+COLORS: Final[tuple[Color, Color]] = (Color.WHITE, Color.BLACK)
+# FEN letters of white pieces by piece type, black pieces use lower case
+PIECE_LETTERS: Final[str] = "PNBRQK"
+STARTING_FEN: Final[str] = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+FULL: Final[int] = (1 << 64) - 1
+
+SQUARE_POSITIONS: Final[tuple[Position, ...]] = tuple(
+    Position(x=sq % 8, y=sq // 8) for sq in range(64))
+
+# Ray directions as (x step, y step). The first four walk to higher
+# square indexes, the last four to lower ones.
+NORTH, EAST, NORTH_EAST, NORTH_WEST, SOUTH, WEST, SOUTH_WEST, SOUTH_EAST = range(8)
+DIRECTIONS: Final[tuple[tuple[int, int], ...]] = (
+    (0, 1), (1, 0), (1, 1), (-1, 1), (0, -1), (-1, 0), (-1, -1), (1, -1))
+ROOK_DIRECTIONS: Final[tuple[int, ...]] = (NORTH, EAST, SOUTH, WEST)
+BISHOP_DIRECTIONS: Final[tuple[int, ...]] = (
+    NORTH_EAST, NORTH_WEST, SOUTH_WEST, SOUTH_EAST)
+
+# Move is encoded as int: bits 0-5 are from square, bits 6-11 are to square,
+# bits 12-14 are promotion piece type(0 if no promotion), higher bits are flags.
+CASTLING_MOVE: Final[int] = 1 << 15
+EN_PASSANT_MOVE: Final[int] = 1 << 16
+DOUBLE_PUSH_MOVE: Final[int] = 1 << 17
+PROMOTION_TYPES: Final[tuple[int, ...]] = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+ALL_CASTLING_RIGHTS: Final[int] = 15
+# Castling rights kept after a move from or to the square.
+CASTLING_RIGHTS_MASKS: Final[tuple[int, ...]] = tuple(
+    {0: ~WHITE_QUEENSIDE, 4: ~(WHITE_KINGSIDE | WHITE_QUEENSIDE), 7: ~WHITE_KINGSIDE,
+     56: ~BLACK_QUEENSIDE, 60: ~(BLACK_KINGSIDE | BLACK_QUEENSIDE), 63: ~BLACK_KINGSIDE
+     }.get(sq, ALL_CASTLING_RIGHTS) & ALL_CASTLING_RIGHTS for sq in range(64))
+# King and rook squares by castling right, in order of `WHITE_KINGSIDE` to `BLACK_QUEENSIDE`.
+CASTLING_SQUARES: Final[tuple[tuple[int, int], ...]] = ((4, 7), (4, 0), (60, 63), (60, 56))
+# Made moves looked through for repetition, earlier positions can't repeat under fifty-move rule.
+REPETITION_PLIES: Final[int] = 100
+
+_State = TypeVar("_State", bound="BoardState")
+
+
+def square(pos: Position) -> int:
+    """Returns square index(0 - 63) of `pos`.
+
+    Args:
+        pos (Position)
+
+    Returns:
+        int
+    """
+
+    return pos.y * 8 + pos.x
+
+
+def square_position(sq: int) -> Position:
+    """Returns position of `sq` square index.
+
+    Args:
+        sq (int)
+
+    Returns:
+        Position
+    """
+
+    return SQUARE_POSITIONS[sq]
+
+
+def color_index(color: Color) -> int:
+    """Returns index of `color` in bitboard tables.
+
+    Args:
+        color (Color)
+
+    Returns:
+        int
+    """
+
+    return WHITE if color is Color.WHITE else BLACK
+
+
+def encode_move(from_sq: int, to_sq: int, promotion: int = 0, flags: int = 0) -> int:
+    """Returns move encoded as int.
+
+    Args:
+        from_sq (int)
+        to_sq (int)
+        promotion (int): promotion piece type, 0 if move is not promotion
+        flags (int): `CASTLING_MOVE`, `EN_PASSANT_MOVE` or `DOUBLE_PUSH_MOVE`
+
+    Returns:
+        int
+    """
+
+    return from_sq | to_sq << 6 | promotion << 12 | flags
+
+
+def move_from_square(move: int) -> int:
+    """Returns from square of encoded `move`.
+
+    Args:
+        move (int)
+
+    Returns:
+        int
+    """
+
+    return move & 63
+
+
+def move_to_square(move: int) -> int:
+    """Returns to square of encoded `move`.
+
+    Args:
+        move (int)
+
+    Returns:
+        int
+    """
+
+    return move >> 6 & 63
+
+
+def move_promotion(move: int) -> int:
+    """Returns promotion piece type of encoded `move`, 0 if move is not promotion.
+
+    Args:
+        move (int)
+
+    Returns:
+        int
+    """
+
+    return move >> 12 & 7
+
+
+def decode_move(move: int) -> MovePath:
+    """Returns move path of encoded `move`.
+
+    Args:
+        move (int)
+
+    Returns:
+        MovePath
+    """
+
+    promotion = move >> 12 & 7
+    return MovePath(from_=SQUARE_POSITIONS[move & 63], to=SQUARE_POSITIONS[move >> 6 & 63],
+                    promotion=PIECE_TYPES[promotion] if promotion else None)
+
+
+def iter_squares(bb: int) -> Iterator[int]:
+    """Yields square indexes of set bits in `bb` from low to high.
+
+    Args:
+        bb (int)
+
+    Yields:
+        int
+    """
+
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def pop_count(bb: int) -> int:
+    """Returns count of set bits in `bb`.
+
+    Args:
+        bb (int)
+
+    Returns:
+        int
+    """
+
+    return bin(bb).count("1")
+
+
+def _jump_table(shifts: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    table = []
+    for sq in range(64):
+        x, y = sq % 8, sq // 8
+        bb = 0
+        for dx, dy in shifts:
+            if 0 <= x + dx < 8 and 0 <= y + dy < 8:
+                bb |= 1 << ((y + dy) * 8 + x + dx)
+        table.append(bb)
+    return tuple(table)
+
+
+def _ray_table() -> tuple[tuple[int, ...], ...]:
+    rays = []
+    for dx, dy in DIRECTIONS:
+        direction_rays = []
+        for sq in range(64):
+            x, y = sq % 8 + dx, sq // 8 + dy
+            bb = 0
+            while 0 <= x < 8 and 0 <= y < 8:
+                bb |= 1 << (y * 8 + x)
+                x += dx
+                y += dy
+            direction_rays.append(bb)
+        rays.append(tuple(direction_rays))
+    return tuple(rays)
+
+
+def _between_table() -> tuple[tuple[int, ...], ...]:
+    table = [[0] * 64 for _ in range(64)]
+    for from_sq in range(64):
+        for dx, dy in DIRECTIONS:
+            x, y = from_sq % 8 + dx, from_sq // 8 + dy
+            bb = 0
+            while 0 <= x < 8 and 0 <= y < 8:
+                to_sq = y * 8 + x
+                table[from_sq][to_sq] = bb
+                bb |= 1 << to_sq
+                x += dx
+                y += dy
+    return tuple(tuple(row) for row in table)
+
+
+KNIGHT_ATTACKS: Final[tuple[int, ...]] = _jump_table(
+    ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)))
+KING_ATTACKS: Final[tuple[int, ...]] = _jump_table(
+    ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)))
+PAWN_ATTACKS: Final[tuple[tuple[int, ...], tuple[int, ...]]] = (
+    _jump_table(((-1, 1), (1, 1))),
+    _jump_table(((-1, -1), (1, -1))),
+)
+RAYS: Final[tuple[tuple[int, ...], ...]] = _ray_table()
+# Squares strictly between two squares on a common line, 0 otherwise.
+BETWEEN: Final[tuple[tuple[int, ...], ...]] = _between_table()
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    """Returns squares attacked by a rook on `sq` with `occupied` blockers.
+
+    Args:
+        sq (int)
+        occupied (int): occupancy mask
+
+    Returns:
+        int
+    """
+
+    attacks = 0
+    ray = RAYS[NORTH][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[NORTH][(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[EAST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[EAST][(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[SOUTH][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[SOUTH][blockers.bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[WEST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[WEST][blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    """Returns squares attacked by a bishop on `sq` with `occupied` blockers.
+
+    Args:
+        sq (int)
+        occupied (int): occupancy mask
+
+    Returns:
+        int
+    """
+
+    attacks = 0
+    ray = RAYS[NORTH_EAST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[NORTH_EAST][(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[NORTH_WEST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[NORTH_WEST][(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[SOUTH_WEST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[SOUTH_WEST][blockers.bit_length() - 1]
+    attacks |= ray
+    ray = RAYS[SOUTH_EAST][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[SOUTH_EAST][blockers.bit_length() - 1]
+    return attacks | ray
+
+
+class BoardState(abc.ABC):
+    """Position state shared by `BitBoard` and `Mailbox`.
+
+    Keeps side to move, castling rights, en passant square, Zobrist key,
+    incremental evaluation terms and history of made moves, and makes and
+    unmakes moves by `put_piece` and `remove_piece`. Subclasses store the
+    pieces and generate moves. Squares and moves are encoded the same way
+    by every subclass.
+    """
+
+    def __init__(self) -> None:
+        self._turn = WHITE
+        self._castling_rights = 0
+        self._ep_square = -1
+        self._key = 0
+        # Incremental evaluation terms, see `evaluation.evaluate`
+        self._middlegame_score = 0
+        self._endgame_score = 0
+        self._phase = 0
+        # (move, captured piece code, castling rights, en passant square, key) per made move
+        self._history: list[tuple[int, int, int, int, int]] = []
+
+    @property
+    def turn(self) -> Color:
+        return COLORS[self._turn]
+
+    @turn.setter
+    def turn(self, color: Color) -> None:
+        self._turn = color_index(color)
+        self._key = self._compute_key()
+
+    @property
+    def castling_rights(self) -> int:
+        return self._castling_rights
+
+    @castling_rights.setter
+    def castling_rights(self, castling_rights: int) -> None:
+        self._castling_rights = castling_rights
+        self._key = self._compute_key()
+
+    @property
+    def ep_square(self) -> int:
+        """Square passed by pawn double push on the last move, -1 if there is none."""
+
+        return self._ep_square
+
+    @ep_square.setter
+    def ep_square(self, ep_square: int) -> None:
+        self._ep_square = ep_square
+        self._key = self._compute_key()
+
+    @property
+    def key(self) -> int:
+        """64-bit Zobrist key of the position.
+
+        Covers pieces, side to move, castling rights and en passant file when
+        side to move has a pawn able to beat en passant. The same position
+        has the same key in every subclass.
+        """
+
+        return self._key
+
+    @property
+    def last_move(self) -> Optional[int]:
+        """Encoded move made last and not unmade, None if there is no such move."""
+
+        history = self._history
+        return history[-1][0] if history else None
+
+    @property
+    def middlegame_score(self) -> int:
+        """Material and middlegame piece-square bonuses balance from white view."""
+
+        return self._middlegame_score
+
+    @property
+    def endgame_score(self) -> int:
+        """Material and endgame piece-square bonuses balance from white view."""
+
+        return self._endgame_score
+
+    @property
+    def phase(self) -> int:
+        """Sum of `PHASE_WEIGHTS` of pieces on the board."""
+
+        return self._phase
+
+    def _compute_key(self) -> int:
+        """Returns Zobrist key of the position computed from scratch.
+
+        Returns:
+            int
+        """
+
+        key = 0
+        for sq, code in enumerate(self.piece_codes()):
+            if code != EMPTY:
+                key ^= PIECE_KEYS[code][sq]
+        if self._turn == BLACK:
+            key ^= BLACK_TO_MOVE_KEY
+        return key ^ CASTLING_KEYS[self._castling_rights] ^ self._ep_key()
+
+    @abc.abstractmethod
+    def _ep_key(self) -> int:
+        """Returns en passant part of Zobrist key.
+
+        Returns:
+            int
+        """
+
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def pieces(self, color: Color, piece_type: type[Piece]) -> int:
+        """Returns mask of `color` pieces with `piece_type` type.
+
+        Args:
+            color (Color)
+            piece_type (type[Piece])
+
+        Returns:
+            int
+        """
+
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def piece_codes(self) -> list[int]:
+        """Returns piece code(color * 6 + piece type) or EMPTY of every square.
+
+        Returns:
+            list[int]: 64 codes indexed by square
+        """
+
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put_piece(self, sq: int, color: int, piece_type: int) -> None:
+        """Puts piece on empty `sq` square.
+
+        Args:
+            sq (int)
+            color (int): color index
+            piece_type (int): piece type index
+        """
+
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove_piece(self, sq: int) -> int:
+        """Removes piece from `sq` square.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int: code of removed piece or EMPTY
+        """
+
+        raise NotImplementedError
+
+    def move_piece(self, from_sq: int, to_sq: int) -> int:
+        """Moves piece from `from_sq` to `to_sq` and removes piece standing on `to_sq`.
+
+        Args:
+            from_sq (int)
+            to_sq (int)
+
+        Returns:
+            int: code of captured piece or EMPTY
+        """
+
+        captured = self.remove_piece(to_sq)
+        code = self.remove_piece(from_sq)
+        self.put_piece(to_sq, code // 6, code % 6)
+        return captured
+
+    def is_repetition(self) -> bool:
+        """Returns True if the position occurred before with the same side to move.
+
+        Only the last `REPETITION_PLIES` made moves are looked through.
+
+        Returns:
+            bool
+        """
+
+        key = self._key
+        history = self._history
+        return any(history[i][4] == key
+                   for i in range(len(history) - 2, max(len(history) - REPETITION_PLIES - 1, -1), -2))
+
+    def trim_history(self, plies: int) -> None:
+        """Forgets made moves but the last `plies` ones, forgotten moves can't be unmade.
+
+        Args:
+            plies (int): count of the last made moves to keep
+        """
+
+        history = self._history
+        if len(history) > plies:
+            del history[:len(history) - plies]
+
+    @abc.abstractmethod
+    def king_square(self, color: Color) -> int:
+        """Returns square of `color` king, -1 if there is no king.
+
+        Args:
+            color (Color)
+
+        Returns:
+            int
+        """
+
+        raise NotImplementedError
+
+    def legal_moves(self, from_mask: int = FULL) -> list[int]:
+        """Returns legal moves of side to move.
+
+        Args:
+            from_mask (int): mask of squares to generate moves from, all by default
+
+        Returns:
+            list[int]: encoded moves
+        """
+
+        return self._generate_moves(from_mask, True)
+
+    def has_legal_move(self) -> bool:
+        """Returns True if side to move has at least one legal move.
+
+        King moves are generated first, they are the usual evasion from
+        check, and moves of other pieces are generated only if there are none.
+
+        Returns:
+            bool
+        """
+
+        king_sq = self.king_square(COLORS[self._turn])
+        if king_sq == -1:
+            return bool(self.legal_moves())
+        king_mask = 1 << king_sq
+        return bool(self.legal_moves(king_mask) or self.legal_moves(FULL ^ king_mask))
+
+    def pseudo_legal_moves(self, from_mask: int = FULL) -> list[int]:
+        """Returns moves of side to move without checking own king safety.
+
+        Args:
+            from_mask (int): mask of squares to generate moves from, all by default
+
+        Returns:
+            list[int]: encoded moves
+        """
+
+        return self._generate_moves(from_mask, False)
+
+    def find_move(self, from_sq: int, to_sq: int, promotion: int = QUEEN, legal: bool = True) -> Optional[int]:
+        """Returns move from `from_sq` to `to_sq` or None if there is no such move.
+
+        Args:
+            from_sq (int)
+            to_sq (int)
+            promotion (int): promotion piece type used if move is promotion
+            legal (bool): search legal moves, otherwise pseudo legal moves
+
+        Returns:
+            Optional[int]: encoded move
+        """
+
+        for move in self._generate_moves(1 << from_sq, legal):
+            if move >> 6 & 63 == to_sq and move >> 12 & 7 in (0, promotion):
+                return move
+        return None
+
+    @abc.abstractmethod
+    def _generate_moves(self, from_mask: int, legal: bool) -> list[int]:
+        """Returns moves of side to move from squares of `from_mask`.
+
+        Args:
+            from_mask (int): mask of squares to generate moves from
+            legal (bool): skip moves leaving own king attacked
+
+        Returns:
+            list[int]: encoded moves
+        """
+
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _is_safe(self, move: int) -> bool:
+        """Returns True if pseudo legal `move` other than castling doesn't leave own king attacked.
+
+        Args:
+            move (int): pseudo legal encoded move
+
+        Returns:
+            bool
+        """
+
+        raise NotImplementedError
+
+    def is_legal(self, move: int) -> bool:
+        """Returns True if pseudo legal `move` doesn't leave own king attacked.
+
+        Args:
+            move (int): pseudo legal encoded move
+
+        Returns:
+            bool
+        """
+
+        if move & CASTLING_MOVE:
+            return move in self.legal_moves(1 << (move & 63))
+        return self._is_safe(move)
+
+    def make_move(self, move: int) -> None:
+        """Makes encoded `move` and remembers state needed by `unmake_move`.
+
+        Args:
+            move (int): pseudo legal encoded move
+        """
+
+        from_sq = move & 63
+        to_sq = move >> 6 & 63
+        us = self._turn
+        castling_rights = self._castling_rights
+        key = self._key
+        self._key ^= self._ep_key()
+        if move & EN_PASSANT_MOVE:
+            captured = self.remove_piece(to_sq - 8 if us == WHITE else to_sq + 8)
+        else:
+            captured = self.remove_piece(to_sq)
+        self._history.append((move, captured, castling_rights, self._ep_square, key))
+        piece_type = self.remove_piece(from_sq) % 6
+        self.put_piece(to_sq, us, move >> 12 & 7 or piece_type)
+        if move & CASTLING_MOVE:
+            if to_sq > from_sq:
+                self.remove_piece(to_sq + 1)
+                self.put_piece(to_sq - 1, us, ROOK)
+            else:
+                self.remove_piece(to_sq - 2)
+                self.put_piece(to_sq + 1, us, ROOK)
+        self._castling_rights = castling_rights & CASTLING_RIGHTS_MASKS[from_sq] & CASTLING_RIGHTS_MASKS[to_sq]
+        self._ep_square = (from_sq + to_sq) >> 1 if move & DOUBLE_PUSH_MOVE else -1
+        self._turn = us ^ 1
+        self._key ^= (BLACK_TO_MOVE_KEY ^ CASTLING_KEYS[castling_rights] ^
+                      CASTLING_KEYS[self._castling_rights] ^ self._ep_key())
+
+    def unmake_move(self) -> None:
+        """Takes back the last move made by `make_move`."""
+
+        move, captured, castling_rights, ep_square, key = self._history.pop()
+        from_sq = move & 63
+        to_sq = move >> 6 & 63
+        us = self._turn ^ 1
+        piece_type = self.remove_piece(to_sq) % 6
+        self.put_piece(from_sq, us, PAWN if move >> 12 & 7 else piece_type)
+        if captured != EMPTY:
+            if move & EN_PASSANT_MOVE:
+                to_sq += -8 if us == WHITE else 8
+            self.put_piece(to_sq, captured // 6, captured % 6)
+        if move & CASTLING_MOVE:
+            if to_sq > from_sq:
+                self.remove_piece(to_sq - 1)
+                self.put_piece(to_sq + 1, us, ROOK)
+            else:
+                self.remove_piece(to_sq + 1)
+                self.put_piece(to_sq - 2, us, ROOK)
+        self._castling_rights = castling_rights
+        self._ep_square = ep_square
+        self._turn = us
+        self._key = key
+
+    def copy(self: _State) -> _State:
+        """Returns copy of the position with its own history of made moves.
+
+        Piece storage is shared, subclasses copy it after calling this method.
+
+        Returns:
+            _State
+        """
+
+        state = self.__class__.__new__(self.__class__)
+        state.__dict__.update(self.__dict__)
+        state._history = self._history[:]
+        return state
+
+    @classmethod
+    def from_board(cls: type[_State], board: Board, turn: Color = Color.WHITE) -> _State:
+        """Creates position with pieces placed as on `board`.
+
+        Castling rights are taken from `was_move` flags of kings and rooks
+        standing on their initial cells.
+
+        Args:
+            board (Board)
+            turn (Color): side to move
+
+        Returns:
+            _State
+        """
+
+        state = cls()
+        for piece in board.get_pieces():
+            state.put_piece(square(piece.pos), color_index(
+                piece.color), PIECE_TYPES.index(type(piece)))
+        state._turn = color_index(turn)
+
+        castling_rights = 0
+        for y, color, kingside, queenside in ((0, Color.WHITE, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                              (7, Color.BLACK, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = board[y][4].piece
+            if not isinstance(king, King) or king.color is not color or king.was_move:
+                continue
+            for x, right in ((7, kingside), (0, queenside)):
+                rook = board[y][x].piece
+                if isinstance(rook, Rook) and rook.color is color and not rook.was_move:
+                    castling_rights |= right
+        state._castling_rights = castling_rights
+        state._key = state._compute_key()
+        return state
+
+    @classmethod
+    def from_fen(cls: type[_State], fen: str) -> _State:
+        """Creates position from FEN string.
+
+        Halfmove clock and fullmove number fields are optional and ignored.
+        Castling rights whose king or rook is not on its starting square are
+        dropped.
+
+        Args:
+            fen (str)
+
+        Raises:
+            FenParseError: raised if `fen` has invalid format.
+
+        Returns:
+            _State
+        """
+
+        fields = fen.split()
+        if len(fields) < 4:
+            raise FenParseError(fen)
+        placement, turn, castling, ep = fields[:4]
+        rows = placement.split("/")
+        if len(rows) != 8 or turn not in ("w", "b"):
+            raise FenParseError(fen)
+
+        state = cls()
+        for y, row in zip(range(7, -1, -1), rows):
+            x = 0
+            for char in row:
+                if char.isdigit():
+                    x += int(char)
+                    continue
+                piece_type = PIECE_LETTERS.find(char.upper())
+                if piece_type == -1 or x > 7:
+                    raise FenParseError(fen)
+                state.put_piece(y * 8 + x, WHITE if char.isupper() else BLACK, piece_type)
+                x += 1
+            if x != 8:
+                raise FenParseError(fen)
+
+        state._turn = WHITE if turn == "w" else BLACK
+        if castling != "-":
+            codes = state.piece_codes()
+            for char in castling:
+                right = "KQkq".find(char)
+                if right == -1:
+                    raise FenParseError(fen)
+                king_sq, rook_sq = CASTLING_SQUARES[right]
+                color = right >> 1
+                if codes[king_sq] == color * 6 + KING and codes[rook_sq] == color * 6 + ROOK:
+                    state._castling_rights |= 1 << right
+        if ep != "-":
+            if len(ep) != 2 or ep[0] not in "abcdefgh" or ep[1] not in "36":
+                raise FenParseError(fen)
+            state._ep_square = (int(ep[1]) - 1) * 8 + "abcdefgh".index(ep[0])
+        state._key = state._compute_key()
+        return state
+
+    def to_fen(self) -> str:
+        """Returns FEN string of the position without halfmove clock and fullmove number.
+
+        Returns:
+            str
+        """
+
+        codes = self.piece_codes()
+        rows = []
+        for y in range(7, -1, -1):
+            row = ""
+            empty = 0
+            for code in codes[y * 8:y * 8 + 8]:
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = PIECE_LETTERS[code % 6]
+                row += letter if code < 6 else letter.lower()
+            rows.append(row + str(empty) if empty else row)
+
+        castling = "".join(char for i, char in enumerate("KQkq") if self._castling_rights >> i & 1) or "-"
+        ep_square = self._ep_square
+        ep = "-" if ep_square == -1 else "abcdefgh"[ep_square & 7] + str((ep_square >> 3) + 1)
+        return f"{'/'.join(rows)} {'wb'[self._turn]} {castling} {ep}"
+
+    def to_board(self) -> Board:
+        """Creates board with new pieces placed as in the position.
+
+        `was_move` flags are restored from the position: king and rooks
+        without castling rights and pawns off their initial row are moved.
+
+        Returns:
+            Board
+        """
+
+        board = Board()
+        castling_rights = self._castling_rights
+        unmoved = 0
+        for color, kingside, queenside in ((WHITE, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                           (BLACK, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            y = 0 if color == WHITE else 56
+            if castling_rights & (kingside | queenside):
+                unmoved |= 1 << y + 4
+            if castling_rights & kingside:
+                unmoved |= 1 << y + 7
+            if castling_rights & queenside:
+                unmoved |= 1 << y
+        unmoved |= self.pieces(Color.WHITE, Pawn) & 0xFF00 | self.pieces(Color.BLACK, Pawn) & 0xFF << 48
+
+        for sq, code in enumerate(self.piece_codes()):
+            if code != EMPTY:
+                pos = SQUARE_POSITIONS[sq]
+                piece_type = code % 6
+                was_move = piece_type in (PAWN, ROOK, KING) and not unmoved >> sq & 1
+                board[pos.y][pos.x].put_piece(PIECE_TYPES[piece_type](COLORS[code // 6], pos, was_move))
+        return board
+
+
+class BitBoard(BoardState):
+    """Board stored as one 64-bit integer per piece type and color.
+
+    Square index is `y * 8 + x` of the `Position`, so bit 0 is a1 and bit 63 is h8.
+    Pins, checkers and check evasion squares are found before legal moves
+    are generated, so no move has to be tried on the board.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pieces: list[list[int]] = [[0] * 6, [0] * 6]
+        self._occupancy: list[int] = [0, 0]
+        self._occupied = 0
+        # Piece code(color * 6 + piece type) per square or EMPTY.
+        self._squares: list[int] = [EMPTY] * 64
+
+    @property
+    def occupied(self) -> int:
+        return self._occupied
+
+    def _ep_key(self) -> int:
+        """Returns en passant part of Zobrist key.
+
+        Returns:
+            int
+        """
+
+        ep_square = self._ep_square
+        if ep_square != -1 and PAWN_ATTACKS[self._turn ^ 1][ep_square] & self._pieces[self._turn][PAWN]:
+            return EN_PASSANT_KEYS[ep_square & 7]
+        return 0
+
+    def occupancy(self, color: Color) -> int:
+        """Returns mask of squares occupied by `color` pieces.
+
+        Args:
+            color (Color)
+
+        Returns:
+            int
+        """
+
+        return self._occupancy[color_index(color)]
+
+    def pieces(self, color: Color, piece_type: type[Piece]) -> int:
+        """Returns mask of `color` pieces with `piece_type` type.
+
+        Args:
+            color (Color)
+            piece_type (type[Piece])
+
+        Returns:
+            int
+        """
+
+        return self._pieces[color_index(color)][PIECE_TYPES.index(piece_type)]
+
+    def piece_at(self, sq: int) -> Optional[tuple[Color, type[Piece]]]:
+        """Returns color and type of piece on `sq` or None if square is empty.
+
+        Args:
+            sq (int)
+
+        Returns:
+            Optional[tuple[Color, type[Piece]]]
+        """
+
+        code = self._squares[sq]
+        if code == EMPTY:
+            return None
+        return COLORS[code // 6], PIECE_TYPES[code % 6]
+
+    def piece_codes(self) -> list[int]:
+        """Returns piece code(color * 6 + piece type) or EMPTY of every square.
+
+        Returns:
+            list[int]: 64 codes indexed by square
+        """
+
+        return self._squares[:]
+
+    def piece_type_at(self, sq: int) -> int:
+        """Returns piece type index of piece on `sq` or EMPTY.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int
+        """
+
+        code = self._squares[sq]
+        return code if code == EMPTY else code % 6
+
+    def put_piece(self, sq: int, color: int, piece_type: int) -> None:
+        """Puts piece on empty `sq` square.
+
+        Args:
+            sq (int)
+            color (int): color index
+            piece_type (int): piece type index
+        """
+
+        mask = 1 << sq
+        self._pieces[color][piece_type] |= mask
+        self._occupancy[color] |= mask
+        self._occupied |= mask
+        code = color * 6 + piece_type
+        self._squares[sq] = code
+        self._key ^= PIECE_KEYS[code][sq]
+        self._middlegame_score += MIDDLEGAME_SCORES[code][sq]
+        self._endgame_score += ENDGAME_SCORES[code][sq]
+        self._phase += PHASES[code]
+
+    def remove_piece(self, sq: int) -> int:
+        """Removes piece from `sq` square.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int: code of removed piece or EMPTY
+        """
+
+        code = self._squares[sq]
+        if code != EMPTY:
+            mask = 1 << sq
+            color = code // 6
+            self._pieces[color][code % 6] ^= mask
+            self._occupancy[color] ^= mask
+            self._occupied ^= mask
+            self._squares[sq] = EMPTY
+            self._key ^= PIECE_KEYS[code][sq]
+            self._middlegame_score -= MIDDLEGAME_SCORES[code][sq]
+            self._endgame_score -= ENDGAME_SCORES[code][sq]
+            self._phase -= PHASES[code]
+        return code
+
+    def is_free_path(self, from_sq: int, to_sq: int) -> bool:
+        """Returns True if squares between `from_sq` and `to_sq` are empty.
+
+        Args:
+            from_sq (int)
+            to_sq (int)
+
+        Returns:
+            bool
+        """
+
+        return not BETWEEN[from_sq][to_sq] & self._occupied
+
+    def attacks_from(self, sq: int) -> int:
+        """Returns mask of squares attacked by piece on `sq`.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int
+        """
+
+        code = self._squares[sq]
+        if code == EMPTY:
+            return 0
+        piece_type = code % 6
+        if piece_type == PAWN:
+            return PAWN_ATTACKS[code // 6][sq]
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        if piece_type == KING:
+            return KING_ATTACKS[sq]
+        attacks = 0
+        if piece_type != BISHOP:
+            attacks |= rook_attacks(sq, self._occupied)
+        if piece_type != ROOK:
+            attacks |= bishop_attacks(sq, self._occupied)
+        return attacks
+
+    def attackers_to(self, sq: int, color: int, occupied: Optional[int] = None) -> int:
+        """Returns mask of `color` pieces attacking `sq`.
+
+        Args:
+            sq (int)
+            color (int): color index of attackers
+            occupied (Optional[int]): occupancy used for sliders, current by default
+
+        Returns:
+            int
+        """
+
+        if occupied is None:
+            occupied = self._occupied
+        pieces = self._pieces[color]
+        queens = pieces[QUEEN]
+        return ((PAWN_ATTACKS[color ^ 1][sq] & pieces[PAWN]) |
+                (KNIGHT_ATTACKS[sq] & pieces[KNIGHT]) |
+                (KING_ATTACKS[sq] & pieces[KING]) |
+                (bishop_attacks(sq, occupied) & (pieces[BISHOP] | queens)) |
+                (rook_attacks(sq, occupied) & (pieces[ROOK] | queens)))
+
+    def is_square_attacked(self, sq: int, color: Color) -> bool:
+        """Returns True if `sq` is attacked by `color` pieces.
+
+        Args:
+            sq (int)
+            color (Color): attackers color
+
+        Returns:
+            bool
+        """
+
+        return bool(self.attackers_to(sq, color_index(color)))
+
+    def king_square(self, color: Color) -> int:
+        """Returns square of `color` king, -1 if there is no king.
+
+        Args:
+            color (Color)
+
+        Returns:
+            int
+        """
+
+        return self._pieces[color_index(color)][KING].bit_length() - 1
+
+    def is_check(self) -> bool:
+        """Returns True if king of side to move is attacked.
+
+        Returns:
+            bool
+        """
+
+        king = self._pieces[self._turn][KING]
+        return bool(king) and bool(self.attackers_to(king.bit_length() - 1, self._turn ^ 1))
+
+    def _generate_moves(self, from_mask: int, legal: bool) -> list[int]:
+        us = self._turn
+        them = us ^ 1
+        pieces = self._pieces[us]
+        own = self._occupancy[us]
+        enemy = self._occupancy[them]
+        occupied = self._occupied
+        moves: list[int] = []
+        append = moves.append
+
+        target_mask = FULL
+        pinned = 0
+        pin_masks: dict[int, int] = {}
+        king = pieces[KING]
+        king_sq = king.bit_length() - 1
+        if king:
+            checkers = self.attackers_to(king_sq, them) if legal else 0
+            if king & from_mask:
+                without_king = occupied ^ king
+                for to_sq in iter_squares(KING_ATTACKS[king_sq] & ~own):
+                    if not legal or not self.attackers_to(to_sq, them, without_king):
+                        append(king_sq | to_sq << 6)
+                if not checkers:
+                    self._generate_castling_moves(moves, legal)
+            if checkers:
+                if checkers & (checkers - 1):
+                    return moves  # only king moves from double check
+                target_mask = checkers | BETWEEN[king_sq][checkers.bit_length() - 1]
+            if legal:
+                enemy_pieces = self._pieces[them]
+                snipers = ((rook_attacks(king_sq, 0) & (enemy_pieces[ROOK] | enemy_pieces[QUEEN])) |
+                           (bishop_attacks(king_sq, 0) & (enemy_pieces[BISHOP] | enemy_pieces[QUEEN])))
+                for sniper_sq in iter_squares(snipers):
+                    between = BETWEEN[king_sq][sniper_sq]
+                    blockers = between & occupied
+                    if blockers & own and not blockers & (blockers - 1):
+                        pinned |= blockers
+                        pin_masks[blockers.bit_length() - 1] = between | 1 << sniper_sq
+
+        targets_mask = ~own & target_mask
+        for from_sq in iter_squares(pieces[KNIGHT] & from_mask & ~pinned):
+            for to_sq in iter_squares(KNIGHT_ATTACKS[from_sq] & targets_mask):
+                append(from_sq | to_sq << 6)
+        for piece_type, attacks in ((BISHOP, bishop_attacks), (ROOK, rook_attacks)):
+            for from_sq in iter_squares((pieces[piece_type] | pieces[QUEEN]) & from_mask):
+                targets = attacks(from_sq, occupied) & targets_mask
+                if pinned >> from_sq & 1:
+                    targets &= pin_masks[from_sq]
+                for to_sq in iter_squares(targets):
+                    append(from_sq | to_sq << 6)
+
+        if us == WHITE:
+            push, double_push_rank, last_rank = 8, 0xFF00, 0xFF << 56
+        else:
+            push, double_push_rank, last_rank = -8, 0xFF << 48, 0xFF
+        ep_square = self._ep_square
+        pawn_attacks = PAWN_ATTACKS[us]
+        for from_sq in iter_squares(pieces[PAWN] & from_mask):
+            allowed = target_mask
+            if pinned >> from_sq & 1:
+                allowed &= pin_masks[from_sq]
+            to_sq = from_sq + push
+            if not occupied >> to_sq & 1:
+                if allowed >> to_sq & 1:
+                    if 1 << to_sq & last_rank:
+                        for promotion in PROMOTION_TYPES:
+                            append(from_sq | to_sq << 6 | promotion << 12)
+                    else:
+                        append(from_sq | to_sq << 6)
+                to_sq += push
+                if 1 << from_sq & double_push_rank and not occupied >> to_sq & 1 and allowed >> to_sq & 1:
+                    append(from_sq | to_sq << 6 | DOUBLE_PUSH_MOVE)
+            for to_sq in iter_squares(pawn_attacks[from_sq] & enemy & allowed):
+                if 1 << to_sq & last_rank:
+                    for promotion in PROMOTION_TYPES:
+                        append(from_sq | to_sq << 6 | promotion << 12)
+                else:
+                    append(from_sq | to_sq << 6)
+            if ep_square != -1 and pawn_attacks[from_sq] >> ep_square & 1:
+                captured_mask = 1 << (ep_square - push)
+                if legal and king:
+                    # Both pawns leave their squares, so check the king directly
+                    occupied_after = (occupied ^ 1 << from_sq ^ captured_mask) | 1 << ep_square
+                    if self.attackers_to(king_sq, them, occupied_after) & ~captured_mask:
+                        continue
+                append(from_sq | ep_square << 6 | EN_PASSANT_MOVE)
+        return moves
+
+    def _generate_castling_moves(self, moves: list[int], legal: bool) -> None:
+        """Appends castling moves of side to move to `moves`.
+
+        Args:
+            moves (list[int])
+            legal (bool): skip castling through attacked squares
+        """
+
+        us = self._turn
+        rights = self._castling_rights
+        occupied = self._occupied
+        if us == WHITE:
+            kingside, queenside, king_sq = rights & WHITE_KINGSIDE, rights & WHITE_QUEENSIDE, 4
+        else:
+            kingside, queenside, king_sq = rights & BLACK_KINGSIDE, rights & BLACK_QUEENSIDE, 60
+        if kingside and not BETWEEN[king_sq][king_sq + 3] & occupied:
+            if not legal or not (self.attackers_to(king_sq + 1, us ^ 1) or
+                                 self.attackers_to(king_sq + 2, us ^ 1)):
+                moves.append(king_sq | (king_sq + 2) << 6 | CASTLING_MOVE)
+        if queenside and not BETWEEN[king_sq][king_sq - 4] & occupied:
+            if not legal or not (self.attackers_to(king_sq - 1, us ^ 1) or
+                                 self.attackers_to(king_sq - 2, us ^ 1)):
+                moves.append(king_sq | (king_sq - 2) << 6 | CASTLING_MOVE)
+
+    def _is_safe(self, move: int) -> bool:
+        """Returns True if pseudo legal `move` other than castling doesn't leave own king attacked.
+
+        Args:
+            move (int): pseudo legal encoded move
+
+        Returns:
+            bool
+        """
+
+        color = self._turn
+        self.make_move(move)
+        king = self._pieces[color][KING]
+        is_safe = not king or not self.attackers_to(king.bit_length() - 1, color ^ 1)
+        self.unmake_move()
+        return is_safe
+
+    def copy(self) -> "BitBoard":
+        """Returns independent copy of the bitboard.
+
+        Returns:
+            BitBoard
+        """
+
+        bitboard = super().copy()
+        bitboard._pieces = [self._pieces[WHITE][:], self._pieces[BLACK][:]]
+        bitboard._occupancy = self._occupancy[:]
+        bitboard._squares = self._squares[:]
+        return bitboard
@@ -1,25 +1,49 @@
 from copy import deepcopy
-from typing import Iterator, Union
+from typing import Final, Iterator, Optional, Union
 
 from .cell import Cell
 from .consts import letters_nums, nums
 from .controlled_cell import ControlledCell
 from .enums import Color
-from .exceptions import PathTypeError
-from .pieces import Pawn, Piece
+from .exceptions import NotPieceError, PathTypeError
+from .move_record import MoveRecord
+from .pieces import King, Pawn, Piece, Queen, Rook
 from .position import Position
 from .utils import convert_letter_num_to_letter
 from .utils.path import (is_diagonal_path, is_horizontal_path, is_knight_path,
                          is_vertical_path)
 
 
+# Position and color of every cell by row, shared by all boards as both are immutable.
+_CELL_LAYOUT: Final[tuple[tuple[tuple[Position, Color], ...], ...]] = tuple(
+    tuple((Position(x=x, y=y), (Color.WHITE if x % 2 == 0 else Color.BLACK) if y % 2 == 0 else (Color.BLACK if x % 2 == 0 else Color.WHITE))
+          for x in letters_nums)
+    for y in nums
+)
+
+
 class Board:
     def __init__(self) -> None:
+        on_cell_change = self._on_cell_change
         self._board: list[list[Cell]] = [
-            [Cell(Position(x=x, y=y), (Color.WHITE if x % 2 == 0 else Color.BLACK) if y % 2 == 0 else (Color.BLACK if x % 2 == 0 else Color.WHITE))
-                for x in letters_nums]
-            for y in nums
-        ]
+            [Cell(pos, color, on_cell_change) for pos, color in row] for row in _CELL_LAYOUT]
+        self._undo_stack: list[MoveRecord] = []
+        self._changes = 0
+
+        # Attack map. Updated lazily: cell changes are collected and applied
+        # on the next attack query to pieces whose attacks could be touched.
+        # Only attacked cells have a set of attackers, so a board which is
+        # never queried costs no sets at all.
+        self._attackers: dict[Color, dict[Position, set[Piece]]] = {color: {} for color in Color}
+        self._piece_attacks: dict[Piece, list[Position]] = {}
+        self._changed_positions: set[Position] = set()
+        self._removed_pieces: set[Piece] = set()
+
+    @property
+    def changes(self) -> int:
+        """Count of pieces put on or removed from cells, e.g. to find out that the board was changed."""
+
+        return self._changes
 
     def __getitem__(self, y: int) -> list[Cell]:
         return self._board[y]
@@ -29,14 +53,190 @@ class Board:
 
     def __str__(self) -> str:
         board = self._board
-        res = ""
-        for num in nums:
-            board_row = " ".join([str(c) for c in board[num]])
-            res += f"{num + 1}  {board_row}\n"
-        letters_row = " ".join(
-            [convert_letter_num_to_letter(letter_num) for letter_num in letters_nums])
-        res += f"\n   {letters_row}\n"
-        return res
+        rows = [f"{num + 1}  {' '.join(map(str, board[num]))}\n" for num in nums]
+        letters_row = " ".join(map(convert_letter_num_to_letter, letters_nums))
+        return "".join(rows) + f"\n   {letters_row}\n"
+
+    def is_attacked(self, pos: Position, color: Color) -> bool:
+        """Returns True if `pos` cell is attacked by `color` pieces.
+
+        Args:
+            pos (Position)
+            color (Color): attackers color
+
+        Returns:
+            bool
+        """
+
+        self._update_attack_map()
+        return pos in self._attackers[color]
+
+    def attack_count(self, pos: Position, color: Color) -> int:
+        """Returns count of `color` pieces attacking `pos` cell.
+
+        Args:
+            pos (Position)
+            color (Color): attackers color
+
+        Returns:
+            int
+        """
+
+        self._update_attack_map()
+        return len(self._attackers[color].get(pos, ()))
+
+    def attackers(self, pos: Position, color: Color) -> set[Piece]:
+        """Returns set of `color` pieces attacking `pos` cell.
+
+        Args:
+            pos (Position)
+            color (Color): attackers color
+
+        Returns:
+            set[Piece]
+        """
+
+        self._update_attack_map()
+        return set(self._attackers[color].get(pos, ()))
+
+    def piece_attacks(self, piece: Piece) -> list[Position]:
+        """Returns list of positions attacked by `piece` standing on the board.
+
+        Args:
+            piece (Piece)
+
+        Returns:
+            list[Position]
+        """
+
+        self._update_attack_map()
+        return list(self._piece_attacks.get(piece, []))
+
+    def _on_cell_change(self, cell: Cell, old_piece: Optional[Piece]) -> None:
+        self._changes += 1
+        self._changed_positions.add(cell.pos)
+        if old_piece is not None:
+            self._removed_pieces.add(old_piece)
+
+    def _update_attack_map(self) -> None:
+        """Recomputes attacks of pieces touched by cell changes since the last update.
+
+        Besides pieces put on or removed from changed cells, only pieces attacking
+        a changed cell can get other attacks: their rays pass through that cell.
+        """
+
+        changed_positions = self._changed_positions
+        if not changed_positions:
+            return
+
+        attackers = self._attackers
+        affected_pieces = self._removed_pieces
+        for pos in changed_positions:
+            piece = self._board[pos.y][pos.x].piece
+            if piece is not None:
+                affected_pieces.add(piece)
+            for color_attackers in attackers.values():
+                affected_pieces.update(color_attackers.get(pos, ()))
+
+        piece_attacks = self._piece_attacks
+        for piece in affected_pieces:
+            color_attackers = attackers[piece.color]
+            for pos in piece_attacks.pop(piece, []):
+                pos_attackers = color_attackers[pos]
+                pos_attackers.discard(piece)
+                if not pos_attackers:
+                    del color_attackers[pos]
+            pos = piece.pos
+            if self._board[pos.y][pos.x].piece is piece:
+                attacks = self._compute_piece_attacks(piece)
+                piece_attacks[piece] = attacks
+                for pos in attacks:
+                    color_attackers.setdefault(pos, set()).add(piece)
+
+        self._changed_positions = set()
+        self._removed_pieces = set()
+
+    def _compute_piece_attacks(self, piece: Piece) -> list[Position]:
+        """Returns list of positions attacked by `piece`.
+
+        Args:
+            piece (Piece)
+
+        Returns:
+            list[Position]
+        """
+
+        piece_pos = piece.pos
+        return [cf for cf in piece.controlled_fields() if self.is_free_roadmap(
+            self.create_roadmap(piece_pos, cf)[:-1])]
+
+    def make_move(self, from_: Position, to: Position, promotion: Optional[type[Piece]] = None,
+                  undo: bool = True) -> None:
+        """Moves piece from `from_` to `to` and remembers the move for `unmake_move` if `undo`.
+
+        Piece standing on `to` is removed from the board. King moving by two
+        cells castles with the rook, pawn moving diagonally to free cell beats
+        en passant and pawn reaching the last row is promoted.
+
+        Args:
+            from_ (Position): from position
+            to (Position): to position
+            promotion (Optional[type[Piece]]): promoted pawn piece type, Queen by default
+            undo (bool): remember the move, moves which are never taken back are not kept
+
+        Raises:
+            NotPieceError: raised if `from_` cell not have piece.
+        """
+
+        board = self._board
+        from_cell = board[from_.y][from_.x]
+        to_cell = board[to.y][to.x]
+        piece = from_cell.piece
+        if piece is None:
+            raise NotPieceError(from_cell)
+
+        captured_pos = None
+        rook_move = None
+        promoted = None
+        if isinstance(piece, Pawn):
+            if from_.x != to.x and to_cell.piece is None:
+                captured_pos = Position(x=to.x, y=from_.y)
+            if to.y in (0, 7):
+                promoted = (promotion or Queen)(piece.color, to)
+        elif isinstance(piece, King) and abs(to.x - from_.x) == 2:
+            rook_from = Position(x=7 if to.x > from_.x else 0, y=from_.y)
+            if isinstance(board[rook_from.y][rook_from.x].piece, Rook):
+                self.make_move(rook_from, Position(
+                    x=(from_.x + to.x) // 2, y=from_.y), undo=undo)
+                if undo:
+                    rook_move = self._undo_stack.pop()
+
+        captured_cell = to_cell if captured_pos is None else board[captured_pos.y][captured_pos.x]
+        captured = captured_cell.piece
+        if undo:
+            self._undo_stack.append(MoveRecord(
+                from_=from_, to=to, piece=piece, captured=captured, was_move=piece.was_move,
+                captured_pos=captured_pos, promoted=promoted, rook_move=rook_move))
+        if captured is not None:
+            captured_cell.remove_piece()
+        from_cell.remove_piece()
+        to_cell.put_piece(piece if promoted is None else promoted)
+        piece.move_to(to)
+
+    def unmake_move(self) -> None:
+        """Takes back the last move made by `make_move`."""
+
+        from_, to, piece, captured, was_move, captured_pos, _, rook_move = self._undo_stack.pop()
+        board = self._board
+        board[to.y][to.x].remove_piece()
+        if captured is not None:
+            pos = to if captured_pos is None else captured_pos
+            board[pos.y][pos.x].put_piece(captured)
+        board[from_.y][from_.x].put_piece(piece)
+        piece.move_back(from_, was_move)
+        if rook_move is not None:
+            self._undo_stack.append(rook_move)
+            self.unmake_move()
 
     def is_free_roadmap(self, roadmap: list[Cell]) -> bool:
         """Returns True if roadmap don't have pieces.
@@ -198,12 +398,14 @@ class Board:
             list[ControlledCell]: [description]
         """
 
-        pieces = self.get_pieces()
+        self._update_attack_map()
+        board = self._board
+        piece_attacks = self._piece_attacks
         pieces_controlled_positions: list[ControlledCell] = []
-        for piece in pieces:
-            controlled_fields = self.filter_by_valid_pawn_controlled_fields(piece.pos, piece.controlled_fields()) if isinstance(
-                piece, Pawn) else self.filter_by_valid_piece_controlled_fields(piece.pos, piece.controlled_fields())
-            controlled_cells = [ControlledCell(
-                pos=cf, piece=piece) for cf in controlled_fields]
+        for piece in self.get_pieces():
+            # Pawns control only occupied cells, other pieces only free cells
+            is_pawn = isinstance(piece, Pawn)
+            controlled_cells = [ControlledCell(pos=pos, piece=piece) for pos in piece_attacks[piece]
+                                if (board[pos.y][pos.x].piece is not None) is is_pawn]
             pieces_controlled_positions.extend(controlled_cells)
         return pieces_controlled_positions
@@ -1,13 +1,61 @@
+import sys
+from typing import Final, Optional, TextIO
+
 from .board import Board
+from .consts import nums
+from .pieces import Piece
+
+_CLEAR_SCREEN: Final[str] = "\x1b[H\x1b[2J"
+_CLEAR_BELOW: Final[str] = "\x1b[J"
+# Screen line after the printed board: 8 rows, blank line, letters and blank line.
+_BELOW_BOARD_LINE: Final[int] = len(nums) + 4
+
+
+def _cursor_to(line: int, column: int) -> str:
+    return f"\x1b[{line};{column}H"
 
 
 class BoardPrinter:
-    """Class for printing board."""
+    """Class for printing board.
 
-    def __init__(self, board: Board) -> None:
+    On a terminal the first print clears the screen and draws the board at
+    its top. Next prints redraw only cells whose pieces changed since the
+    previous print by ANSI cursor addressing, then move cursor under the
+    board and clear the lines below it. Output which is not a terminal gets
+    the whole board every time.
+    """
+
+    def __init__(self, board: Board, output: Optional[TextIO] = None) -> None:
         self._board = board
+        # Standard output at the moment of print if None
+        self._output = output
+        # Pieces of cells by square of the drawn board, None if nothing is drawn
+        self._frame: Optional[list[Optional[Piece]]] = None
 
     def print(self) -> None:
         """Prints board."""
 
-        print(self._board)
+        output = self._output if self._output is not None else sys.stdout
+        if not output.isatty():
+            print(self._board, file=output)
+            return
+
+        frame = [cell.piece for row in self._board for cell in row]
+        previous = self._frame
+        if previous is None:
+            text = f"{_CLEAR_SCREEN}{self._board}\n"
+        else:
+            board = self._board
+            # Board row y is screen line y + 1 and cell x is column 2x + 4
+            text = "".join(
+                f"{_cursor_to((sq >> 3) + 1, (sq & 7) * 2 + 4)}{board[sq >> 3][sq & 7]}"
+                for sq, (piece, previous_piece) in enumerate(zip(frame, previous)) if piece is not previous_piece
+            ) + _cursor_to(_BELOW_BOARD_LINE, 1) + _CLEAR_BELOW
+        self._frame = frame
+        output.write(text)
+        output.flush()
+
+    def reset(self) -> None:
+        """Makes the next print draw the whole board, e.g. after the screen was cleared."""
+
+        self._frame = None
@@ -1,5 +1,4 @@
-from copy import deepcopy
-from typing import Optional
+from typing import Callable, Optional
 
 import termcolor
 
@@ -11,14 +10,17 @@ from .position import Position
 class Cell:
     """Board cell."""
 
+    __slots__ = ("_pos", "_color", "_piece", "_on_change")
+
     _white_char = termcolor.colored("x", "white")
     _black_char = termcolor.colored("x", "grey")
 
-    def __init__(self, pos: Position, color: Color) -> None:
+    def __init__(self, pos: Position, color: Color,
+                 on_change: Optional[Callable[["Cell", Optional[Piece]], None]] = None) -> None:
         self._pos = pos
         self._color = color
-        self._char = self._white_char if color is Color.WHITE else self._black_char
         self._piece: Optional[Piece] = None
+        self._on_change = on_change
 
     @property
     def pos(self) -> Position:
@@ -36,7 +38,7 @@ class Cell:
         piece = self._piece
         if piece is not None:
             return str(piece)
-        return self._char
+        return self._white_char if self._color is Color.WHITE else self._black_char
 
     def put_piece(self, piece: Piece) -> None:
         """Puts piece on cell.
@@ -45,9 +47,15 @@ class Cell:
             piece (Piece)
         """
 
+        old_piece = self._piece
         self._piece = piece
+        if self._on_change is not None:
+            self._on_change(self, old_piece)
 
     def remove_piece(self) -> None:
         """Remove piece from cell."""
 
+        old_piece = self._piece
         self._piece = None
+        if self._on_change is not None:
+            self._on_change(self, old_piece)
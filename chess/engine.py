@@ -0,0 +1,309 @@
+import time
+from typing import Callable, Final, NamedTuple, Optional, Sequence
+
+from .bitboard import (EMPTY, EN_PASSANT_MOVE, PAWN, BitBoard, decode_move,
+                       move_to_square, pop_count)
+from .enums import Bound, Outcome
+from .evaluation import evaluate
+from .piece_square import PIECE_VALUES
+from .move_path import MovePath
+from .tablebase import Tablebase, probe_tablebases
+from .transposition import TranspositionTable
+
+INFINITY: Final[int] = 1_000_000
+MATE_SCORE: Final[int] = 100_000
+MAX_PLY: Final[int] = 128
+# Time and stop flag are checked once per this count of nodes, must be power of two minus one.
+_CHECK_NODES_MASK: Final[int] = 1023
+
+
+class SearchLimits(NamedTuple):
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    time: Optional[float] = None  # seconds
+
+
+class SearchResult(NamedTuple):
+    move: Optional[int]  # best encoded move, None if side to move has no moves
+    score: int  # centipawns for side to move
+    depth: int  # depth of the last completed iteration
+    nodes: int
+    seconds: float
+    pv: tuple[int, ...]
+
+    @property
+    def best_move(self) -> Optional[MovePath]:
+        return None if self.move is None else decode_move(self.move)
+
+    @property
+    def is_mate_score(self) -> bool:
+        return abs(self.score) >= MATE_SCORE - MAX_PLY
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+class _SearchStopped(Exception):
+    pass
+
+
+class Engine:
+    """Negamax alpha-beta search with iterative deepening.
+
+    Search works on `BitBoard` legal moves, so no move is validated twice.
+    Each iteration starts with the best move of the previous one from the
+    transposition table. When node or time budget is spent the result of the
+    last completed iteration is returned. Positions of endgame tables are
+    scored by the table without search.
+    """
+
+    def __init__(self, table: Optional[TranspositionTable] = None, tablebases: Sequence[Tablebase] = ()) -> None:
+        self._table = table if table is not None else TranspositionTable()
+        self._tablebases = tuple(tablebases)
+        self._stopped = False
+        self._nodes = 0
+        self._max_nodes = INFINITY
+        self._deadline: Optional[float] = None
+        self._pv: list[list[int]] = [[] for _ in range(MAX_PLY + 1)]
+
+    @property
+    def table(self) -> TranspositionTable:
+        return self._table
+
+    def stop(self) -> None:
+        """Asks running search to return as soon as possible. Safe to call from other thread."""
+
+        self._stopped = True
+
+    def search(self, bitboard: BitBoard, limits: SearchLimits = SearchLimits(),
+               on_iteration: Optional[Callable[[SearchResult], None]] = None) -> SearchResult:
+        """Searches best move of side to move of `bitboard`.
+
+        Args:
+            bitboard (BitBoard): position to search, it is not changed
+            limits (SearchLimits): depth, node and time budget, depth is
+                limited by `MAX_PLY` when no limit is set
+            on_iteration (Optional[Callable[[SearchResult], None]]): called
+                with result of every completed iteration
+
+        Returns:
+            SearchResult
+        """
+
+        started_at = time.perf_counter()
+        self._stopped = False
+        self._nodes = 0
+        self._max_nodes = INFINITY if limits.nodes is None else limits.nodes
+        self._deadline = None if limits.time is None else started_at + limits.time
+        self._table.new_search()
+        bitboard = bitboard.copy()
+
+        moves = bitboard.legal_moves()
+        if not moves:
+            score = -MATE_SCORE if bitboard.is_check() else 0
+            return SearchResult(move=None, score=score, depth=0, nodes=0,
+                                seconds=time.perf_counter() - started_at, pv=())
+
+        # Any legal move is better than no answer if the first iteration is interrupted.
+        result = SearchResult(move=moves[0], score=0, depth=0, nodes=0, seconds=0.0, pv=(moves[0],))
+        max_depth = min(limits.depth or MAX_PLY, MAX_PLY)
+        if self._probe(bitboard, 0) is not None:
+            max_depth = 1  # scores of all moves are exact
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(bitboard, depth, -INFINITY, INFINITY, 0)
+            except _SearchStopped:
+                break
+            pv = tuple(self._pv[0])
+            result = SearchResult(move=pv[0], score=score, depth=depth, nodes=self._nodes,
+                                  seconds=time.perf_counter() - started_at, pv=pv)
+            if on_iteration is not None:
+                on_iteration(result)
+            if result.is_mate_score and MATE_SCORE - abs(score) <= depth:
+                break  # shortest mate is found
+        return result._replace(nodes=self._nodes, seconds=time.perf_counter() - started_at)
+
+    def _check_limits(self) -> None:
+        """Raises `_SearchStopped` if search is stopped or its budget is spent.
+
+        Raises:
+            _SearchStopped
+        """
+
+        if (self._stopped or
+                self._nodes >= self._max_nodes or
+                self._deadline is not None and time.perf_counter() >= self._deadline):
+            raise _SearchStopped
+
+    def _negamax(self, bitboard: BitBoard, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """Returns score of position for side to move in `alpha`-`beta` window.
+
+        Args:
+            bitboard (BitBoard)
+            depth (int): remaining depth
+            alpha (int)
+            beta (int)
+            ply (int): distance from root
+
+        Returns:
+            int
+
+        Raises:
+            _SearchStopped: raised if search budget is spent
+        """
+
+        self._nodes += 1
+        if self._nodes >= self._max_nodes or not self._nodes & _CHECK_NODES_MASK:
+            self._check_limits()
+        pv = self._pv[ply]
+        pv.clear()
+        if ply and bitboard.is_repetition():
+            return 0
+        if ply:
+            score = self._probe(bitboard, ply)
+            if score is not None:
+                return score
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiescence(bitboard, alpha, beta, ply)
+
+        key = bitboard.key
+        tt_move = 0
+        entry = self._table.probe(key)
+        if entry is not None:
+            tt_move = entry.move
+            if ply and entry.depth >= depth:
+                score = _score_from_table(entry.score, ply)
+                if (entry.bound is Bound.EXACT or
+                        entry.bound is Bound.LOWER and score >= beta or
+                        entry.bound is Bound.UPPER and score <= alpha):
+                    return score
+
+        moves = bitboard.legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if bitboard.is_check() else 0
+        _order_moves(bitboard, moves, tt_move)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        for move in moves:
+            bitboard.make_move(move)
+            score = -self._negamax(bitboard, depth - 1, -beta, -alpha, ply + 1)
+            bitboard.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    pv[:] = [move, *self._pv[ply + 1]]
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self._table.store(key, depth, bound, _score_to_table(best_score, ply), best_move)
+        return best_score
+
+    def _probe(self, bitboard: BitBoard, ply: int) -> Optional[int]:
+        """Returns exact score of position from endgame tables, None if it is not in tables.
+
+        Args:
+            bitboard (BitBoard)
+            ply (int): distance from root
+
+        Returns:
+            Optional[int]
+        """
+
+        if not self._tablebases or pop_count(bitboard.occupied) != 3:
+            return None
+        result = probe_tablebases(self._tablebases, bitboard)
+        if result is None:
+            return None
+        if result.outcome is Outcome.DRAW:
+            return 0
+        score = MATE_SCORE - ply - result.plies
+        return score if result.outcome is Outcome.WIN else -score
+
+    def _quiescence(self, bitboard: BitBoard, alpha: int, beta: int, ply: int) -> int:
+        """Returns score of position after captures and promotions settle down.
+
+        Args:
+            bitboard (BitBoard)
+            alpha (int)
+            beta (int)
+            ply (int): distance from root
+
+        Returns:
+            int
+
+        Raises:
+            _SearchStopped: raised if search budget is spent
+        """
+
+        self._nodes += 1
+        if self._nodes >= self._max_nodes or not self._nodes & _CHECK_NODES_MASK:
+            self._check_limits()
+        stand_pat = evaluate(bitboard)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        moves = [move for move in bitboard.legal_moves()
+                 if move & EN_PASSANT_MOVE or move >> 12 & 7 or
+                 bitboard.piece_type_at(move_to_square(move)) != EMPTY]
+        _order_moves(bitboard, moves, 0)
+        for move in moves:
+            bitboard.make_move(move)
+            score = -self._quiescence(bitboard, -beta, -alpha, ply + 1)
+            bitboard.unmake_move()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+
+def _order_moves(bitboard: BitBoard, moves: list[int], tt_move: int) -> None:
+    """Sorts `moves` in place: table move, then captures by victim value and attacker cheapness, then quiet moves.
+
+    Args:
+        bitboard (BitBoard)
+        moves (list[int])
+        tt_move (int): best move from transposition table or 0
+    """
+
+    def priority(move: int) -> int:
+        if move == tt_move:
+            return -INFINITY
+        victim = PAWN if move & EN_PASSANT_MOVE else bitboard.piece_type_at(move >> 6 & 63)
+        score = PIECE_VALUES[move >> 12 & 7] if move >> 12 & 7 else 0
+        if victim != EMPTY:
+            score += 10 * PIECE_VALUES[victim] - PIECE_VALUES[bitboard.piece_type_at(move & 63)] // 10
+        return -score
+
+    moves.sort(key=priority)
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    """Returns mate score counted from the position instead of root."""
+
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    """Returns mate score of table entry counted from root."""
+
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
@@ -9,3 +9,27 @@ class Color(enum.Enum):
 class Direction(enum.Enum):
     UP = enum.auto()
     DOWN = enum.auto()
+
+
+class Bound(enum.IntEnum):
+    """Kind of search score stored in transposition table."""
+
+    EXACT = 1
+    LOWER = 2
+    UPPER = 3
+
+
+class Verdict(enum.Enum):
+    """Outcome of game replay."""
+
+    LEGAL = enum.auto()
+    ILLEGAL = enum.auto()
+    CHECKMATE = enum.auto()
+
+
+class Outcome(enum.Enum):
+    """Game theoretical result of position for side to move."""
+
+    WIN = enum.auto()
+    DRAW = enum.auto()
+    LOSS = enum.auto()
@@ -0,0 +1,40 @@
+from typing import Union
+
+from .bitboard import PIECE_TYPES, BitBoard, pop_count
+from .enums import Color
+from .mailbox import Mailbox
+from .piece_square import MAX_PHASE, PIECE_VALUES
+
+
+def material(bitboard: Union[BitBoard, Mailbox], color: Color) -> int:
+    """Returns sum of `color` piece values.
+
+    Args:
+        bitboard (Union[BitBoard, Mailbox])
+        color (Color)
+
+    Returns:
+        int
+    """
+
+    return sum(value * pop_count(bitboard.pieces(color, piece_type))
+               for piece_type, value in zip(PIECE_TYPES, PIECE_VALUES))
+
+
+def evaluate(bitboard: Union[BitBoard, Mailbox]) -> int:
+    """Returns static score of position in centipawns for side to move.
+
+    Score is material plus piece-square bonuses, tapered from middlegame to
+    endgame tables by game phase. All three sums are updated by the bitboard
+    as pieces are put and removed, so the call costs O(1).
+
+    Args:
+        bitboard (Union[BitBoard, Mailbox])
+
+    Returns:
+        int
+    """
+
+    phase = min(bitboard.phase, MAX_PHASE)
+    score = bitboard.middlegame_score * phase + bitboard.endgame_score * (MAX_PHASE - phase)
+    return (score if bitboard.turn is Color.WHITE else -score) // MAX_PHASE
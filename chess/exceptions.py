@@ -66,6 +66,65 @@ class MovePathParseError(Exception):
     """Raises if player input invalid move format."""
 
 
+class FenParseError(Exception):
+    """Raises if FEN string has invalid format."""
+
+    def __init__(self, fen: str) -> None:
+        self._fen = fen
+
+    @property
+    def fen(self) -> str:
+        return self._fen
+
+
+class SnapshotFormatError(Exception):
+    """Raises if game snapshot has unknown version or invalid content."""
+
+
+class BookFormatError(Exception):
+    """Raises if opening book file is not a sequence of 16 bytes Polyglot entries."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+
+class TablebaseFormatError(Exception):
+    """Raises if tablebase file has unknown header or size."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+
+class JournalFormatError(Exception):
+    """Raises if move journal file has unknown header or invalid record."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+
+class SanParseError(Exception):
+    """Raises if SAN move has invalid format or names no move in the position."""
+
+    def __init__(self, san: str) -> None:
+        self._san = san
+
+    @property
+    def san(self) -> str:
+        return self._san
+
+
 class ArgumentsCountError(Exception):
     """Raises if invalid command arguments count."""
 
@@ -81,6 +140,17 @@ class CommandNotExistsError(Exception):
         return self._command_name
 
 
+class GameNotFoundError(Exception):
+    """Raises if there is no game with requested id."""
+
+    def __init__(self, game_id: str) -> None:
+        self._game_id = game_id
+
+    @property
+    def game_id(self) -> str:
+        return self._game_id
+
+
 class CheckMate(Exception):
     """Raises if was checkmate."""
 
@@ -90,3 +160,14 @@ class CheckMate(Exception):
     @property
     def color(self) -> Color:
         return self._color
+
+
+class Stalemate(Exception):
+    """Raises if player to move has no legal moves and his king is not in check."""
+
+    def __init__(self, color: Color) -> None:
+        self._color = color
+
+    @property
+    def color(self) -> Color:
+        return self._color
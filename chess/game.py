@@ -1,25 +1,56 @@
-import typing
-from copy import deepcopy
+import struct
+import warnings
+from typing import Final, Iterable, Optional, Union
 
+from .bitboard import (COLORS, EMPTY, PAWN, PIECE_TYPES, QUEEN,
+                       REPETITION_PLIES, SQUARE_POSITIONS, BitBoard,
+                       decode_move, iter_squares, pop_count, square)
 from .board import Board
 from .cell import Cell
 from .consts import letters_nums, nums
 from .controlled_cell import ControlledCell
 from .enums import Color
-from .exceptions import (CheckMate, HiddenCheckError, InvalidColorError,
-                         NotPieceError, UnpossibleMoveError)
+from .evaluation import evaluate
+from .exceptions import (CheckMate, FenParseError, HiddenCheckError,
+                         InvalidColorError, NotPieceError,
+                         SnapshotFormatError, Stalemate, UnpossibleMoveError)
+from .mailbox import Mailbox
+from .move_path import MovePath
 from .pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
 from .position import Position
+from .tablebase import ProbeResult, Tablebase, probe_tablebases
 from .utils import reverse_color
 
+# Move generator kept in sync with the board, both encode squares and moves the same way.
+PositionState = Union[BitBoard, Mailbox]
+
+SNAPSHOT_VERSION: Final[int] = 2
+# Version, flags, occupied squares mask, en passant square, halfmove clock and fullmove number.
+_SNAPSHOT_HEADER: Final[struct.Struct] = struct.Struct("<BBQbII")
+# Greatest halfmove clock and fullmove number, both are 32 bits in snapshot.
+_MAX_MOVE_COUNTER: Final[int] = 0xFFFF_FFFF
+# Snapshot flags.
+_BLACK_TO_MOVE: Final[int] = 1
+_BLACK_PLAYER: Final[int] = 2
+_STARTED: Final[int] = 4
+_MAILBOX: Final[int] = 8
+
 
 class Game:
-    def __init__(self, board: Board, color: Color) -> None:
+    def __init__(self, board: Board, color: Color, bitboard: Optional[PositionState] = None) -> None:
         self._board = board
         self._color = color
         self._pieces: list[Piece] = []
         self._current_move_color = Color.WHITE
         self._game_is_started = False
+        # Position of `board` as bitboard, passed when it is already known or
+        # when `Mailbox` is used instead
+        self._bitboard: PositionState = BitBoard.from_board(
+            board, self._current_move_color) if bitboard is None else bitboard
+        # `board.changes` the bitboard matches, see `_synced_bitboard`
+        self._board_changes = board.changes
+        self._halfmove_clock = 0
+        self._fullmove_number = 1
 
     @property
     def current_move_color(self) -> Color:
@@ -29,25 +60,188 @@ class Game:
     def game_is_started(self) -> bool:
         return self._game_is_started
 
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Zobrist key of the current position."""
+
+        return self._synced_bitboard().key
+
+    @property
+    def bitboard(self) -> PositionState:
+        """Copy of the current position as `BitBoard` or `Mailbox`, e.g. to search it by `Engine`."""
+
+        return self._synced_bitboard().copy()
+
+    @property
+    def halfmove_clock(self) -> int:
+        """Count of moves since the last capture or pawn move."""
+
+        return self._halfmove_clock
+
+    @property
+    def fullmove_number(self) -> int:
+        return self._fullmove_number
+
+    @property
+    def last_move(self) -> Optional[int]:
+        """Encoded move made last, None if no move was made since the position was set."""
+
+        return self._bitboard.last_move
+
     def start_game(self) -> None:
         """Arranges pieces and set current move color to `Color.WHITE`."""
 
         self._arrange_pieces()
         self._current_move_color = Color.WHITE
+        self._bitboard = type(self._bitboard).from_board(self._board, self._current_move_color)
+        self._board_changes = self._board.changes
+        self._halfmove_clock = 0
+        self._fullmove_number = 1
         self._game_is_started = True
 
-    def move(self, from_: Position, to: Position) -> None:
+    @classmethod
+    def from_fen(cls, fen: str, position_type: type[PositionState] = BitBoard) -> "Game":
+        """Creates started game with position from FEN string.
+
+        Pieces are put straight into board cells. Side to move becomes
+        current move color, and `was_move` flags of kings, rooks and pawns
+        are set so that castling and pawn double moves match the position.
+        Halfmove clock and fullmove number fields are optional and must fit
+        32 bits of the snapshot.
+
+        Args:
+            fen (str)
+            position_type (type[PositionState]): move generator kept with the board
+
+        Raises:
+            FenParseError: raised if `fen` has invalid format.
+
+        Returns:
+            Game
+        """
+
+        bitboard = position_type.from_fen(fen)
+        clocks = fen.split()[4:6]
+        if not all(clock.isdigit() and int(clock) <= _MAX_MOVE_COUNTER for clock in clocks):
+            raise FenParseError(fen)
+        game = cls(bitboard.to_board(), bitboard.turn, bitboard)
+        game._current_move_color = bitboard.turn
+        game._game_is_started = True
+        if clocks:
+            game._halfmove_clock = int(clocks[0])
+        if len(clocks) == 2:
+            game._fullmove_number = max(int(clocks[1]), 1)
+        return game
+
+    def to_bytes(self) -> bytes:
+        """Returns compact snapshot of the game, see `from_bytes`.
+
+        Snapshot is header with flags, mask of occupied squares, en passant
+        square and move counters, then 4 bits piece code and 1 bit `was_move`
+        flag per occupied square in square order, 39 bytes for the starting
+        position. Castling rights follow from `was_move` flags. Earlier
+        positions used to find repetitions are not kept.
+
+        Returns:
+            bytes
+        """
+
+        bitboard = self._synced_bitboard()
+        codes = bitboard.piece_codes()
+        board = self._board
+        occupied = 0
+        packed_codes = bytearray(32)
+        was_move = 0
+        count = 0
+        for sq, code in enumerate(codes):
+            if code == EMPTY:
+                continue
+            occupied |= 1 << sq
+            packed_codes[count >> 1] |= code << (count & 1) * 4
+            piece = board[sq >> 3][sq & 7].piece
+            if piece is not None and piece.was_move:
+                was_move |= 1 << count
+            count += 1
+
+        flags = ((self._current_move_color is Color.BLACK) * _BLACK_TO_MOVE |
+                 (self._color is Color.BLACK) * _BLACK_PLAYER |
+                 self._game_is_started * _STARTED |
+                 isinstance(bitboard, Mailbox) * _MAILBOX)
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, flags, occupied, bitboard.ep_square,
+                                       self._halfmove_clock, self._fullmove_number)
+        return header + packed_codes[:(count + 1) >> 1] + was_move.to_bytes((count + 7) >> 3, "little")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Game":
+        """Creates game from snapshot made by `to_bytes`.
+
+        Pieces are created straight from the snapshot and put into cells of
+        a new board, position is built from the board as on `start_game`.
+
+        Args:
+            data (bytes)
+
+        Raises:
+            SnapshotFormatError: raised if `data` is not a snapshot.
+
+        Returns:
+            Game
+        """
+
+        header_size = _SNAPSHOT_HEADER.size
+        if len(data) < header_size:
+            raise SnapshotFormatError
+        version, flags, occupied, ep_square, halfmove_clock, fullmove_number = _SNAPSHOT_HEADER.unpack_from(data)
+        count = pop_count(occupied)
+        flags_offset = header_size + ((count + 1) >> 1)
+        if version != SNAPSHOT_VERSION or len(data) != flags_offset + ((count + 7) >> 3) or not -1 <= ep_square < 64:
+            raise SnapshotFormatError
+        was_move = int.from_bytes(data[flags_offset:], "little")
+
+        board = Board()
+        for i, sq in enumerate(iter_squares(occupied)):
+            code = data[header_size + (i >> 1)] >> (i & 1) * 4 & 15
+            if code >= 12:
+                raise SnapshotFormatError
+            pos = SQUARE_POSITIONS[sq]
+            board[pos.y][pos.x].put_piece(PIECE_TYPES[code % 6](COLORS[code // 6], pos, bool(was_move >> i & 1)))
+
+        turn = Color.BLACK if flags & _BLACK_TO_MOVE else Color.WHITE
+        position_type: type[PositionState] = Mailbox if flags & _MAILBOX else BitBoard
+        bitboard = position_type.from_board(board, turn)
+        if ep_square != -1:
+            bitboard.ep_square = ep_square
+        game = cls(board, Color.BLACK if flags & _BLACK_PLAYER else Color.WHITE, bitboard)
+        game._current_move_color = turn
+        game._game_is_started = bool(flags & _STARTED)
+        game._halfmove_clock = halfmove_clock
+        game._fullmove_number = fullmove_number
+        return game
+
+    def to_fen(self) -> str:
+        """Returns FEN string of the current position.
+
+        Returns:
+            str
+        """
+
+        return f"{self._synced_bitboard().to_fen()} {self._halfmove_clock} {self._fullmove_number}"
+
+    def move(self, from_: Position, to: Position, promotion: Optional[type[Piece]] = None) -> None:
         """Move piece from `from_` to `to`.
 
         Args:
             from_ (Position)
             to (Position)
+            promotion (Optional[type[Piece]]): piece type pawn is promoted to, Queen by default
 
         Raises:
             NotPieceError: raised if board `from_` position cell not have piece.
             InvalidColorError: raised if piece from `from_` position have not current move color.
             UnpossibleMoveError: raised if piece can't move to `to` position.
             HiddenCheckError: raised if after move from `from_` to `to` king with current move color got check.
+            CheckMate: raised after the move if opponent is checkmated.
+            Stalemate: raised after the move if opponent has no legal moves and is not in check.
         """
 
         board = self._board
@@ -57,23 +251,118 @@ class Game:
             raise NotPieceError(cell)
         if piece.color is not self._current_move_color:
             raise InvalidColorError(self._current_move_color)
-        if not piece.can_move_to(to):
+
+        bitboard = self._synced_bitboard()
+        from_sq, to_sq = square(from_), square(to)
+        promotion_type = QUEEN if promotion is None else PIECE_TYPES.index(promotion)
+        move = bitboard.find_move(from_sq, to_sq, promotion_type)
+        if move is None:
+            if bitboard.find_move(from_sq, to_sq, promotion_type, legal=False) is not None:
+                raise HiddenCheckError
             raise UnpossibleMoveError(piece, to)
 
-        roadmap = board.create_roadmap(from_, to)
-        is_free_roadmap = (board.is_free_roadmap(roadmap) if isinstance(
-            piece, Pawn) else board.is_free_roadmap(roadmap[:-1]))
-        if is_free_roadmap:
-            self.check_hidden_check(from_, to)
-            board[from_.y][from_.x].remove_piece()
-            board[to.y][to.x].put_piece(piece)
-            piece.move_to(to)
+        self._make_move(move)
+
+        self._check_checkmate(self._current_move_color)
+
+    def replay_move(self, move: int) -> None:
+        """Makes encoded `move` of a recorded game, e.g. move read from journal.
+
+        Move is checked only against legal moves from its square, which are
+        generated without trying them on the board. Checkmate and stalemate
+        are not raised.
+
+        Args:
+            move (int): encoded move, see `last_move`
+
+        Raises:
+            ValueError: raised if `move` is not legal in the current position.
+        """
+
+        if move not in self._synced_bitboard().legal_moves(1 << (move & 63)):
+            raise ValueError(f"illegal move {move:#x}")
+        self._make_move(move)
+
+    def _make_move(self, move: int) -> None:
+        bitboard = self._bitboard
+        if bitboard.piece_type_at(move & 63) == PAWN or bitboard.piece_type_at(move >> 6 & 63) != EMPTY:
+            self._halfmove_clock = 0
         else:
-            raise UnpossibleMoveError(piece, to)
+            self._halfmove_clock += 1
+        if self._current_move_color is Color.BLACK:
+            self._fullmove_number += 1
+        path = decode_move(move)
+        # Game never takes moves back, so board doesn't keep them
+        self._board.make_move(path.from_, path.to, path.promotion, undo=False)
+        bitboard.make_move(move)
+        self._board_changes = self._board.changes
+        # Positions before capture or pawn move can't repeat, the last move is kept for `last_move`
+        bitboard.trim_history(min(max(self._halfmove_clock, 1), REPETITION_PLIES))
 
         self._revert_color()
 
-        self._check_checkmate(self._current_move_color)
+    def evaluate(self) -> int:
+        """Returns static score of the current position in centipawns for current move color.
+
+        Score terms are updated by every move, so the call costs O(1).
+
+        Returns:
+            int
+        """
+
+        return evaluate(self._synced_bitboard())
+
+    def probe_tablebases(self, tablebases: Iterable[Tablebase]) -> Optional[ProbeResult]:
+        """Returns exact result of the current position for current move color from endgame tables.
+
+        Args:
+            tablebases (Iterable[Tablebase])
+
+        Returns:
+            Optional[ProbeResult]: None if there is no table of the position material
+        """
+
+        return probe_tablebases(tablebases, self._synced_bitboard())
+
+    def legal_moves(self) -> list[MovePath]:
+        """Returns legal moves of current move color.
+
+        Returns:
+            list[MovePath]
+        """
+
+        return [decode_move(move) for move in self._synced_bitboard().legal_moves()]
+
+    def legal_moves_from(self, pos: Position) -> list[MovePath]:
+        """Returns legal moves of piece standing on `pos`.
+
+        Returns empty list if there is no piece of current move color on `pos`.
+
+        Args:
+            pos (Position)
+
+        Returns:
+            list[MovePath]
+        """
+
+        return [decode_move(move) for move in self._synced_bitboard().legal_moves(1 << square(pos))]
+
+    def _synced_bitboard(self) -> PositionState:
+        """Returns position of the board, rebuilt first if pieces were put or removed not by the game.
+
+        Board is the source of truth, e.g. pieces may be placed on it after
+        the game was created. Rebuilt position has no en passant square and
+        no moves to look for repetitions.
+
+        Returns:
+            PositionState
+        """
+
+        board = self._board
+        if board.changes != self._board_changes:
+            self._bitboard = type(self._bitboard).from_board(board, self._current_move_color)
+            self._board_changes = board.changes
+        return self._bitboard
 
     def _revert_color(self) -> None:
         """Change current move color to reverse color."""
@@ -81,47 +370,33 @@ class Game:
         self._current_move_color = reverse_color(self._current_move_color)
 
     def _check_checkmate(self, color: Color) -> None:
-        board = self._board
-        pieces_controlled_cells = board.pieces_controlled_cells()
-        friendly_pieces_controlled_cells = [
-            cc for cc in pieces_controlled_cells if cc.piece.color is color]
-
-        for controlled_cell in friendly_pieces_controlled_cells:
-            piece_pos = controlled_cell.piece.pos
-            future_board = deepcopy(board)
-            future_piece = typing.cast(
-                Piece, future_board[piece_pos.y][piece_pos.x].piece)
-            future_board[future_piece.pos.y][future_piece.pos.x].remove_piece()
-            future_board[controlled_cell.pos.y][controlled_cell.pos.x].put_piece(
-                future_piece)
-            future_piece.move_to(
-                Position(x=controlled_cell.pos.x, y=controlled_cell.pos.y))
-            future_pieces = future_board.get_pieces()
-            future_pieces_controlled_cells = future_board.pieces_controlled_cells()
-            king = self._get_king_from_pieces(future_pieces, color)
-            if not self.piece_can_will_be_beaten(king, future_pieces_controlled_cells):
-                return None
-        raise CheckMate(color)
-
-    def _get_king_from_pieces(self, pieces: list[Piece], color: Color) -> King:
-        """Returns king with color as `color` from `pieces`.
+        """Raises CheckMate or Stalemate if `color` player to move has no legal moves.
+
+        Check is found by one attack lookup on the king, and the search for
+        a legal move stops at the first one found. Player without king and
+        legal moves is checkmated.
 
         Args:
-            pieces (list[Piece])
-            color (Color)
+            color (Color): color of player to move
 
-        Returns:
-            King
+        Raises:
+            CheckMate
+            Stalemate
         """
 
-        kings: list[King] = [p for p in pieces if isinstance(
-            p, King) and p.color is color]
-
-        return kings[0]
+        bitboard = self._bitboard
+        if bitboard.has_legal_move():
+            return None
+        if bitboard.is_check() or bitboard.king_square(color) == -1:
+            raise CheckMate(color)
+        raise Stalemate(color)
 
     def check_hidden_check(self, from_: Position, to: Position) -> None:
         """Raises HiddenCheckError if after move from `from_` to `to` king got check.
 
+        Deprecated, `move` raises HiddenCheckError and `legal_moves_from`
+        returns only moves which don't leave the king attacked.
+
         Args:
             from_ (Position)
             to (Position)
@@ -130,21 +405,18 @@ class Game:
             HiddenCheckError
         """
 
-        future_board = deepcopy(self._board)
-        future_piece = typing.cast(Piece, future_board[from_.y][from_.x].piece)
-        future_board[from_.y][from_.x].remove_piece()
-        future_board[to.y][to.x].put_piece(future_piece)
-        future_piece.move_to(to)
-
-        pieces = future_board.get_pieces()
-        king = self._get_king_from_pieces(pieces, self._current_move_color)
-        controlled_cells = future_board.pieces_controlled_cells()
-        if self.piece_can_will_be_beaten(king, controlled_cells):
+        warnings.warn("Game.check_hidden_check is deprecated, use Game.legal_moves_from",
+                      DeprecationWarning, stacklevel=2)
+        bitboard = self._synced_bitboard()
+        move = bitboard.find_move(square(from_), square(to), legal=False)
+        if move is not None and not bitboard.is_legal(move):
             raise HiddenCheckError
 
     def piece_can_will_be_beaten(self, piece: Piece, controlled_cells: list[ControlledCell]) -> bool:
         """Returns True if `piece` can will be beaten.
 
+        Deprecated, use `BitBoard.is_square_attacked` of `bitboard`.
+
         Args:
             piece (Piece)
             controlled_cells (list[ControlledCell]): pieces controlled cells
@@ -153,6 +425,8 @@ class Game:
             bool
         """
 
+        warnings.warn("Game.piece_can_will_be_beaten is deprecated, use BitBoard.is_square_attacked",
+                      DeprecationWarning, stacklevel=2)
         piece_pos = piece.pos
         piece_color = piece.color
         for controlled_cell in controlled_cells:
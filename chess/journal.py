@@ -0,0 +1,264 @@
+import io
+import os
+import struct
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Final, Union
+
+from .exceptions import JournalFormatError, SnapshotFormatError
+from .game import Game
+
+# Moves of a game between its checkpoints, recovery replays at most as many moves per game.
+DEFAULT_CHECKPOINT_INTERVAL: Final[int] = 64
+_HEADER: Final[struct.Struct] = struct.Struct("<4sB3x")
+_MAGIC: Final[bytes] = b"CHJL"
+_VERSION: Final[int] = 1
+# Record is kind, game id and payload size followed by payload.
+_RECORD: Final[struct.Struct] = struct.Struct("<BIH")
+_MOVE_PAYLOAD: Final[struct.Struct] = struct.Struct("<I")
+# Record kinds.
+_CHECKPOINT: Final[int] = 1  # payload is snapshot made by `Game.to_bytes`
+_MOVE: Final[int] = 2  # payload is encoded move
+_CLOSE: Final[int] = 3  # game is removed, no payload
+
+# The last checkpoint and encoded moves made after it by game id.
+_JournalGames = dict[int, tuple[bytes, list[int]]]
+
+
+def _record(kind: int, game_id: int, payload: bytes = b"") -> bytes:
+    return _RECORD.pack(kind, game_id, len(payload)) + payload
+
+
+def _read_journal(data: bytes, path: str) -> tuple[_JournalGames, int]:
+    """Returns the last checkpoint and moves after it of every open game.
+
+    Record torn by a crash at the end of `data` is ignored.
+
+    Args:
+        data (bytes): journal file content
+        path (str): journal file path for errors
+
+    Raises:
+        JournalFormatError: raised if `data` has unknown header or invalid record.
+
+    Returns:
+        tuple[_JournalGames, int]: games and size of whole records with header
+    """
+
+    if len(data) < _HEADER.size or _HEADER.unpack_from(data) != (_MAGIC, _VERSION):
+        raise JournalFormatError(path)
+    games: _JournalGames = {}
+    unpack_record = _RECORD.unpack_from
+    unpack_move = _MOVE_PAYLOAD.unpack_from
+    record_size = _RECORD.size
+    size = len(data)
+    offset = _HEADER.size
+    while offset + record_size <= size:
+        kind, game_id, payload_size = unpack_record(data, offset)
+        end = offset + record_size + payload_size
+        if end > size:
+            break
+        if kind == _MOVE:
+            if game_id not in games or payload_size != _MOVE_PAYLOAD.size:
+                raise JournalFormatError(path)
+            games[game_id][1].append(unpack_move(data, offset + record_size)[0])
+        elif kind == _CHECKPOINT:
+            games[game_id] = (data[offset + record_size:end], [])
+        elif kind == _CLOSE:
+            games.pop(game_id, None)
+        else:
+            raise JournalFormatError(path)
+        offset = end
+    return games, offset
+
+
+def recover_games(path: Union[str, Path]) -> dict[int, Game]:
+    """Returns open games of journal written by `MoveJournal` in their last positions.
+
+    Every game is created from its last checkpoint and moves recorded
+    after it are made by `Game.replay_move`, which skips the checks of
+    `Game.move` but the move legality. Game is left at its last legal
+    move if a recorded move is not legal, moves after it are dropped.
+    Positions before the checkpoint are not kept, so repetitions are found
+    only among replayed moves.
+
+    Args:
+        path (Union[str, Path])
+
+    Raises:
+        JournalFormatError: raised if file has unknown header or invalid record.
+
+    Returns:
+        dict[int, Game]: games by id
+    """
+
+    with open(path, "rb") as file:
+        data = file.read()
+    games = {}
+    for game_id, (snapshot, moves) in _read_journal(data, str(path))[0].items():
+        try:
+            game = Game.from_bytes(snapshot)
+        except SnapshotFormatError:
+            raise JournalFormatError(str(path)) from None
+        with suppress(ValueError):
+            for move in moves:
+                game.replay_move(move)
+        games[game_id] = game
+    return games
+
+
+class MoveJournal:
+    """Append-only file of game moves with periodic checkpoints, read by `recover_games`.
+
+    Move is an 11 bytes record. After every `checkpoint_interval` moves of
+    a game its snapshot is recorded instead, so recovery replays only a
+    few moves per game. Every record is written to the operating system at
+    once, so it survives crash of the process, and with `sync` it's also
+    flushed to the disk, so it survives crash of the machine. Record torn
+    by a crash is cut off when the journal is opened again, and a new
+    journal file is created if there is no file.
+
+    Records may be written from many threads, records of one game must be
+    written in order by the caller. With `sync` threads recording at the
+    same time share one flush to the disk.
+    """
+
+    def __init__(self, path: Union[str, Path], checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+                 sync: bool = False) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint interval must be positive, got {checkpoint_interval}")
+        self._path = Path(path)
+        self._checkpoint_interval = checkpoint_interval
+        self._sync = sync
+        # Moves recorded since the last checkpoint by game id
+        self._plies: dict[int, int] = {}
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # Count of written records and count of them flushed to the disk
+        self._written = 0
+        self._synced = 0
+        self._file = self._open()
+
+    def __enter__(self) -> "MoveJournal":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def checkpoint_interval(self) -> int:
+        return self._checkpoint_interval
+
+    def close(self) -> None:
+        self._file.close()
+
+    def add_game(self, game_id: int, game: Game) -> None:
+        """Records checkpoint of the game, e.g. new or started again one.
+
+        Args:
+            game_id (int)
+            game (Game)
+        """
+
+        self._write(_record(_CHECKPOINT, game_id, game.to_bytes()))
+        self._plies[game_id] = 0
+
+    def record_move(self, game_id: int, game: Game) -> None:
+        """Records move just made in the game, or its checkpoint every `checkpoint_interval` moves.
+
+        Args:
+            game_id (int): id of game added by `add_game`
+            game (Game)
+
+        Raises:
+            KeyError: raised if game was not added.
+            ValueError: raised if no move was made in the game.
+        """
+
+        plies = self._plies[game_id] + 1
+        move = game.last_move
+        if move is None:
+            raise ValueError(f"no move was made in game {game_id}")
+        if plies >= self._checkpoint_interval:
+            self.add_game(game_id, game)
+            return
+        self._write(_record(_MOVE, game_id, _MOVE_PAYLOAD.pack(move)))
+        self._plies[game_id] = plies
+
+    def remove_game(self, game_id: int) -> None:
+        """Records that the game is closed, so it's not recovered.
+
+        Args:
+            game_id (int)
+
+        Raises:
+            KeyError: raised if game was not added.
+        """
+
+        del self._plies[game_id]
+        self._write(_record(_CLOSE, game_id))
+
+    def compact(self) -> None:
+        """Rewrites the journal as the last checkpoint and following moves of every open game.
+
+        Records of closed games and before the last checkpoints are dropped.
+        File is replaced at once, so crash while compacting keeps the old one.
+        """
+
+        with self._write_lock, self._sync_lock:
+            self._file.seek(0)
+            games, _ = _read_journal(self._file.readall(), str(self._path))
+            temporary_path = self._path.with_name(self._path.name + ".tmp")
+            with open(temporary_path, "wb") as file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION))
+                for game_id, (snapshot, moves) in games.items():
+                    file.write(_record(_CHECKPOINT, game_id, snapshot))
+                    file.writelines(_record(_MOVE, game_id, _MOVE_PAYLOAD.pack(move)) for move in moves)
+                file.flush()
+                os.fsync(file.fileno())
+            self._file.close()
+            os.replace(temporary_path, self._path)
+            self._file = self._open()
+
+    def _open(self) -> io.FileIO:
+        """Opens the journal for appending, writes header to a new one and cuts off torn record.
+
+        Returns:
+            io.FileIO: unbuffered file, so every record is written by one call
+        """
+
+        file = open(self._path, "a+b", buffering=0)
+        try:
+            file.seek(0)
+            data = file.readall()
+            if data:
+                games, size = _read_journal(data, str(self._path))
+                if size < len(data):
+                    file.truncate(size)
+                self._plies = {game_id: len(moves) for game_id, (_, moves) in games.items()}
+            else:
+                file.write(_HEADER.pack(_MAGIC, _VERSION))
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+    def _write(self, data: bytes) -> None:
+        with self._write_lock:
+            self._file.write(data)
+            self._written += 1
+            written = self._written
+        if not self._sync:
+            return
+        with self._sync_lock:
+            # Flush made by another thread while this one waited may cover the record
+            if self._synced < written:
+                synced = self._written
+                os.fsync(self._file.fileno())
+                self._synced = synced
+
@@ -0,0 +1,416 @@
+from array import array
+from typing import Final, Optional
+
+from .bitboard import (BISHOP, BLACK_KINGSIDE, BLACK_QUEENSIDE,
+                       CASTLING_MOVE, COLORS, DOUBLE_PUSH_MOVE, EMPTY,
+                       EN_PASSANT_MOVE, KING, KNIGHT, PAWN, PIECE_TYPES,
+                       PROMOTION_TYPES, QUEEN, ROOK, WHITE, WHITE_KINGSIDE,
+                       WHITE_QUEENSIDE, BitBoard, BoardState, color_index)
+from .enums import Color
+from .pieces import Piece
+from .piece_square import ENDGAME_SCORES, MIDDLEGAME_SCORES, PHASES
+from .zobrist import EN_PASSANT_KEYS, PIECE_KEYS
+
+# Code of the sentinel squares around the board in the 10x12 mailbox.
+OFF_BOARD: Final[int] = -2
+# Mailbox index by square index(0 - 63). Two sentinel rows above and below
+# the board stop knight jumps, one sentinel column on each side stops the
+# rest, so no move needs a coordinate check.
+MAILBOX_SQUARES: Final[tuple[int, ...]] = tuple(21 + sq // 8 * 10 + sq % 8 for sq in range(64))
+# Square index by mailbox index, -1 for sentinel squares.
+SQUARES: Final[tuple[int, ...]] = tuple(
+    MAILBOX_SQUARES.index(i) if i in MAILBOX_SQUARES else -1 for i in range(120))
+_EMPTY_MAILBOX: Final[array] = array("b", (OFF_BOARD if sq == -1 else EMPTY for sq in SQUARES))
+
+KNIGHT_OFFSETS: Final[tuple[int, ...]] = (-21, -19, -12, -8, 8, 12, 19, 21)
+BISHOP_OFFSETS: Final[tuple[int, ...]] = (-11, -9, 9, 11)
+ROOK_OFFSETS: Final[tuple[int, ...]] = (-10, -1, 1, 10)
+KING_OFFSETS: Final[tuple[int, ...]] = ROOK_OFFSETS + BISHOP_OFFSETS
+# Offsets of cells beaten by pawn by color index.
+PAWN_BEAT_OFFSETS: Final[tuple[tuple[int, int], ...]] = ((9, 11), (-9, -11))
+
+
+class Mailbox(BoardState):
+    """Board stored as flat 10x12 `array` of piece codes.
+
+    Piece code is `color * 6 + piece type` as in `BitBoard`, and board is
+    surrounded by `OFF_BOARD` sentinel squares. Squares and moves are
+    encoded the same way as in `BitBoard`, so both can be used by `Game`,
+    `Engine` and `perft`. Copy of the position is a copy of one 120 bytes buffer.
+    Every pseudo legal move is made and unmade to look for attack on own king.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._squares = array("b", _EMPTY_MAILBOX)
+        # Mailbox index of king by color index, -1 if there is no king.
+        self._kings: list[int] = [-1, -1]
+
+    @property
+    def occupied(self) -> int:
+        squares = self._squares
+        return sum(1 << sq for sq, i in enumerate(MAILBOX_SQUARES) if squares[i] != EMPTY)
+
+    def _ep_key(self) -> int:
+        """Returns en passant part of Zobrist key.
+
+        Returns:
+            int
+        """
+
+        ep_square = self._ep_square
+        if ep_square == -1:
+            return 0
+        turn = self._turn
+        pawn = turn * 6 + PAWN
+        i = MAILBOX_SQUARES[ep_square]
+        squares = self._squares
+        if any(squares[i - offset] == pawn for offset in PAWN_BEAT_OFFSETS[turn]):
+            return EN_PASSANT_KEYS[ep_square & 7]
+        return 0
+
+    def occupancy(self, color: Color) -> int:
+        """Returns mask of squares occupied by `color` pieces.
+
+        Args:
+            color (Color)
+
+        Returns:
+            int
+        """
+
+        color = color_index(color)
+        squares = self._squares
+        return sum(1 << sq for sq, i in enumerate(MAILBOX_SQUARES)
+                   if squares[i] != EMPTY and squares[i] // 6 == color)
+
+    def pieces(self, color: Color, piece_type: type[Piece]) -> int:
+        """Returns mask of `color` pieces with `piece_type` type.
+
+        Args:
+            color (Color)
+            piece_type (type[Piece])
+
+        Returns:
+            int
+        """
+
+        code = color_index(color) * 6 + PIECE_TYPES.index(piece_type)
+        squares = self._squares
+        return sum(1 << sq for sq, i in enumerate(MAILBOX_SQUARES) if squares[i] == code)
+
+    def piece_at(self, sq: int) -> Optional[tuple[Color, type[Piece]]]:
+        """Returns color and type of piece on `sq` or None if square is empty.
+
+        Args:
+            sq (int)
+
+        Returns:
+            Optional[tuple[Color, type[Piece]]]
+        """
+
+        code = self._squares[MAILBOX_SQUARES[sq]]
+        if code == EMPTY:
+            return None
+        return COLORS[code // 6], PIECE_TYPES[code % 6]
+
+    def piece_codes(self) -> list[int]:
+        """Returns piece code(color * 6 + piece type) or EMPTY of every square.
+
+        Returns:
+            list[int]: 64 codes indexed by square
+        """
+
+        squares = self._squares
+        return [code for y in range(8) for code in squares[21 + y * 10:29 + y * 10]]
+
+    def piece_type_at(self, sq: int) -> int:
+        """Returns piece type index of piece on `sq` or EMPTY.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int
+        """
+
+        code = self._squares[MAILBOX_SQUARES[sq]]
+        return code if code == EMPTY else code % 6
+
+    def put_piece(self, sq: int, color: int, piece_type: int) -> None:
+        """Puts piece on empty `sq` square.
+
+        Args:
+            sq (int)
+            color (int): color index
+            piece_type (int): piece type index
+        """
+
+        i = MAILBOX_SQUARES[sq]
+        code = color * 6 + piece_type
+        self._squares[i] = code
+        if piece_type == KING:
+            self._kings[color] = i
+        self._key ^= PIECE_KEYS[code][sq]
+        self._middlegame_score += MIDDLEGAME_SCORES[code][sq]
+        self._endgame_score += ENDGAME_SCORES[code][sq]
+        self._phase += PHASES[code]
+
+    def remove_piece(self, sq: int) -> int:
+        """Removes piece from `sq` square.
+
+        Args:
+            sq (int)
+
+        Returns:
+            int: code of removed piece or EMPTY
+        """
+
+        i = MAILBOX_SQUARES[sq]
+        code = self._squares[i]
+        if code != EMPTY:
+            self._squares[i] = EMPTY
+            if code % 6 == KING and self._kings[code // 6] == i:
+                self._kings[code // 6] = -1
+            self._key ^= PIECE_KEYS[code][sq]
+            self._middlegame_score -= MIDDLEGAME_SCORES[code][sq]
+            self._endgame_score -= ENDGAME_SCORES[code][sq]
+            self._phase -= PHASES[code]
+        return code
+
+    def _is_attacked(self, i: int, color: int) -> bool:
+        """Returns True if mailbox square `i` is attacked by `color` pieces.
+
+        Rays are walked from the square until the first piece or sentinel.
+
+        Args:
+            i (int): mailbox index
+            color (int): color index of attackers
+
+        Returns:
+            bool
+        """
+
+        squares = self._squares
+        code = color * 6
+        pawn, knight, king = code + PAWN, code + KNIGHT, code + KING
+        bishop, rook, queen = code + BISHOP, code + ROOK, code + QUEEN
+        for offset in PAWN_BEAT_OFFSETS[color]:
+            if squares[i - offset] == pawn:
+                return True
+        for offset in KNIGHT_OFFSETS:
+            if squares[i + offset] == knight:
+                return True
+        for offset in KING_OFFSETS:
+            if squares[i + offset] == king:
+                return True
+        for offsets, slider in ((BISHOP_OFFSETS, bishop), (ROOK_OFFSETS, rook)):
+            for offset in offsets:
+                j = i + offset
+                while squares[j] == EMPTY:
+                    j += offset
+                if squares[j] == slider or squares[j] == queen:
+                    return True
+        return False
+
+    def is_square_attacked(self, sq: int, color: Color) -> bool:
+        """Returns True if `sq` is attacked by `color` pieces.
+
+        Args:
+            sq (int)
+            color (Color): attackers color
+
+        Returns:
+            bool
+        """
+
+        return self._is_attacked(MAILBOX_SQUARES[sq], color_index(color))
+
+    def king_square(self, color: Color) -> int:
+        """Returns square of `color` king, -1 if there is no king.
+
+        Args:
+            color (Color)
+
+        Returns:
+            int
+        """
+
+        return SQUARES[self._kings[color_index(color)]]
+
+    def is_check(self) -> bool:
+        """Returns True if king of side to move is attacked.
+
+        Returns:
+            bool
+        """
+
+        king = self._kings[self._turn]
+        return king != -1 and self._is_attacked(king, self._turn ^ 1)
+
+    def _generate_moves(self, from_mask: int, legal: bool) -> list[int]:
+        us = self._turn
+        them = us ^ 1
+        squares = self._squares
+        moves: list[int] = []
+        append = moves.append
+
+        if us == WHITE:
+            push, double_push_row, last_row = 10, 1, 7
+        else:
+            push, double_push_row, last_row = -10, 6, 0
+        ep = -1 if self._ep_square == -1 else MAILBOX_SQUARES[self._ep_square]
+        for from_sq in range(64):
+            if not from_mask >> from_sq & 1:
+                continue
+            i = MAILBOX_SQUARES[from_sq]
+            code = squares[i]
+            if code < 0 or code // 6 != us:
+                continue
+            piece_type = code % 6
+            if piece_type == PAWN:
+                promotes = from_sq >> 3 == last_row - (1 if us == WHITE else -1)
+                j = i + push
+                if squares[j] == EMPTY:
+                    to_sq = SQUARES[j]
+                    if promotes:
+                        for promotion in PROMOTION_TYPES:
+                            append(from_sq | to_sq << 6 | promotion << 12)
+                    else:
+                        append(from_sq | to_sq << 6)
+                    if from_sq >> 3 == double_push_row and squares[j + push] == EMPTY:
+                        append(from_sq | SQUARES[j + push] << 6 | DOUBLE_PUSH_MOVE)
+                for offset in PAWN_BEAT_OFFSETS[us]:
+                    j = i + offset
+                    target = squares[j]
+                    if target >= 0 and target // 6 == them:
+                        to_sq = SQUARES[j]
+                        if promotes:
+                            for promotion in PROMOTION_TYPES:
+                                append(from_sq | to_sq << 6 | promotion << 12)
+                        else:
+                            append(from_sq | to_sq << 6)
+                    elif j == ep:
+                        append(from_sq | SQUARES[j] << 6 | EN_PASSANT_MOVE)
+            elif piece_type in (KNIGHT, KING):
+                for offset in KNIGHT_OFFSETS if piece_type == KNIGHT else KING_OFFSETS:
+                    target = squares[i + offset]
+                    if target == EMPTY or target >= 0 and target // 6 == them:
+                        append(from_sq | SQUARES[i + offset] << 6)
+                if piece_type == KING:
+                    self._generate_castling_moves(moves, legal)
+            else:
+                offsets = (BISHOP_OFFSETS if piece_type == BISHOP else
+                           ROOK_OFFSETS if piece_type == ROOK else KING_OFFSETS)
+                for offset in offsets:
+                    j = i + offset
+                    while squares[j] == EMPTY:
+                        append(from_sq | SQUARES[j] << 6)
+                        j += offset
+                    if squares[j] >= 0 and squares[j] // 6 == them:
+                        append(from_sq | SQUARES[j] << 6)
+
+        if legal:
+            moves = [move for move in moves if move & CASTLING_MOVE or self._is_safe(move)]
+        return moves
+
+    def _generate_castling_moves(self, moves: list[int], legal: bool) -> None:
+        """Appends castling moves of side to move to `moves`.
+
+        Args:
+            moves (list[int])
+            legal (bool): skip castling from check and through attacked squares,
+                king destination is checked with other moves
+        """
+
+        us = self._turn
+        rights = self._castling_rights
+        squares = self._squares
+        if us == WHITE:
+            kingside, queenside, king_sq = rights & WHITE_KINGSIDE, rights & WHITE_QUEENSIDE, 4
+        else:
+            kingside, queenside, king_sq = rights & BLACK_KINGSIDE, rights & BLACK_QUEENSIDE, 60
+        if not kingside and not queenside:
+            return
+        i = MAILBOX_SQUARES[king_sq]
+        if legal and self._is_attacked(i, us ^ 1):
+            return
+        for right, step, rook_distance in ((kingside, 1, 3), (queenside, -1, 4)):
+            if not right or any(squares[i + step * k] != EMPTY for k in range(1, rook_distance)):
+                continue
+            if legal and (self._is_attacked(i + step, us ^ 1) or self._is_attacked(i + 2 * step, us ^ 1)):
+                continue
+            moves.append(king_sq | (king_sq + 2 * step) << 6 | CASTLING_MOVE)
+
+    def _is_safe(self, move: int) -> bool:
+        """Returns True if pseudo legal `move` other than castling doesn't leave own king attacked.
+
+        Args:
+            move (int): pseudo legal encoded move
+
+        Returns:
+            bool
+        """
+
+        color = self._turn
+        self.make_move(move)
+        king = self._kings[color]
+        is_safe = king == -1 or not self._is_attacked(king, color ^ 1)
+        self.unmake_move()
+        return is_safe
+
+    def copy(self) -> "Mailbox":
+        """Returns independent copy of the mailbox.
+
+        Returns:
+            Mailbox
+        """
+
+        mailbox = super().copy()
+        mailbox._squares = self._squares[:]
+        mailbox._kings = self._kings[:]
+        return mailbox
+
+    @classmethod
+    def from_bitboard(cls, bitboard: BitBoard) -> "Mailbox":
+        """Creates mailbox with the position of `bitboard`.
+
+        Moves made on `bitboard` are not carried over, so they can't be unmade.
+
+        Args:
+            bitboard (BitBoard)
+
+        Returns:
+            Mailbox
+        """
+
+        mailbox = cls()
+        for sq in range(64):
+            piece = bitboard.piece_at(sq)
+            if piece is not None:
+                color, piece_type = piece
+                mailbox.put_piece(sq, color_index(color), PIECE_TYPES.index(piece_type))
+        mailbox._turn = color_index(bitboard.turn)
+        mailbox._castling_rights = bitboard.castling_rights
+        mailbox._ep_square = bitboard.ep_square
+        mailbox._key = mailbox._compute_key()
+        return mailbox
+
+    def to_bitboard(self) -> BitBoard:
+        """Creates bitboard with the position of the mailbox.
+
+        Returns:
+            BitBoard
+        """
+
+        bitboard = BitBoard()
+        squares = self._squares
+        for sq, i in enumerate(MAILBOX_SQUARES):
+            code = squares[i]
+            if code != EMPTY:
+                bitboard.put_piece(sq, code // 6, code % 6)
+        bitboard._turn = self._turn
+        bitboard._castling_rights = self._castling_rights
+        bitboard._ep_square = self._ep_square
+        bitboard._key = self._key
+        return bitboard
@@ -1,13 +1,249 @@
-from .board import Board
-from .board_printer import BoardPrinter
-from .enums import Color
-from .game import Game
-from .tui import TUI
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
 
+from .perft import (PERFT_POSITIONS_PATH, PerftPosition, load_perft_positions,
+                    run_perft)
+
+# Other modules of subcommands are imported by their handlers, so every
+# command, e.g. the plain game, loads only what it runs.
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = _create_parser()
+    args = parser.parse_args(argv)
+    if args.command == "perft":
+        return _perft(args.depth, args.fen, args.file)
+    if args.command == "pgn":
+        return _pgn(args.file, args.workers, args.chunk_size)
+    if args.command == "book":
+        return _book(args.file, args.output, args.plies)
+    if args.command == "tablebase":
+        return _tablebase(args.signatures, args.output, args.workers)
+    if args.command == "uci":
+        return _uci(args.hash, args.tablebases)
+    if args.command == "serve":
+        return _serve(args.host, args.port, args.unix, args.workers, args.journal)
+    _play()
+    return 0
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="chess")
+    subparsers = parser.add_subparsers(dest="command")
+
+    perft_parser = subparsers.add_parser(
+        "perft", help="count move generator nodes and check them with known counts")
+    perft_parser.add_argument("-d", "--depth", type=int, default=3,
+                              help="max depth (default: 3)")
+    perft_parser.add_argument("--fen", help="run only this position")
+    perft_parser.add_argument("--file", type=Path, default=PERFT_POSITIONS_PATH,
+                              help="EPD file with positions and known counts")
+
+    pgn_parser = subparsers.add_parser(
+        "pgn", help="replay PGN games and check their moves by the rules")
+    pgn_parser.add_argument("file", type=Path, help="PGN file")
+    pgn_parser.add_argument("-j", "--workers", type=int, default=1,
+                            help="worker processes, 0 for CPU count (default: 1)")
+    pgn_parser.add_argument("--chunk-size", type=int,
+                            help="games sent to worker at once (default: 64)")
+
+    book_parser = subparsers.add_parser(
+        "book", help="compile Polyglot opening book from PGN games")
+    book_parser.add_argument("file", type=Path, help="PGN file")
+    book_parser.add_argument("output", type=Path, help="book file to write")
+    book_parser.add_argument("--plies", type=int, default=24,
+                             help="moves taken from every game (default: 24)")
+
+    tablebase_parser = subparsers.add_parser(
+        "tablebase", help="generate endgame tables of king and piece against king")
+    tablebase_parser.add_argument("signatures", nargs="+", help="material signatures, e.g. KQK KRK KPK")
+    tablebase_parser.add_argument("-o", "--output", type=Path, default=Path("."),
+                                  help="directory to write tables to (default: current directory)")
+    tablebase_parser.add_argument("-j", "--workers", type=int, default=1,
+                                  help="worker processes, 0 for CPU count (default: 1)")
+
+    uci_parser = subparsers.add_parser(
+        "uci", help="run engine speaking Universal Chess Interface on stdin and stdout")
+    uci_parser.add_argument("--hash", type=float, default=16,
+                            help="transposition table size in megabytes (default: 16)")
+    uci_parser.add_argument("--tablebases", type=Path, help="directory with endgame tables")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="host many games over TCP or Unix socket")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="host to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    serve_parser.add_argument("--unix", help="Unix socket path to listen on instead of TCP port")
+    serve_parser.add_argument("-j", "--workers", type=int,
+                              help="threads making moves (default: executor default)")
+    serve_parser.add_argument("--journal", help="move journal file, its games are recovered on start")
+    return parser
+
+
+def _play() -> None:
+    from .board import Board
+    from .board_printer import BoardPrinter
+    from .enums import Color
+    from .game import Game
+    from .tui import TUI
 
-def main():
     board = Board()
     game = Game(board, Color.WHITE)
     board_printer = BoardPrinter(board)
     tui = TUI(game, board_printer)
     tui.run()
+
+
+def _perft(depth: int, fen: Optional[str], path: Path) -> int:
+    """Runs perft suite and prints nodes and nodes per second by depth.
+
+    Args:
+        depth (int): max depth
+        fen (Optional[str]): position to run instead of suite positions
+        path (Path): EPD file with positions
+
+    Returns:
+        int: exit code, 1 if some node count differs from the known count
+    """
+
+    positions = [PerftPosition(fen=fen, nodes=())] if fen else load_perft_positions(path)
+    failed = False
+    for position in positions:
+        print(position.fen)
+        for result in run_perft(position, depth):
+            status = "" if result.expected_nodes is None else (
+                "ok" if result.is_correct else f"FAIL, expected {result.expected_nodes}")
+            print(f"  depth {result.depth:>2}  nodes {result.nodes:>12}  "
+                  f"{result.seconds:>8.3f}s  {result.nodes_per_second:>10.0f} nodes/s  {status}")
+            failed = failed or not result.is_correct
+    return 1 if failed else 0
+
+
+def _pgn(path: Path, workers: int, chunk_size: Optional[int]) -> int:
+    """Replays games of PGN file, prints rejected games and games per second.
+
+    Args:
+        path (Path): PGN file
+        workers (int): worker processes, games are replayed in this process if 1, CPU count is used if 0
+        chunk_size (Optional[int]): games sent to worker at once, `DEFAULT_CHUNK_SIZE` if None
+
+    Returns:
+        int: exit code, 1 if some game has illegal or unparsable move
+    """
+
+    from .batch import DEFAULT_CHUNK_SIZE, validate_pgn
+    from .pgn import replay_games
+
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+
+    games = legal = checkmates = 0
+    started_at = time.perf_counter()
+    with open(path, encoding="utf-8", errors="replace") as file:
+        results = replay_games(file) if workers == 1 else validate_pgn(file, workers or None, chunk_size)
+        for games, result in enumerate(results, 1):
+            if result.is_legal:
+                legal += 1
+                checkmates += result.is_checkmate
+            else:
+                print(f"game {games}: illegal at ply {result.illegal_ply}, {result.error}")
+    seconds = time.perf_counter() - started_at
+    games_per_second = games / seconds if seconds else 0.0
+    print(f"{games} games, {legal} legal, {checkmates} checkmates, "
+          f"{seconds:.3f}s, {games_per_second:.1f} games/s")
+    return 0 if legal == games else 1
+
+
+def _book(path: Path, output: Path, plies: int) -> int:
+    """Compiles Polyglot book from games of PGN file and prints count of entries.
+
+    Args:
+        path (Path): PGN file
+        output (Path): book file to write
+        plies (int): moves taken from every game
+
+    Returns:
+        int: exit code
+    """
+
+    from .polyglot import build_book
+
+    started_at = time.perf_counter()
+    with open(path, encoding="utf-8", errors="replace") as file:
+        entries = build_book(file, output, plies)
+    print(f"{entries} entries written to {output}, {time.perf_counter() - started_at:.3f}s")
+    return 0
+
+
+def _tablebase(signatures: list[str], output: Path, workers: int) -> int:
+    """Generates endgame tables and prints their paths.
+
+    Args:
+        signatures (list[str]): material signatures, e.g. "KQK"
+        output (Path): directory to write tables to
+        workers (int): worker processes, CPU count is used if 0
+
+    Returns:
+        int: exit code, 2 if some signature is not supported
+    """
+
+    from .tablebase import generate_tablebases
+
+    started_at = time.perf_counter()
+    try:
+        paths = generate_tablebases(signatures, output, workers or None)
+    except ValueError as error:
+        print(error)
+        return 2
+    for path in paths:
+        print(f"{path} written")
+    print(f"{time.perf_counter() - started_at:.3f}s")
+    return 0
+
+
+def _uci(hash_mb: float, tablebases_path: Optional[Path]) -> int:
+    """Runs UCI engine until `quit` or end of input.
+
+    Args:
+        hash_mb (float): transposition table size in megabytes
+        tablebases_path (Optional[Path]): directory with endgame tables
+
+    Returns:
+        int: exit code
+    """
+
+    from .engine import Engine
+    from .tablebase import open_tablebases
+    from .transposition import TranspositionTable
+    from .uci import UCI
+
+    tablebases = open_tablebases(tablebases_path) if tablebases_path is not None else []
+    UCI(Engine(TranspositionTable(hash_mb), tablebases)).run()
+    return 0
+
+
+def _serve(host: str, port: int, path: Optional[str], workers: Optional[int], journal_path: Optional[str]) -> int:
+    """Runs game server until interrupted.
+
+    Args:
+        host (str)
+        port (int)
+        path (Optional[str]): Unix socket path
+        workers (Optional[int]): threads making moves
+        journal_path (Optional[str]): move journal file
+
+    Returns:
+        int: exit code
+    """
+
+    import asyncio
+
+    from .server import serve
+
+    print(f"serving on {path or f'{host}:{port}'}")
+    try:
+        asyncio.run(serve(host, port, path, workers, journal_path))
+    except KeyboardInterrupt:
+        pass
+    return 0
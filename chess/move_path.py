@@ -1,8 +1,12 @@
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
 from .position import Position
 
+if TYPE_CHECKING:
+    from .pieces import Piece
+
 
 class MovePath(NamedTuple):
     from_: Position
     to: Position
+    promotion: Optional[type["Piece"]] = None
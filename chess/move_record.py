@@ -0,0 +1,15 @@
+from typing import NamedTuple, Optional
+
+from .pieces import Piece
+from .position import Position
+
+
+class MoveRecord(NamedTuple):
+    from_: Position
+    to: Position
+    piece: Piece
+    captured: Optional[Piece]
+    was_move: bool
+    captured_pos: Optional[Position] = None
+    promoted: Optional[Piece] = None
+    rook_move: Optional["MoveRecord"] = None
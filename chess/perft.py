@@ -0,0 +1,99 @@
+import time
+from pathlib import Path
+from typing import Final, Iterator, NamedTuple, Optional
+
+from .bitboard import BitBoard
+
+PERFT_POSITIONS_PATH: Final[Path] = Path(__file__).parent / "data" / "perft.epd"
+
+
+class PerftPosition(NamedTuple):
+    fen: str
+    nodes: tuple[int, ...]  # known node counts by depth starting from 1
+
+
+class PerftResult(NamedTuple):
+    fen: str
+    depth: int
+    nodes: int
+    expected_nodes: Optional[int]
+    seconds: float
+
+    @property
+    def is_correct(self) -> bool:
+        return self.expected_nodes is None or self.nodes == self.expected_nodes
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+def perft(bitboard: BitBoard, depth: int) -> int:
+    """Returns count of leaf nodes of legal moves tree with `depth` depth.
+
+    Moves of the last ply are counted without being made.
+
+    Args:
+        bitboard (BitBoard)
+        depth (int)
+
+    Returns:
+        int
+    """
+
+    if depth == 0:
+        return 1
+    moves = bitboard.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        bitboard.make_move(move)
+        nodes += perft(bitboard, depth - 1)
+        bitboard.unmake_move()
+    return nodes
+
+
+def load_perft_positions(path: Path = PERFT_POSITIONS_PATH) -> list[PerftPosition]:
+    """Loads positions with known node counts from EPD file.
+
+    Each line is FEN followed by `;D<depth> <nodes>` fields.
+
+    Args:
+        path (Path)
+
+    Returns:
+        list[PerftPosition]
+    """
+
+    positions = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fen, *fields = line.split(";")
+            nodes = [int(field.split()[1]) for field in fields]
+            positions.append(PerftPosition(fen=fen.strip(), nodes=tuple(nodes)))
+    return positions
+
+
+def run_perft(position: PerftPosition, max_depth: int) -> Iterator[PerftResult]:
+    """Runs perft of `position` for every depth from 1 to `max_depth`.
+
+    Args:
+        position (PerftPosition)
+        max_depth (int)
+
+    Yields:
+        PerftResult
+    """
+
+    bitboard = BitBoard.from_fen(position.fen)
+    for depth in range(1, max_depth + 1):
+        started_at = time.perf_counter()
+        nodes = perft(bitboard, depth)
+        seconds = time.perf_counter() - started_at
+        expected_nodes = position.nodes[depth - 1] if depth <= len(position.nodes) else None
+        yield PerftResult(fen=position.fen, depth=depth, nodes=nodes,
+                          expected_nodes=expected_nodes, seconds=seconds)
@@ -0,0 +1,219 @@
+import re
+from typing import Final, Iterable, Iterator, NamedTuple, Optional
+
+from .bitboard import (CASTLING_MOVE, PAWN, PIECE_LETTERS, PIECE_TYPES,
+                       BitBoard, decode_move, move_promotion, move_to_square)
+from .board import Board
+from .enums import Color, Verdict
+from .exceptions import (CheckMate, FenParseError, HiddenCheckError,
+                         InvalidColorError, NotPieceError, SanParseError,
+                         Stalemate, UnpossibleMoveError)
+from .game import Game
+
+RESULTS: Final[frozenset[str]] = frozenset(("1-0", "0-1", "1/2-1/2", "*"))
+_TAG_RE: Final[re.Pattern[str]] = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]$')
+_TOKEN_RE: Final[re.Pattern[str]] = re.compile(r"[{}();]|[^\s{}();]+")
+_MOVE_NUMBER_RE: Final[re.Pattern[str]] = re.compile(r"^\d+\.+")
+_SAN_RE: Final[re.Pattern[str]] = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+_FILE_MASKS: Final[dict[str, int]] = {file: 0x0101010101010101 << i for i, file in enumerate("abcdefgh")}
+_RANK_MASKS: Final[dict[str, int]] = {rank: 0xFF << 8 * i for i, rank in enumerate("12345678")}
+
+
+class PgnGame(NamedTuple):
+    headers: dict[str, str]
+    moves: list[str]  # SAN moves of the main line
+    result: str
+
+
+class ReplayResult(NamedTuple):
+    headers: dict[str, str]
+    plies: int  # count of accepted moves
+    error: Optional[str]  # why the next move was rejected, None if all moves are legal
+    is_checkmate: bool
+
+    @property
+    def is_legal(self) -> bool:
+        return self.error is None
+
+    @property
+    def illegal_ply(self) -> Optional[int]:
+        """Number of the first rejected move counted from 1, None if all moves are legal."""
+
+        return None if self.error is None else self.plies + 1
+
+    @property
+    def verdict(self) -> Verdict:
+        if self.error is not None:
+            return Verdict.ILLEGAL
+        return Verdict.CHECKMATE if self.is_checkmate else Verdict.LEGAL
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    """Yields games of PGN text one by one.
+
+    Lines are read lazily, so only the current game is kept in memory and
+    `lines` may be an open file of any size. Comments, variations, NAGs and
+    move numbers are skipped.
+
+    Args:
+        lines (Iterable[str]): PGN lines, e.g. text file
+
+    Yields:
+        PgnGame
+    """
+
+    headers: dict[str, str] = {}
+    moves: list[str] = []
+    in_comment = False
+    variation_depth = 0
+    for line in lines:
+        line = line.strip()
+        if not in_comment and not variation_depth:
+            if line.startswith("%"):
+                continue
+            if line.startswith("["):
+                if moves:  # movetext without result
+                    yield PgnGame(headers=headers, moves=moves, result="*")
+                    headers, moves = {}, []
+                match = _TAG_RE.match(line)
+                if match:
+                    headers[match[1]] = match[2].replace('\\"', '"').replace("\\\\", "\\")
+                continue
+
+        for token in _TOKEN_RE.findall(line):
+            if in_comment:
+                in_comment = token != "}"
+            elif token == "{":
+                in_comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                variation_depth += 1
+            elif token == ")":
+                variation_depth = max(variation_depth - 1, 0)
+            elif variation_depth or token.startswith("$"):
+                continue
+            elif token in RESULTS:
+                yield PgnGame(headers=headers, moves=moves, result=token)
+                headers, moves = {}, []
+            else:
+                token = _MOVE_NUMBER_RE.sub("", token)
+                if token:
+                    moves.append(token)
+
+    if headers or moves:
+        yield PgnGame(headers=headers, moves=moves, result="*")
+
+
+def parse_san(bitboard: BitBoard, san: str) -> int:
+    """Returns encoded move of side to move named by `san`.
+
+    Move is looked up among pseudo legal moves, so a move leaving own king
+    in check is returned and left to the rules to reject. Legality is used
+    only to resolve SAN which is ambiguous without it.
+
+    Args:
+        bitboard (BitBoard)
+        san (str): move in standard algebraic notation, e.g. "Nbd7", "exd8=Q+" or "O-O"
+
+    Raises:
+        SanParseError: raised if `san` has invalid format or names no single move.
+
+    Returns:
+        int
+    """
+
+    text = san.rstrip("+#!?")
+    turn = bitboard.turn
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king_sq = bitboard.king_square(turn)
+        if king_sq == -1:
+            raise SanParseError(san)
+        kingside = len(text) == 3
+        candidates = [move for move in bitboard.pseudo_legal_moves(1 << king_sq)
+                      if move & CASTLING_MOVE and (move >> 6 & 63 > move & 63) == kingside]
+    else:
+        match = _SAN_RE.match(text)
+        if match is None:
+            raise SanParseError(san)
+        letter, file, rank, to, promotion = match.groups()
+        piece_type = PIECE_LETTERS.index(letter) if letter else PAWN
+        from_mask = bitboard.pieces(turn, PIECE_TYPES[piece_type])
+        if file:
+            from_mask &= _FILE_MASKS[file]
+        if rank:
+            from_mask &= _RANK_MASKS[rank]
+        to_sq = "abcdefgh".index(to[0]) + 8 * (int(to[1]) - 1)
+        promotion_type = PIECE_LETTERS.index(promotion) if promotion else 0
+        candidates = [move for move in bitboard.pseudo_legal_moves(from_mask)
+                      if move_to_square(move) == to_sq and move_promotion(move) == promotion_type and
+                      not move & CASTLING_MOVE]
+    if len(candidates) > 1:
+        candidates = [move for move in candidates if bitboard.is_legal(move)]
+    if len(candidates) != 1:
+        raise SanParseError(san)
+    return candidates[0]
+
+
+def _is_checkmate(bitboard: BitBoard) -> bool:
+    return bitboard.is_check() and not bitboard.has_legal_move()
+
+
+def replay(pgn_game: PgnGame) -> ReplayResult:
+    """Replays moves of `pgn_game` through `Game.move`.
+
+    Game starts from the position of FEN header if there is one.
+
+    Args:
+        pgn_game (PgnGame)
+
+    Returns:
+        ReplayResult
+    """
+
+    headers = pgn_game.headers
+    fen = headers.get("FEN")
+    if fen is None:
+        game = Game(Board(), Color.WHITE)
+        game.start_game()
+    else:
+        try:
+            game = Game.from_fen(fen)
+        except FenParseError:
+            return ReplayResult(headers=headers, plies=0, error=f"invalid FEN {fen!r}", is_checkmate=False)
+
+    bitboard = game.bitboard
+    for ply, san in enumerate(pgn_game.moves):
+        # Checkmate is looked for only when a move fails, checkmated side has no move to make
+        try:
+            move = parse_san(bitboard, san)
+        except SanParseError:
+            if _is_checkmate(bitboard):
+                return ReplayResult(headers=headers, plies=ply, error=f"{san} after checkmate", is_checkmate=True)
+            return ReplayResult(headers=headers, plies=ply, error=f"unknown move {san}", is_checkmate=False)
+        path = decode_move(move)
+        try:
+            game.move(path.from_, path.to, path.promotion)
+        except (CheckMate, Stalemate):
+            pass  # move is made, mate is detected on the bitboard
+        except (NotPieceError, InvalidColorError, UnpossibleMoveError, HiddenCheckError) as error:
+            if _is_checkmate(bitboard):
+                return ReplayResult(headers=headers, plies=ply, error=f"{san} after checkmate", is_checkmate=True)
+            return ReplayResult(headers=headers, plies=ply, error=f"illegal move {san}: {type(error).__name__}",
+                                is_checkmate=False)
+        bitboard.make_move(move)
+    return ReplayResult(headers=headers, plies=len(pgn_game.moves), error=None, is_checkmate=_is_checkmate(bitboard))
+
+
+def replay_games(lines: Iterable[str]) -> Iterator[ReplayResult]:
+    """Yields replay result of every game of PGN text.
+
+    Args:
+        lines (Iterable[str]): PGN lines, e.g. text file
+
+    Yields:
+        ReplayResult
+    """
+
+    for pgn_game in read_games(lines):
+        yield replay(pgn_game)
@@ -0,0 +1,118 @@
+from typing import Final
+
+# Piece values in centipawns by piece type index, king is never traded.
+PIECE_VALUES: Final[tuple[int, ...]] = (100, 320, 330, 500, 900, 0)
+
+
+def _from_rows(rows: tuple[int, ...]) -> tuple[int, ...]:
+    """Returns table indexed by square from 64 values written row 8 first, as board is printed.
+
+    Args:
+        rows (tuple[int, ...])
+
+    Returns:
+        tuple[int, ...]
+    """
+
+    return tuple(rows[(7 - sq // 8) * 8 + sq % 8] for sq in range(64))
+
+
+# Middlegame bonuses in centipawns of white pieces by piece type index and
+# square, black pieces use the square mirrored vertically(sq ^ 56).
+PIECE_SQUARE_TABLES: Final[tuple[tuple[int, ...], ...]] = tuple(map(_from_rows, (
+    (0, 0, 0, 0, 0, 0, 0, 0,
+     50, 50, 50, 50, 50, 50, 50, 50,
+     10, 10, 20, 30, 30, 20, 10, 10,
+     5, 5, 10, 25, 25, 10, 5, 5,
+     0, 0, 0, 20, 20, 0, 0, 0,
+     5, -5, -10, 0, 0, -10, -5, 5,
+     5, 10, 10, -20, -20, 10, 10, 5,
+     0, 0, 0, 0, 0, 0, 0, 0),
+    (-50, -40, -30, -30, -30, -30, -40, -50,
+     -40, -20, 0, 0, 0, 0, -20, -40,
+     -30, 0, 10, 15, 15, 10, 0, -30,
+     -30, 5, 15, 20, 20, 15, 5, -30,
+     -30, 0, 15, 20, 20, 15, 0, -30,
+     -30, 5, 10, 15, 15, 10, 5, -30,
+     -40, -20, 0, 5, 5, 0, -20, -40,
+     -50, -40, -30, -30, -30, -30, -40, -50),
+    (-20, -10, -10, -10, -10, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 10, 10, 5, 0, -10,
+     -10, 5, 5, 10, 10, 5, 5, -10,
+     -10, 0, 10, 10, 10, 10, 0, -10,
+     -10, 10, 10, 10, 10, 10, 10, -10,
+     -10, 5, 0, 0, 0, 0, 5, -10,
+     -20, -10, -10, -10, -10, -10, -10, -20),
+    (0, 0, 0, 0, 0, 0, 0, 0,
+     5, 10, 10, 10, 10, 10, 10, 5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     0, 0, 0, 5, 5, 0, 0, 0),
+    (-20, -10, -10, -5, -5, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 5, 5, 5, 0, -10,
+     -5, 0, 5, 5, 5, 5, 0, -5,
+     0, 0, 5, 5, 5, 5, 0, -5,
+     -10, 5, 5, 5, 5, 5, 0, -10,
+     -10, 0, 5, 0, 0, 0, 0, -10,
+     -20, -10, -10, -5, -5, -10, -10, -20),
+    (-30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -20, -30, -30, -40, -40, -30, -30, -20,
+     -10, -20, -20, -20, -20, -20, -20, -10,
+     20, 20, 0, 0, 0, 0, 20, 20,
+     20, 30, 10, 0, 0, 10, 30, 20),
+)))
+
+# Endgame bonuses, pawns gain by advancing and king by centralization.
+ENDGAME_PIECE_SQUARE_TABLES: Final[tuple[tuple[int, ...], ...]] = (
+    _from_rows((0, 0, 0, 0, 0, 0, 0, 0,
+                80, 80, 80, 80, 80, 80, 80, 80,
+                50, 50, 50, 50, 50, 50, 50, 50,
+                30, 30, 30, 30, 30, 30, 30, 30,
+                15, 15, 15, 15, 15, 15, 15, 15,
+                5, 5, 5, 5, 5, 5, 5, 5,
+                0, 0, 0, 0, 0, 0, 0, 0,
+                0, 0, 0, 0, 0, 0, 0, 0)),
+    *PIECE_SQUARE_TABLES[1:5],
+    _from_rows((-50, -40, -30, -20, -20, -30, -40, -50,
+                -30, -20, -10, 0, 0, -10, -20, -30,
+                -30, -10, 20, 30, 30, 20, -10, -30,
+                -30, -10, 30, 40, 40, 30, -10, -30,
+                -30, -10, 30, 40, 40, 30, -10, -30,
+                -30, -10, 20, 30, 30, 20, -10, -30,
+                -30, -30, 0, 0, 0, 0, -30, -30,
+                -50, -30, -30, -30, -30, -30, -30, -50)),
+)
+
+# Game phase weight by piece type index. Phase is sum of weights of pieces
+# on the board, MAX_PHASE with all minor and major pieces and 0 in pawn endgame.
+PHASE_WEIGHTS: Final[tuple[int, ...]] = (0, 1, 1, 2, 4, 0)
+MAX_PHASE: Final[int] = 24
+
+
+def _code_scores(tables: tuple[tuple[int, ...], ...]) -> tuple[tuple[int, ...], ...]:
+    """Returns piece value plus bonus from white view by piece code(color * 6 + piece type) and square.
+
+    Args:
+        tables (tuple[tuple[int, ...], ...]): bonuses of white pieces by piece type index
+
+    Returns:
+        tuple[tuple[int, ...], ...]
+    """
+
+    white = [tuple(value + bonus for bonus in table) for value, table in zip(PIECE_VALUES, tables)]
+    black = [tuple(-scores[sq ^ 56] for sq in range(64)) for scores in white]
+    return tuple(white + black)
+
+
+# Scores added when piece code appears on square and subtracted when it leaves.
+MIDDLEGAME_SCORES: Final[tuple[tuple[int, ...], ...]] = _code_scores(PIECE_SQUARE_TABLES)
+ENDGAME_SCORES: Final[tuple[tuple[int, ...], ...]] = _code_scores(ENDGAME_PIECE_SQUARE_TABLES)
+PHASES: Final[tuple[int, ...]] = PHASE_WEIGHTS * 2
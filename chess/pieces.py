@@ -11,17 +11,32 @@ from .rules import (CastlingMoveRule, DiagonalMoveRule, HorizontalMoveRule,
                     PawnStraightMoveRule, VerticalMoveRule)
 
 
+def _rules_table(rules: tuple[MoveRule, ...]) -> dict[tuple[Color, bool], tuple[MoveRule, ...]]:
+    """Returns the same `rules` for every color and `was_move` flag.
+
+    Args:
+        rules (tuple[MoveRule, ...])
+
+    Returns:
+        dict[tuple[Color, bool], tuple[MoveRule, ...]]
+    """
+
+    return {(color, was_move): rules for color in Color for was_move in (False, True)}
+
+
 class Piece(abc.ABC):
-    _rules: list[MoveRule]
+    __slots__ = ("_pos", "_color", "_was_move")
+
+    # Shared rules by piece color and `was_move` flag.
+    _rules_by_state: dict[tuple[Color, bool], tuple[MoveRule, ...]] = _rules_table(())
     _white_char: str
     _black_char: str
     _name = "Piece"
 
-    def __init__(self, color: Color, pos: Position) -> None:
+    def __init__(self, color: Color, pos: Position, was_move: bool = False) -> None:
         self._pos = pos
         self._color = color
-        self._char = self._black_char if self._color is Color.BLACK else self._white_char
-        self._rules = []
+        self._was_move = was_move
 
     @property
     def color(self) -> Color:
@@ -31,8 +46,18 @@ class Piece(abc.ABC):
     def pos(self) -> Position:
         return self._pos
 
+    @property
+    def was_move(self) -> bool:
+        return self._was_move
+
+    @property
+    def rules(self) -> tuple[MoveRule, ...]:
+        """Rules of the piece, shared by all pieces of the same type, color and `was_move` flag."""
+
+        return self._rules_by_state[self._color, self._was_move]
+
     def __str__(self) -> str:
-        return self._char
+        return self._black_char if self._color is Color.BLACK else self._white_char
 
     def __repr__(self) -> str:
         return f"{self._name}(color={self._color}, pos={self._pos})"
@@ -45,6 +70,18 @@ class Piece(abc.ABC):
         """
 
         self._pos = pos
+        self._was_move = True
+
+    def move_back(self, pos: Position, was_move: bool) -> None:
+        """Returns piece to `pos` and restores state it had before the move.
+
+        Args:
+            pos (Position): position before the move
+            was_move (bool): `was_move` flag before the move
+        """
+
+        self._pos = pos
+        self._was_move = was_move
 
     def can_move_to(self, pos: Position) -> bool:
         """Returns True if piece can move to `pos` by the her rules.
@@ -56,7 +93,7 @@ class Piece(abc.ABC):
             bool
         """
 
-        return any((rule.is_valid_path(self._pos, pos) for rule in self._rules))
+        return any((rule.is_valid_path(self._pos, pos) for rule in self.rules))
 
     def controlled_fields(self) -> list[Position]:
         """Returns list of controled positions by piece.
@@ -66,139 +103,89 @@ class Piece(abc.ABC):
         """
 
         fields = []
-        for rule in self._rules:
+        for rule in self.rules:
             fields.extend(rule.controlled_fields_from_position(self._pos))
         return fields
 
 
 class Rook(Piece):
+    __slots__ = ()
+
     _name = "Rook"
     _white_char = colored("♖", WHITE_PIECE_COLOR)
     _black_char = colored("♜", BLACK_PIECE_COLOR)
     # _white_char = colored("R", WHITE_PIECE_COLOR)
     # _black_char = colored("R", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        self._rules = [HorizontalMoveRule(7), VerticalMoveRule(7)]
-        self._was_move = False
-
-    @property
-    def was_move(self) -> bool:
-        return self._was_move
-
-    def move_to(self, pos: Position) -> None:
-        """Sets piece position to `pos`.
-
-        Args:
-            pos (Position): new position
-        """
-
-        super().move_to(pos)
-        self._was_move = True
+    _rules_by_state = _rules_table((HorizontalMoveRule(7), VerticalMoveRule(7)))
 
 
 class Knight(Piece):
+    __slots__ = ()
+
     _name = "Knight"
     _white_char = colored("♘", WHITE_PIECE_COLOR)
     _black_char = colored("♞", BLACK_PIECE_COLOR)
     # _white_char = colored("N", WHITE_PIECE_COLOR)
     # _black_char = colored("N", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        self._rules = [KnightMoveRule()]
+    _rules_by_state = _rules_table((KnightMoveRule(),))
 
 
 class Bishop(Piece):
+    __slots__ = ()
+
     _name = "Bishop"
     _white_char = colored("♗", WHITE_PIECE_COLOR)
     _black_char = colored("♝", BLACK_PIECE_COLOR)
     # _white_char = colored("B", WHITE_PIECE_COLOR)
     # _black_char = colored("B", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        self._rules = [DiagonalMoveRule(7)]
+    _rules_by_state = _rules_table((DiagonalMoveRule(7),))
 
 
 class Queen(Piece):
+    __slots__ = ()
+
     _name = "Queen"
     _white_char = colored("♕", WHITE_PIECE_COLOR)
     _black_char = colored("♛", BLACK_PIECE_COLOR)
     # _white_char = colored("Q", WHITE_PIECE_COLOR)
     # _black_char = colored("Q", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        self._rules = [HorizontalMoveRule(7),
-                       VerticalMoveRule(7), DiagonalMoveRule(7)]
+    _rules_by_state = _rules_table((HorizontalMoveRule(7), VerticalMoveRule(7), DiagonalMoveRule(7)))
 
 
 class King(Piece):
+    __slots__ = ()
+
     _name = "King"
     _white_char = colored("♔", WHITE_PIECE_COLOR)
     _black_char = colored("♚", BLACK_PIECE_COLOR)
     # _white_char = colored("K", WHITE_PIECE_COLOR)
     # _black_char = colored("K", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        self._rules = [HorizontalMoveRule(1),
-                       VerticalMoveRule(1), DiagonalMoveRule(1), CastlingMoveRule(self._color)]
-        self._was_move = False
-
-    @property
-    def was_move(self) -> bool:
-        return self._was_move
-
-    def move_to(self, pos: Position) -> None:
-        """Sets piece position to `pos`.
-
-        Args:
-            pos (Position): new position
-        """
-
-        super().move_to(pos)
-        if not self._was_move:
-            self._remove_castling_move_rule()
-            self._was_move = True
-
-    def _remove_castling_move_rule(self) -> None:
-        self._rules = [rule for rule in self._rules if not isinstance(
-            rule, CastlingMoveRule)]
+    # Castling is allowed only before the first king move.
+    _rules_by_state = {
+        (color, was_move): (HorizontalMoveRule(1), VerticalMoveRule(1), DiagonalMoveRule(1),
+                            *(() if was_move else (CastlingMoveRule(color),)))
+        for color in Color for was_move in (False, True)
+    }
 
 
 class Pawn(Piece):
+    __slots__ = ()
+
     _name = "Pawn"
     _white_char = colored("♙", WHITE_PIECE_COLOR)
     _black_char = colored("♟", BLACK_PIECE_COLOR)
     # _white_char = colored("P", WHITE_PIECE_COLOR)
     # _black_char = colored("P", BLACK_PIECE_COLOR)
 
-    def __init__(self, color: Color, pos: Position) -> None:
-        super().__init__(color, pos)
-        color = self._color
-        self._rules = [PawnStraightMoveRule(1, color),
-                       PawnStraightMoveRule(2, color), PawnBeatMoveRule(color)]
-        self._was_move = False
-
-    @property
-    def was_move(self) -> bool:
-        return self._was_move
-
-    def move_to(self, pos: Position) -> None:
-        """Sets piece position to `pos`.
-
-        Args:
-            pos (Position): new position
-        """
-
-        super().move_to(pos)
-        if not self._was_move:
-            self._remove_double_straight_move_rule()
-            self._was_move = True
-
-    def _remove_double_straight_move_rule(self) -> None:
-        self._rules = [rule for rule in self._rules if isinstance(
-            rule, PawnStraightMoveRule) and rule.max_move_length != 2]
+    # Double straight move is allowed only before the first pawn move.
+    _rules_by_state = {
+        (color, was_move): (PawnStraightMoveRule(1, color),
+                            *(() if was_move else (PawnStraightMoveRule(2, color),)),
+                            PawnBeatMoveRule(color))
+        for color in Color for was_move in (False, True)
+    }
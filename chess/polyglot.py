@@ -0,0 +1,261 @@
+import bisect
+import mmap
+import random
+import struct
+from collections import defaultdict
+from pathlib import Path
+from typing import Final, Iterable, NamedTuple, Optional, Union
+
+from .bitboard import (CASTLING_MOVE, EMPTY, KING, PAWN, QUEEN, STARTING_FEN,
+                       WHITE, BitBoard, color_index, decode_move)
+from .exceptions import BookFormatError, SanParseError
+from .mailbox import Mailbox
+from .move_path import MovePath
+from .pgn import parse_san, read_games
+from .polyglot_keys import RANDOM_64
+
+# Entry is big endian key(8 bytes), move(2 bytes), weight(2 bytes) and learn(4 bytes).
+ENTRY_SIZE: Final[int] = 16
+MAX_WEIGHT: Final[int] = 0xFFFF
+# Entries per 4 KiB page, book keeps key of the first entry of every page in memory.
+FENCE_STEP: Final[int] = 256
+_ENTRY: Final[struct.Struct] = struct.Struct(">QHHI")
+_KEY: Final[struct.Struct] = struct.Struct(">Q")
+# Points of the side which made the move by game result.
+_RESULT_POINTS: Final[dict[str, tuple[int, int]]] = {"1-0": (2, 0), "0-1": (0, 2), "1/2-1/2": (1, 1), "*": (1, 1)}
+
+
+class BookMove(NamedTuple):
+    move: int  # encoded move, see `bitboard.encode_move`
+    weight: int
+    learn: int
+
+    @property
+    def path(self) -> MovePath:
+        """Move as positions, e.g. for `Game.move`."""
+
+        return decode_move(self.move)
+
+
+def polyglot_key(bitboard: Union[BitBoard, Mailbox]) -> int:
+    """Returns Polyglot key of the position, the key books are sorted by.
+
+    Args:
+        bitboard (Union[BitBoard, Mailbox])
+
+    Returns:
+        int
+    """
+
+    key = 0
+    codes = bitboard.piece_codes()
+    for sq, code in enumerate(codes):
+        if code != EMPTY:
+            key ^= RANDOM_64[64 * (2 * (code % 6) + (code < 6)) + sq]
+    castling_rights = bitboard.castling_rights
+    for right in range(4):
+        if castling_rights >> right & 1:
+            key ^= RANDOM_64[768 + right]
+
+    turn = color_index(bitboard.turn)
+    ep_square = bitboard.ep_square
+    if ep_square != -1:
+        # En passant file counts only if a pawn of side to move stands next to the pushed pawn
+        pushed_sq = ep_square - 8 if turn == WHITE else ep_square + 8
+        pawn = turn * 6 + PAWN
+        file = ep_square & 7
+        if file > 0 and codes[pushed_sq - 1] == pawn or file < 7 and codes[pushed_sq + 1] == pawn:
+            key ^= RANDOM_64[772 + file]
+    if turn == WHITE:
+        key ^= RANDOM_64[780]
+    return key
+
+
+def encode_book_move(move: int) -> int:
+    """Returns Polyglot encoding of encoded `move`.
+
+    Polyglot move is to square in bits 0-5, from square in bits 6-11 and
+    promotion piece type in bits 12-14, castling is king move to own rook square.
+
+    Args:
+        move (int)
+
+    Returns:
+        int
+    """
+
+    from_sq = move & 63
+    to_sq = move >> 6 & 63
+    if move & CASTLING_MOVE:
+        to_sq = from_sq + 3 if to_sq > from_sq else from_sq - 4
+    return to_sq | from_sq << 6 | (move >> 12 & 7) << 12
+
+
+def decode_book_move(bitboard: Union[BitBoard, Mailbox], book_move: int) -> Optional[int]:
+    """Returns legal encoded move of Polyglot `book_move` in the position, None if it's not legal.
+
+    Args:
+        bitboard (Union[BitBoard, Mailbox])
+        book_move (int)
+
+    Returns:
+        Optional[int]
+    """
+
+    to_sq = book_move & 63
+    from_sq = book_move >> 6 & 63
+    if bitboard.piece_type_at(from_sq) == KING and from_sq >> 3 == to_sq >> 3 and abs(to_sq - from_sq) in (3, 4):
+        to_sq = from_sq + 2 if to_sq > from_sq else from_sq - 2
+    return bitboard.find_move(from_sq, to_sq, book_move >> 12 & 7 or QUEEN)
+
+
+class OpeningBook:
+    """Polyglot opening book read through read only memory map.
+
+    Entries are sorted by key. The first key of every page is kept in
+    memory as fence list, so lookup is a bisect of the fence list in C and
+    a binary search within one page, which touches a single page. Mapped pages
+    are shared by all processes which open the same book, and the book is
+    pickled as its path, so worker processes map it again instead of copying.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._path = Path(path)
+        with open(self._path, "rb") as file:
+            file.seek(0, 2)
+            size = file.tell()
+            if size % ENTRY_SIZE:
+                raise BookFormatError(str(path))
+            # Empty file can't be mapped
+            self._data: Union[mmap.mmap, bytes] = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._size = size // ENTRY_SIZE
+        unpack_key = _KEY.unpack_from
+        self._fence = [unpack_key(self._data, i * ENTRY_SIZE)[0] for i in range(0, self._size, FENCE_STEP)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple[type["OpeningBook"], tuple[Path]]:
+        return OpeningBook, (self._path,)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def entries(self, key: int) -> list[tuple[int, int, int]]:
+        """Returns (Polyglot move, weight, learn) of entries with `key` in file order.
+
+        Args:
+            key (int): Polyglot key
+
+        Returns:
+            list[tuple[int, int, int]]
+        """
+
+        data = self._data
+        unpack_key = _KEY.unpack_from
+        # Key is greater than fence key of the previous page and not greater than fence
+        # key of the next one, so its first entry is in the page or starts the next one
+        page = bisect.bisect_left(self._fence, key)
+        low = max(page - 1, 0) * FENCE_STEP
+        high = min(page * FENCE_STEP, self._size)
+        while low < high:
+            middle = (low + high) >> 1
+            if unpack_key(data, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        for offset in range(low * ENTRY_SIZE, self._size * ENTRY_SIZE, ENTRY_SIZE):
+            entry_key, book_move, weight, learn = _ENTRY.unpack_from(data, offset)
+            if entry_key != key:
+                break
+            entries.append((book_move, weight, learn))
+        return entries
+
+    def moves(self, bitboard: Union[BitBoard, Mailbox]) -> list[BookMove]:
+        """Returns legal book moves of the position, best weighted first.
+
+        Args:
+            bitboard (Union[BitBoard, Mailbox])
+
+        Returns:
+            list[BookMove]
+        """
+
+        moves = []
+        for book_move, weight, learn in self.entries(polyglot_key(bitboard)):
+            move = decode_book_move(bitboard, book_move)
+            if move is not None:
+                moves.append(BookMove(move=move, weight=weight, learn=learn))
+        moves.sort(key=lambda book_move: -book_move.weight)
+        return moves
+
+    def choose(self, bitboard: Union[BitBoard, Mailbox], rng: Optional[random.Random] = None) -> Optional[BookMove]:
+        """Returns book move picked with probability proportional to its weight, None if out of book.
+
+        Args:
+            bitboard (Union[BitBoard, Mailbox])
+            rng (Optional[random.Random]): random generator, module generator by default
+
+        Returns:
+            Optional[BookMove]
+        """
+
+        moves = [move for move in self.moves(bitboard) if move.weight]
+        if not moves:
+            return None
+        return (rng or random).choices(moves, weights=[move.weight for move in moves])[0]
+
+
+def build_book(lines: Iterable[str], path: Union[str, Path], max_plies: int = 24) -> int:
+    """Compiles Polyglot book of the first `max_plies` moves of PGN games.
+
+    Weight of a move is 2 points per win and 1 per draw of the side which
+    made it, games without result count as draws. Moves which never
+    scored are left out. Games with FEN header are skipped, and a game is
+    read until its first illegal or unparsable move.
+
+    Args:
+        lines (Iterable[str]): PGN lines, e.g. text file
+        path (Union[str, Path]): book file to write
+        max_plies (int): count of moves taken from every game
+
+    Returns:
+        int: count of written entries
+    """
+
+    points: defaultdict[tuple[int, int], int] = defaultdict(int)
+    for pgn_game in read_games(lines):
+        if "FEN" in pgn_game.headers:
+            continue
+        bitboard = BitBoard.from_fen(STARTING_FEN)
+        game_points = _RESULT_POINTS.get(pgn_game.result, (1, 1))
+        for san in pgn_game.moves[:max_plies]:
+            try:
+                move = parse_san(bitboard, san)
+            except SanParseError:
+                break
+            if not bitboard.is_legal(move):
+                break
+            points[polyglot_key(bitboard), encode_book_move(move)] += game_points[color_index(bitboard.turn)]
+            bitboard.make_move(move)
+
+    # Weights are scaled down to fit 16 bits if needed
+    scale = max(max(points.values(), default=0) / MAX_WEIGHT, 1)
+    entries = sorted((key, -weight, book_move) for (key, book_move), weight in (
+        (entry, round(value / scale)) for entry, value in points.items()) if weight)
+    with open(path, "wb") as file:
+        file.writelines(_ENTRY.pack(key, book_move, -weight, 0) for key, weight, book_move in entries)
+    return len(entries)
@@ -1,12 +1,112 @@
 import abc
+import inspect
+from typing import Any, Final
 
 from .enums import Color, Direction
 from .move_path import MovePath
 from .position import Position
-from .utils import filter_by_valid_positions, only_from_range
 
+# Controlled fields tables are indexed by square `y * 8 + x` of the position.
+FieldsTable = tuple[tuple[Position, ...], ...]
+
+
+def _ray(pos: Position, x_shift: int, y_shift: int, max_move_length: int) -> list[Position]:
+    """Returns positions from `pos` in (`x_shift`, `y_shift`) direction ordered from the nearest.
+
+    Args:
+        pos (Position)
+        x_shift (int)
+        y_shift (int)
+        max_move_length (int)
+
+    Returns:
+        list[Position]
+    """
+
+    fields = []
+    x, y = pos.x + x_shift, pos.y + y_shift
+    while 0 <= x < 8 and 0 <= y < 8 and len(fields) < max_move_length:
+        fields.append(Position(x=x, y=y))
+        x, y = x + x_shift, y + y_shift
+    return fields
+
+
+def _fields_table(shifts: tuple[tuple[int, int], ...], max_move_length: int) -> FieldsTable:
+    """Returns controlled fields by square for rays in `shifts` directions.
+
+    Args:
+        shifts (tuple[tuple[int, int], ...]): (x, y) shift of every ray
+        max_move_length (int)
+
+    Returns:
+        FieldsTable
+    """
+
+    return tuple(
+        tuple(field for x_shift, y_shift in shifts
+              for field in _ray(Position(x=sq % 8, y=sq // 8), x_shift, y_shift, max_move_length))
+        for sq in range(64))
+
+
+def _fields_tables(shifts: tuple[tuple[int, int], ...]) -> tuple[FieldsTable, ...]:
+    """Returns controlled fields tables by max move length from 0 to 7.
+
+    Args:
+        shifts (tuple[tuple[int, int], ...]): (x, y) shift of every ray
+
+    Returns:
+        tuple[FieldsTable, ...]
+    """
+
+    return tuple(_fields_table(shifts, max_move_length) for max_move_length in range(8))
+
+
+HORIZONTAL_FIELDS: Final[tuple[FieldsTable, ...]] = _fields_tables(((-1, 0), (1, 0)))
+VERTICAL_FIELDS: Final[tuple[FieldsTable, ...]] = _fields_tables(((0, -1), (0, 1)))
+DIAGONAL_FIELDS: Final[tuple[FieldsTable, ...]] = _fields_tables(((1, -1), (-1, -1), (1, 1), (-1, 1)))
+KNIGHT_FIELDS: Final[FieldsTable] = _fields_table(
+    ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (-1, 2), (1, -2), (-1, -2)), 1)
+PAWN_BEAT_FIELDS: Final[dict[Color, FieldsTable]] = {
+    Color.WHITE: _fields_table(((-1, 1), (1, 1)), 1),
+    Color.BLACK: _fields_table(((-1, -1), (1, -1)), 1),
+}
+
+
+class _SharedRuleMeta(abc.ABCMeta):
+    """Creates one rule per rule class and arguments, later calls return the shared rule.
+
+    Arguments are bound to `__init__` parameters, so `HorizontalMoveRule(7)`
+    and `HorizontalMoveRule(max_move_length=7)` are the same rule.
+    """
+
+    def __init__(cls, *args: Any) -> None:
+        super().__init__(*args)
+        cls._shared_rules: dict[tuple[Any, ...], "MoveRule"] = {}
+        cls._init_signature = inspect.signature(cls.__init__)
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            # The first parameter is self
+            bound = cls._init_signature.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            args = bound.args[1:]
+            kwargs = bound.kwargs
+        key = (*args, *kwargs.items())
+        rule = cls._shared_rules.get(key)
+        if rule is None:
+            rule = cls._shared_rules[key] = super().__call__(*args, **kwargs)
+        return rule
+
+
+class MoveRule(metaclass=_SharedRuleMeta):
+    """Rule of piece moves.
+
+    Rules have no mutable state, so `HorizontalMoveRule(7)` and every other
+    rule with the same arguments is the same shared object.
+    """
+
+    __slots__ = ()
 
-class MoveRule(abc.ABC):
     @abc.abstractmethod
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
@@ -21,22 +121,25 @@ class MoveRule(abc.ABC):
 
         raise NotImplementedError
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position ordered by ray from the nearest.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        return []
+        return ()
 
 
 class HorizontalMoveRule(MoveRule):
+    __slots__ = ("_max_move_length", "_fields")
+
     def __init__(self, max_move_length: int) -> None:
         self._max_move_length = max_move_length
+        self._fields = HORIZONTAL_FIELDS[min(max_move_length, 7)]
 
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
@@ -52,28 +155,25 @@ class HorizontalMoveRule(MoveRule):
         max_move_length = self._max_move_length
         return from_.y == to.y and 0 < abs(to.x - from_.x) <= max_move_length
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position ordered by ray from the nearest.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        max_move_length = self._max_move_length
-        return [
-            *[Position(x=x, y=pos.y) for x in range(only_from_range(pos.x -
-                                                                    max_move_length, (0, pos.x)), pos.x)],
-            *[Position(x=x, y=pos.y) for x in range(only_from_range(pos.x +
-                                                                    max_move_length, (pos.x, 7)), pos.x, -1)],
-        ]
+        return self._fields[pos.y * 8 + pos.x]
 
 
 class VerticalMoveRule(MoveRule):
+    __slots__ = ("_max_move_length", "_fields")
+
     def __init__(self, max_move_length: int) -> None:
         self._max_move_length = max_move_length
+        self._fields = VERTICAL_FIELDS[min(max_move_length, 7)]
 
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
@@ -89,28 +189,25 @@ class VerticalMoveRule(MoveRule):
         max_move_length = self._max_move_length
         return from_.x == to.x and 0 < abs(to.y - from_.y) <= max_move_length
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position ordered by ray from the nearest.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        max_move_length = self._max_move_length
-        return [
-            *[Position(x=pos.x, y=y) for y in range(only_from_range(pos.y -
-                                                                    max_move_length, (0, pos.y)), pos.y)],
-            *[Position(x=pos.x, y=y) for y in range(only_from_range(pos.y +
-                                                                    max_move_length, (pos.y, 7)), pos.y, -1)],
-        ]
+        return self._fields[pos.y * 8 + pos.x]
 
 
 class DiagonalMoveRule(MoveRule):
+    __slots__ = ("_max_move_length", "_fields")
+
     def __init__(self, max_move_length: int) -> None:
         self._max_move_length = max_move_length
+        self._fields = DIAGONAL_FIELDS[min(max_move_length, 7)]
 
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
@@ -128,124 +225,23 @@ class DiagonalMoveRule(MoveRule):
         letter_shift = abs(to.x - from_.x)
         return num_shift == letter_shift and 0 < num_shift <= max_move_length
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position ordered by ray from the nearest.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        fields = [
-            *self._right_and_down_controlled_fields_from_position(pos),
-            *self._left_and_down_controlled_fields_from_position(pos),
-            *self._right_and_up_controlled_fields_from_position(pos),
-            *self._left_and_up_controlled_fields_from_position(pos)
-        ]
-
-        return fields
-
-    def _right_and_down_controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from in right and in down `pos` position.
-
-        Args:
-            pos (Position)
-
-        Returns:
-            list[Position]
-        """
-
-        max_move_length = self._max_move_length
-        max_x_shift = abs(7 - pos.x)
-        max_y_shift = abs(0 - pos.y)
-        max_shift = min(
-            max_move_length if max_x_shift > max_move_length else max_x_shift,
-            max_move_length if max_y_shift > max_move_length else max_y_shift,
-        )
-        fields = [
-            Position(x=x, y=y)
-            for x, y in zip(range(pos.x + 1, pos.x + max_shift + 1), range(pos.y - 1, pos.y - max_shift - 1, -1))
-        ]
-
-        return fields
-
-    def _left_and_down_controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from in left and in down `pos` position.
-
-        Args:
-            pos (Position)
-
-        Returns:
-            list[Position]
-        """
-
-        max_move_length = self._max_move_length
-        max_x_shift = abs(0 - pos.x)
-        max_y_shift = abs(0 - pos.y)
-        max_shift = min(
-            max_move_length if max_x_shift > max_move_length else max_x_shift,
-            max_move_length if max_y_shift > max_move_length else max_y_shift,
-        )
-        fields = [
-            Position(x=x, y=y)
-            for x, y in zip(range(pos.x - 1, pos.x - max_shift - 1, -1), range(pos.y - 1, pos.y - max_shift - 1, -1))
-        ]
-
-        return fields
-
-    def _right_and_up_controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from in right and in up `pos` position.
-
-        Args:
-            pos (Position)
-
-        Returns:
-            list[Position]
-        """
-
-        max_move_length = self._max_move_length
-        max_x_shift = abs(7 - pos.x)
-        max_y_shift = abs(7 - pos.y)
-        max_shift = min(
-            max_move_length if max_x_shift > max_move_length else max_x_shift,
-            max_move_length if max_y_shift > max_move_length else max_y_shift,
-        )
-        fields = []
-        fields = [
-            Position(x=x, y=y)
-            for x, y in zip(range(pos.x + 1, pos.x + max_shift + 1), range(pos.y + 1, pos.y + max_shift + 1))
-        ]
-
-        return fields
-
-    def _left_and_up_controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from in left and in up `pos` position.
-
-        Args:
-            pos (Position)
-
-        Returns:
-            list[Position]
-        """
-
-        max_move_length = self._max_move_length
-        max_x_shift = abs(0 - pos.x)
-        max_y_shift = abs(7 - pos.y)
-        max_shift = min(
-            max_move_length if max_x_shift > max_move_length else max_x_shift,
-            max_move_length if max_y_shift > max_move_length else max_y_shift,
-        )
-        fields = [
-            Position(x=x, y=y)
-            for x, y in zip(range(pos.x - 1, pos.x - max_shift - 1, -1), range(pos.y + 1, pos.y + max_shift + 1))
-        ]
-
-        return fields
+        return self._fields[pos.y * 8 + pos.x]
 
 
 class KnightMoveRule(MoveRule):
+    __slots__ = ()
+    _fields = KNIGHT_FIELDS
+
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
 
@@ -261,34 +257,22 @@ class KnightMoveRule(MoveRule):
         x_shift = abs(to.x - from_.x)
         return (x_shift == 1 and y_shift == 2) or (x_shift == 2 and y_shift == 1)
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        x_pos = pos.x
-        y_pos = pos.y
-
-        fields = [
-            Position(x=x_pos + 2, y=y_pos + 1),
-            Position(x=x_pos + 2, y=y_pos - 1),
-            Position(x=x_pos - 2, y=y_pos + 1),
-            Position(x=x_pos - 2, y=y_pos - 1),
-            Position(x=x_pos + 1, y=y_pos + 2),
-            Position(x=x_pos - 1, y=y_pos + 2),
-            Position(x=x_pos + 1, y=y_pos - 2),
-            Position(x=x_pos - 1, y=y_pos - 2)
-        ]
-
-        return filter_by_valid_positions(fields)
+        return self._fields[pos.y * 8 + pos.x]
 
 
 class PawnStraightMoveRule(MoveRule):
+    __slots__ = ("_max_move_length", "_color")
+
     def __init__(self, max_move_length: int, color: Color) -> None:
         self._max_move_length = max_move_length
         self._color = color
@@ -317,8 +301,11 @@ class PawnStraightMoveRule(MoveRule):
 
 
 class PawnBeatMoveRule(MoveRule):
+    __slots__ = ("_color", "_fields")
+
     def __init__(self, color: Color) -> None:
         self._color = color
+        self._fields = PAWN_BEAT_FIELDS[color]
 
     def is_valid_path(self, from_: Position, to: Position) -> bool:
         """Returns True if path is allowed by the rule.
@@ -338,32 +325,22 @@ class PawnBeatMoveRule(MoveRule):
             return y_shift > 0 and x_shift == y_shift and x_shift == 1
         return y_shift < 0 and x_shift == abs(y_shift) and x_shift == 1
 
-    def controlled_fields_from_position(self, pos: Position) -> list[Position]:
-        """Returns list of controled positions from `pos` position.
+    def controlled_fields_from_position(self, pos: Position) -> tuple[Position, ...]:
+        """Returns controled positions from `pos` position.
 
         Args:
             pos (Position)
 
         Returns:
-            list[Position]
+            tuple[Position, ...]
         """
 
-        color = self._color
-        if color is Color.BLACK:
-            fields = [
-                Position(x=pos.x - 1, y=pos.y - 1),
-                Position(x=pos.x + 1, y=pos.y - 1),
-            ]
-        else:
-            fields = [
-                Position(x=pos.x - 1, y=pos.y + 1),
-                Position(x=pos.x + 1, y=pos.y + 1),
-            ]
-
-        return filter_by_valid_positions(fields)
+        return self._fields[pos.y * 8 + pos.x]
 
 
 class CastlingMoveRule(MoveRule):
+    __slots__ = ("_color",)
+
     def __init__(self, color: Color) -> None:
         self._color = color
 
@@ -0,0 +1,455 @@
+import asyncio
+import itertools
+import math
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext, suppress
+from typing import (AsyncIterator, Awaitable, Callable, Final, NamedTuple,
+                    Optional, Sequence, TypeVar)
+
+from .bitboard import PIECE_LETTERS, PIECE_TYPES, square
+from .board import Board
+from .enums import Color
+from .exceptions import (ArgumentsCountError, CheckMate, CommandNotExistsError,
+                         GameNotFoundError, MovePathParseError, Stalemate)
+from .game import Game
+from .journal import MoveJournal, recover_games
+from .pieces import Piece
+from .position import Position
+from .uci import square_name
+
+# Connections waiting to be accepted, clients beyond it are refused.
+BACKLOG: Final[int] = 4096
+# Move latencies kept for percentiles, older ones are dropped.
+LATENCY_SAMPLES: Final[int] = 100_000
+_FILES: Final[str] = "abcdefgh"
+
+T = TypeVar("T")
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Returns nearest rank percentile of `samples`, 0 if there are no samples.
+
+    Args:
+        samples (Sequence[float])
+        fraction (float): e.g. 0.99 for p99
+
+    Returns:
+        float
+    """
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(max(math.ceil(fraction * len(ordered)) - 1, 0), len(ordered) - 1)]
+
+
+def parse_position(text: str) -> Position:
+    """Returns position named in algebraic notation, e.g. "e2".
+
+    Args:
+        text (str)
+
+    Raises:
+        MovePathParseError: raised if `text` is not a square name.
+
+    Returns:
+        Position
+    """
+
+    if len(text) != 2 or text[0] not in _FILES or text[1] not in "12345678":
+        raise MovePathParseError
+    return Position(x=_FILES.index(text[0]), y=int(text[1]) - 1)
+
+
+def _parse_promotion(text: str) -> type[Piece]:
+    letter = text.upper()
+    if len(letter) != 1 or letter not in PIECE_LETTERS[1:5]:
+        raise MovePathParseError
+    return PIECE_TYPES[PIECE_LETTERS.index(letter)]
+
+
+def _new_game() -> Game:
+    game = Game(Board(), Color.WHITE)
+    game.start_game()
+    return game
+
+
+class GameServer:
+    """Asyncio server of many games driven by text commands over TCP or Unix socket.
+
+    Every line is one command and gets one reply line, games are shared by
+    all connections and addressed by id:
+
+        new                             ok <id>, new started game
+        s | start <id>                  ok, starts game again
+        m | move <id> <from> <to> [q]   ok <color to move>, checkmate <color>
+                                        or stalemate <color>
+        moves <id>                      ok <move>..., e.g. ok e2e4 e7e8n
+        fen <id>                        ok <FEN>
+        close <id>                      ok
+        stats                           ok games=<n> moves=<n> p50=<ms> p99=<ms>
+        e | exit                        closes connection
+
+    Failed command replies `error <exception name>`. Moves and move lists
+    are computed in `executor`, so a slow checkmate check doesn't stall
+    other connections, while moves of one game are made one at a time.
+    With `journal` new games, moves and closes are recorded in it, also in
+    `executor` so that flushes to the disk don't stall the event loop, and
+    `games` recovered from it are served on, see `recover_games`.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, journal: Optional[MoveJournal] = None,
+                 games: Optional[dict[int, Game]] = None) -> None:
+        self._executor = executor if executor is not None else ThreadPoolExecutor()
+        self._journal = journal
+        self._games: dict[int, Game] = dict(games) if games is not None else {}
+        self._locks: dict[int, asyncio.Lock] = {game_id: asyncio.Lock() for game_id in self._games}
+        self._ids = itertools.count(max(self._games, default=0) + 1)
+        self._move_latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._moves = 0
+        self._commands: dict[str, Callable[..., Awaitable[str]]] = {
+            "new": self._new,
+            "s": self._start_game,
+            "start": self._start_game,
+            "m": self._move,
+            "move": self._move,
+            "moves": self._legal_moves,
+            "fen": self._fen,
+            "close": self._close,
+            "stats": self._stats,
+        }
+
+    @property
+    def games(self) -> dict[int, Game]:
+        return self._games
+
+    @property
+    def move_latencies(self) -> deque[float]:
+        """Seconds from receiving of the move command to its reply of the latest moves."""
+
+        return self._move_latencies
+
+    async def start(self, host: Optional[str] = "127.0.0.1", port: int = 0,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Starts listening on TCP `host` and `port`, or on Unix socket `path` if it's given.
+
+        Args:
+            host (Optional[str])
+            port (int): 0 to pick free port
+            path (Optional[str]): Unix socket path
+
+        Returns:
+            asyncio.AbstractServer
+        """
+
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle_connection, path, backlog=BACKLOG)
+        return await asyncio.start_server(self._handle_connection, host, port, backlog=BACKLOG)
+
+    async def handle(self, line: str) -> Optional[str]:
+        """Executes one command line.
+
+        Args:
+            line (str)
+
+        Returns:
+            Optional[str]: reply, None if connection must be closed
+        """
+
+        command = line.strip()
+        if not command:
+            return "error ArgumentsCountError"
+        command_name, *args = command.split()
+        if command_name in ("e", "exit"):
+            return None
+        try:
+            command_executor = self._commands.get(command_name)
+            if command_executor is None:
+                raise CommandNotExistsError(command_name)
+            return await command_executor(*args)
+        except CheckMate as error:
+            return f"checkmate {error.color.name.lower()}"
+        except Stalemate as error:
+            return f"stalemate {error.color.name.lower()}"
+        except Exception as error:
+            return f"error {type(error).__name__}"
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.handle(line.decode("utf-8", "replace"))
+                if reply is None:
+                    break
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+            with suppress(OSError):
+                await writer.wait_closed()
+
+    def _lock(self, game_id: str) -> asyncio.Lock:
+        """Returns lock of game with `game_id`.
+
+        Args:
+            game_id (str)
+
+        Raises:
+            GameNotFoundError: raised if there is no such game.
+
+        Returns:
+            asyncio.Lock
+        """
+
+        if not game_id.isdigit() or int(game_id) not in self._locks:
+            raise GameNotFoundError(game_id)
+        return self._locks[int(game_id)]
+
+    @asynccontextmanager
+    async def _locked_game(self, game_id: str) -> AsyncIterator[Game]:
+        """Holds lock of game with `game_id` and yields the game.
+
+        Game is looked up after the lock is taken, so a command waiting for
+        `start` gets the new game and one waiting for `close` fails.
+
+        Args:
+            game_id (str)
+
+        Raises:
+            GameNotFoundError: raised if there is no such game or it was closed while waiting.
+
+        Yields:
+            Game
+        """
+
+        lock = self._lock(game_id)
+        async with lock:
+            if self._locks.get(int(game_id)) is not lock:
+                raise GameNotFoundError(game_id)
+            yield self._games[int(game_id)]
+
+    async def _run(self, function: Callable[..., T], *args: object) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _new(self, *args: str) -> str:
+        if args:
+            raise ArgumentsCountError
+        game_id = next(self._ids)
+        lock = self._locks[game_id] = asyncio.Lock()
+        # Lock is free, so it's taken before other commands can see the game
+        async with lock:
+            game = self._games[game_id] = _new_game()
+            if self._journal is not None:
+                await self._run(self._journal.add_game, game_id, game)
+        return f"ok {game_id}"
+
+    async def _start_game(self, *args: str) -> str:
+        if len(args) != 1:
+            raise ArgumentsCountError
+        async with self._locked_game(args[0]):
+            # Game arranges pieces over its board, so started again game gets a new board
+            game = self._games[int(args[0])] = await self._run(_new_game)
+            if self._journal is not None:
+                await self._run(self._journal.add_game, int(args[0]), game)
+        return "ok"
+
+    async def _move(self, *args: str) -> str:
+        if len(args) not in (3, 4):
+            raise ArgumentsCountError
+        started_at = time.perf_counter()
+        # Unknown game is reported before invalid squares
+        self._lock(args[0])
+        from_, to = parse_position(args[1]), parse_position(args[2])
+        promotion = _parse_promotion(args[3]) if len(args) == 4 else None
+        async with self._locked_game(args[0]) as game:
+            # Move is recorded under the lock, so journal keeps moves of the game in order
+            try:
+                await self._run(self._make_move, int(args[0]), game, from_, to, promotion)
+            except (CheckMate, Stalemate):
+                self._record_move(started_at)
+                raise
+            self._record_move(started_at)
+            return f"ok {game.current_move_color.name.lower()}"
+
+    def _make_move(self, game_id: int, game: Game, from_: Position, to: Position,
+                   promotion: Optional[type[Piece]]) -> None:
+        """Makes the move and records it in journal, runs in executor.
+
+        Args:
+            game_id (int)
+            game (Game)
+            from_ (Position)
+            to (Position)
+            promotion (Optional[type[Piece]])
+        """
+
+        try:
+            game.move(from_, to, promotion)
+        except (CheckMate, Stalemate):
+            if self._journal is not None:
+                self._journal.record_move(game_id, game)
+            raise
+        if self._journal is not None:
+            self._journal.record_move(game_id, game)
+
+    def _record_move(self, started_at: float) -> None:
+        self._moves += 1
+        self._move_latencies.append(time.perf_counter() - started_at)
+
+    async def _legal_moves(self, *args: str) -> str:
+        if len(args) != 1:
+            raise ArgumentsCountError
+        async with self._locked_game(args[0]) as game:
+            paths = await self._run(game.legal_moves)
+        moves = [square_name(square(path.from_)) + square_name(square(path.to)) +
+                 ("" if path.promotion is None else PIECE_LETTERS[PIECE_TYPES.index(path.promotion)].lower())
+                 for path in paths]
+        return " ".join(["ok", *moves])
+
+    async def _fen(self, *args: str) -> str:
+        if len(args) != 1:
+            raise ArgumentsCountError
+        async with self._locked_game(args[0]) as game:
+            return f"ok {game.to_fen()}"
+
+    async def _close(self, *args: str) -> str:
+        if len(args) != 1:
+            raise ArgumentsCountError
+        # Commands waiting for the lock find the game closed once they get it
+        async with self._locked_game(args[0]):
+            del self._games[int(args[0])], self._locks[int(args[0])]
+            if self._journal is not None:
+                await self._run(self._journal.remove_game, int(args[0]))
+        return "ok"
+
+    async def _stats(self, *args: str) -> str:
+        latencies = self._move_latencies
+        return (f"ok games={len(self._games)} moves={self._moves} "
+                f"p50={percentile(latencies, 0.5) * 1000:.3f} p99={percentile(latencies, 0.99) * 1000:.3f}")
+
+
+class LoadReport(NamedTuple):
+    moves: int
+    seconds: float
+    p50: float  # seconds of move round trip seen by clients
+    p99: float
+    server_stats: str  # reply of `stats` command
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.seconds if self.seconds else 0.0
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, command: str) -> str:
+    writer.write(command.encode() + b"\n")
+    await writer.drain()
+    return (await reader.readline()).decode().strip()
+
+
+async def _open_connection(host: str, port: int,
+                           path: Optional[str]) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _play_random_game(host: str, port: int, path: Optional[str], moves: int, rng: random.Random,
+                            latencies: list[float]) -> None:
+    """Plays random legal moves of one new game on its own connection.
+
+    Args:
+        host (str)
+        port (int)
+        path (Optional[str]): Unix socket path, used instead of `host` and `port` if it's given
+        moves (int): max count of moves
+        rng (random.Random)
+        latencies (list[float]): round trip seconds of every move are appended to it
+    """
+
+    reader, writer = await _open_connection(host, port, path)
+    try:
+        game_id = (await _request(reader, writer, "new")).split()[1]
+        for _ in range(moves):
+            legal_moves = (await _request(reader, writer, f"moves {game_id}")).split()[1:]
+            if not legal_moves:
+                break
+            move = rng.choice(legal_moves)
+            started_at = time.perf_counter()
+            reply = await _request(reader, writer, f"move {game_id} {move[:2]} {move[2:4]} {move[4:]}".rstrip())
+            latencies.append(time.perf_counter() - started_at)
+            if not reply.startswith("ok"):
+                break
+        await _request(reader, writer, f"close {game_id}")
+        # Waits until server closes the connection, so no connection handler is left running
+        writer.write(b"exit\n")
+        await reader.read()
+    finally:
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+
+
+async def generate_load(games: int, moves: int, host: str = "127.0.0.1", port: int = 0,
+                        path: Optional[str] = None, seed: Optional[int] = None) -> LoadReport:
+    """Plays `games` games of random moves at once, each on its own connection, and measures move latency.
+
+    Args:
+        games (int): count of concurrent games
+        moves (int): max count of moves of every game
+        host (str)
+        port (int)
+        path (Optional[str]): Unix socket path, used instead of `host` and `port` if it's given
+        seed (Optional[int]): seed of random moves
+
+    Returns:
+        LoadReport
+    """
+
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    started_at = time.perf_counter()
+    await asyncio.gather(*(
+        _play_random_game(host, port, path, moves, random.Random(rng.getrandbits(64)), latencies)
+        for _ in range(games)))
+    seconds = time.perf_counter() - started_at
+    reader, writer = await _open_connection(host, port, path)
+    try:
+        server_stats = await _request(reader, writer, "stats")
+        writer.write(b"exit\n")
+        await reader.read()
+    finally:
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+    return LoadReport(moves=len(latencies), seconds=seconds, p50=percentile(latencies, 0.5),
+                      p99=percentile(latencies, 0.99), server_stats=server_stats)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None,
+                workers: Optional[int] = None, journal_path: Optional[str] = None) -> None:
+    """Runs game server until it's cancelled.
+
+    Args:
+        host (str)
+        port (int)
+        path (Optional[str]): Unix socket path, used instead of `host` and `port` if it's given
+        workers (Optional[int]): count of executor threads, default of `ThreadPoolExecutor` if None
+        journal_path (Optional[str]): move journal, games of existing one are recovered and served on
+    """
+
+    with ThreadPoolExecutor(workers) as executor, \
+            (MoveJournal(journal_path) if journal_path is not None else nullcontext()) as journal:
+        games = None
+        if journal is not None:
+            journal.compact()
+            games = recover_games(journal_path)
+        server = await GameServer(executor, journal, games).start(host, port, path)
+        async with server:
+            await server.serve_forever()
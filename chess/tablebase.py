@@ -0,0 +1,508 @@
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Final, Iterable, NamedTuple, Optional, Union
+
+from .bitboard import (BISHOP, BLACK, COLORS, FULL, KING_ATTACKS, KNIGHT,
+                       KNIGHT_ATTACKS, PAWN, PAWN_ATTACKS, PIECE_LETTERS,
+                       PIECE_TYPES, QUEEN, ROOK, WHITE, BitBoard,
+                       bishop_attacks, color_index, iter_squares, pop_count,
+                       rook_attacks)
+from .enums import Outcome
+from .exceptions import TablebaseFormatError
+from .mailbox import Mailbox
+from .pieces import King, Pawn, Piece
+
+# Position index is turn(1 bit), strong king, strong piece and weak king squares(6 bits each).
+TABLE_SIZE: Final[int] = 2 * 64 ** 3
+# One byte per position: DRAW, side to move wins in 1..127 plies or loses in `value - LOSS` plies.
+DRAW: Final[int] = 0
+LOSS: Final[int] = 128
+INVALID: Final[int] = 255
+# Positions sent to worker at once.
+CHUNK_SIZE: Final[int] = 4096
+_HEADER: Final[struct.Struct] = struct.Struct("<4sBc2x")
+_MAGIC: Final[bytes] = b"CHTB"
+_VERSION: Final[int] = 1
+# Tables a pawn may promote into with winning chances.
+_PROMOTION_TYPES: Final[tuple[int, ...]] = (QUEEN, ROOK)
+
+
+class ProbeResult(NamedTuple):
+    outcome: Outcome  # for side to move
+    plies: int  # distance to mate, 0 for draw
+
+    @property
+    def moves(self) -> int:
+        """Distance to mate in moves of the winning side."""
+
+        return (self.plies + 1) // 2
+
+
+def parse_signature(signature: str) -> type[Piece]:
+    """Returns type of the only piece besides kings of material signature.
+
+    Args:
+        signature (str): e.g. "KQK"
+
+    Raises:
+        ValueError: raised if signature is not king and one piece against bare king.
+
+    Returns:
+        type[Piece]
+    """
+
+    signature = signature.upper()
+    if len(signature) != 3 or signature[0] != "K" or signature[2] != "K" or signature[1] not in PIECE_LETTERS[:-1]:
+        raise ValueError(f"unsupported material signature {signature!r}")
+    return PIECE_TYPES[PIECE_LETTERS.index(signature[1])]
+
+
+def signature(piece_type: type[Piece]) -> str:
+    """Returns material signature of king and `piece_type` piece against bare king, e.g. "KQK".
+
+    Args:
+        piece_type (type[Piece])
+
+    Returns:
+        str
+    """
+
+    return f"K{PIECE_LETTERS[PIECE_TYPES.index(piece_type)]}K"
+
+
+def tablebase_path(directory: Union[str, Path], piece_type: type[Piece]) -> Path:
+    """Returns path of `piece_type` table in `directory`.
+
+    Args:
+        directory (Union[str, Path])
+        piece_type (type[Piece])
+
+    Returns:
+        Path
+    """
+
+    return Path(directory) / f"{signature(piece_type)}.tb"
+
+
+def position_index(turn: int, king: int, piece: int, weak_king: int) -> int:
+    """Returns index of position in table.
+
+    Args:
+        turn (int): 0 if strong side is to move, 1 otherwise
+        king (int): square of strong king
+        piece (int): square of strong piece
+        weak_king (int): square of weak king
+
+    Returns:
+        int
+    """
+
+    return turn << 18 | king << 12 | piece << 6 | weak_king
+
+
+class Tablebase:
+    """Table of king and one piece against bare king read through read only memory map.
+
+    Strong side is white in the table, positions with stronger black are
+    probed mirrored by ranks with colors swapped. Probe is one index
+    computation and one byte read.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._path = Path(path)
+        with open(self._path, "rb") as file:
+            file.seek(0, 2)
+            if file.tell() != _HEADER.size + TABLE_SIZE:
+                raise TablebaseFormatError(str(path))
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, letter = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC or version != _VERSION or letter.decode("ascii", "replace") not in PIECE_LETTERS[:-1]:
+            self._data.close()
+            raise TablebaseFormatError(str(path))
+        self._piece_type = PIECE_LETTERS.index(letter.decode("ascii"))
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple[type["Tablebase"], tuple[Path]]:
+        return Tablebase, (self._path,)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def piece_type(self) -> type[Piece]:
+        return PIECE_TYPES[self._piece_type]
+
+    @property
+    def signature(self) -> str:
+        return signature(self.piece_type)
+
+    def close(self) -> None:
+        self._data.close()
+
+    def value(self, index: int) -> int:
+        """Returns raw value of position, see `position_index`.
+
+        Args:
+            index (int)
+
+        Returns:
+            int: DRAW, plies to win, LOSS plus plies to mate or INVALID
+        """
+
+        return self._data[_HEADER.size + index]
+
+    def probe(self, bitboard: Union[BitBoard, Mailbox]) -> Optional[ProbeResult]:
+        """Returns result of the position for side to move, None if material differs from the table.
+
+        Args:
+            bitboard (Union[BitBoard, Mailbox])
+
+        Returns:
+            Optional[ProbeResult]
+        """
+
+        occupied = bitboard.occupied
+        if pop_count(occupied) != 3:
+            return None
+        white = bitboard.occupancy(COLORS[WHITE])
+        strong = WHITE if pop_count(white) == 2 else BLACK
+        strong_occupancy = white if strong == WHITE else occupied ^ white
+        king = bitboard.king_square(COLORS[strong])
+        weak_king = bitboard.king_square(COLORS[strong ^ 1])
+        piece = (strong_occupancy ^ 1 << king).bit_length() - 1
+        if piece < 0 or bitboard.piece_type_at(piece) != self._piece_type:
+            return None
+        if strong == BLACK:
+            king, piece, weak_king = king ^ 56, piece ^ 56, weak_king ^ 56
+        value = self.value(position_index(color_index(bitboard.turn) ^ strong, king, piece, weak_king))
+        if value == INVALID:
+            return None
+        if value == DRAW:
+            return ProbeResult(outcome=Outcome.DRAW, plies=0)
+        if value < LOSS:
+            return ProbeResult(outcome=Outcome.WIN, plies=value)
+        return ProbeResult(outcome=Outcome.LOSS, plies=value - LOSS)
+
+
+def open_tablebases(directory: Union[str, Path]) -> list[Tablebase]:
+    """Opens all tables of `directory`.
+
+    Args:
+        directory (Union[str, Path])
+
+    Returns:
+        list[Tablebase]
+    """
+
+    return [Tablebase(path) for path in sorted(Path(directory).glob("K?K.tb"))]
+
+
+def probe_tablebases(tablebases: Iterable[Tablebase], bitboard: Union[BitBoard, Mailbox]) -> Optional[ProbeResult]:
+    """Returns result of the position from the first table of its material, None if there is no such table.
+
+    Args:
+        tablebases (Iterable[Tablebase])
+        bitboard (Union[BitBoard, Mailbox])
+
+    Returns:
+        Optional[ProbeResult]
+    """
+
+    for tablebase in tablebases:
+        result = tablebase.probe(bitboard)
+        if result is not None:
+            return result
+    return None
+
+
+def _piece_attacks(piece_type: int, sq: int, occupied: int) -> int:
+    """Returns attacks of white `piece_type` piece on `sq`.
+
+    Args:
+        piece_type (int)
+        sq (int)
+        occupied (int)
+
+    Returns:
+        int
+    """
+
+    if piece_type == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    if piece_type == PAWN:
+        return PAWN_ATTACKS[WHITE][sq]
+    attacks = 0
+    if piece_type != BISHOP:
+        attacks |= rook_attacks(sq, occupied)
+    if piece_type != ROOK:
+        attacks |= bishop_attacks(sq, occupied)
+    return attacks
+
+
+def _is_valid(piece_type: int, turn: int, king: int, piece: int, weak_king: int) -> bool:
+    """Returns True if position may arise in a game.
+
+    Args:
+        piece_type (int)
+        turn (int)
+        king (int)
+        piece (int)
+        weak_king (int)
+
+    Returns:
+        bool
+    """
+
+    if king == piece or king == weak_king or piece == weak_king or KING_ATTACKS[king] >> weak_king & 1:
+        return False
+    if piece_type == PAWN and not 8 <= piece < 56:
+        return False
+    # Side which is not to move can't be in check
+    occupied = 1 << king | 1 << piece | 1 << weak_king
+    return turn == BLACK or not _piece_attacks(piece_type, piece, occupied) >> weak_king & 1
+
+
+def _pawn_pushes(piece: int, occupied: int) -> int:
+    """Returns squares white pawn on `piece` can move to.
+
+    Args:
+        piece (int)
+        occupied (int)
+
+    Returns:
+        int
+    """
+
+    push = piece + 8
+    if occupied >> push & 1:
+        return 0
+    if piece >> 3 == 1 and not occupied >> push + 8 & 1:
+        return 1 << push | 1 << push + 8
+    return 1 << push
+
+
+def _promotion_tables(directory: str) -> list[Tablebase]:
+    return [Tablebase(tablebase_path(directory, PIECE_TYPES[piece_type])) for piece_type in _PROMOTION_TYPES]
+
+
+def _initialize_chunk(args: tuple[int, int, int, str]) -> tuple[bytes, bytes, list[tuple[int, int]]]:
+    """Finds invalid, mated and stalemated positions and counts moves of others.
+
+    Args:
+        args (tuple[int, int, int, str]): piece type, first and after last
+            position indexes and directory of promotion tables
+
+    Returns:
+        tuple[bytes, bytes, list[tuple[int, int]]]: values and move counts of
+            positions, (index, plies) of pawn positions won by promotion
+    """
+
+    piece_type, start, stop, directory = args
+    promotion_tables = _promotion_tables(directory) if piece_type == PAWN else []
+    values = bytearray(stop - start)
+    counts = bytearray(stop - start)
+    promotions = []
+    for index in range(start, stop):
+        turn, king, piece, weak_king = index >> 18, index >> 12 & 63, index >> 6 & 63, index & 63
+        i = index - start
+        if not _is_valid(piece_type, turn, king, piece, weak_king):
+            values[i] = INVALID
+            continue
+        occupied = 1 << king | 1 << piece | 1 << weak_king
+        if turn == WHITE:
+            count = pop_count(KING_ATTACKS[king] & ~KING_ATTACKS[weak_king] & ~(1 << piece))
+            if piece_type == PAWN:
+                pushes = _pawn_pushes(piece, occupied)
+                count += pop_count(pushes)
+                if pushes and piece >= 48:
+                    promoted = position_index(BLACK, king, piece + 8, weak_king)
+                    plies = [value - LOSS + 1 for value in (table.value(promoted) for table in promotion_tables)
+                             if LOSS <= value < INVALID]
+                    if plies:
+                        promotions.append((index, min(plies)))
+            else:
+                count += pop_count(_piece_attacks(piece_type, piece, occupied) & ~occupied)
+            is_check = False
+        else:
+            # King may step back along the ray of slider giving check
+            attacks = KING_ATTACKS[king] | _piece_attacks(piece_type, piece, occupied ^ 1 << weak_king)
+            count = pop_count(KING_ATTACKS[weak_king] & ~attacks)
+            is_check = bool(attacks >> weak_king & 1)
+        if count:
+            counts[i] = count
+        elif is_check:
+            values[i] = LOSS
+    for table in promotion_tables:
+        table.close()
+    return bytes(values), bytes(counts), promotions
+
+
+def _predecessors_chunk(args: tuple[int, list[int]]) -> list[list[int]]:
+    """Returns indexes of positions from which every position is reached by one move.
+
+    Moves are taken back without captures, since there is no piece to
+    uncapture, so some of the returned positions may be invalid.
+
+    Args:
+        args (tuple[int, list[int]]): piece type and position indexes
+
+    Returns:
+        list[list[int]]
+    """
+
+    piece_type, indexes = args
+    chunk_predecessors = []
+    for index in indexes:
+        turn, king, piece, weak_king = index >> 18, index >> 12 & 63, index >> 6 & 63, index & 63
+        empty = ~(1 << king | 1 << piece | 1 << weak_king) & FULL
+        predecessors = []
+        if turn == BLACK:
+            base = piece << 6 | weak_king
+            for sq in iter_squares(KING_ATTACKS[king] & empty & ~KING_ATTACKS[weak_king]):
+                predecessors.append(sq << 12 | base)
+            if piece_type == PAWN:
+                origins = 0
+                if piece >= 16 and empty >> piece - 8 & 1:
+                    origins = 1 << piece - 8
+                    if piece >> 3 == 3 and empty >> piece - 16 & 1:
+                        origins |= 1 << piece - 16
+            else:
+                origins = _piece_attacks(piece_type, piece, ~empty) & empty
+            base = king << 12 | weak_king
+            for sq in iter_squares(origins):
+                predecessors.append(base | sq << 6)
+        else:
+            base = 1 << 18 | king << 12 | piece << 6
+            for sq in iter_squares(KING_ATTACKS[weak_king] & empty & ~KING_ATTACKS[king]):
+                predecessors.append(base | sq)
+        chunk_predecessors.append(predecessors)
+    return chunk_predecessors
+
+
+def generate_tablebase(piece_type: type[Piece], directory: Union[str, Path], workers: Optional[int] = None) -> Path:
+    """Computes distance to mate of all positions of king and `piece_type` against bare king.
+
+    Retrograde analysis starts from checkmates and walks moves backwards
+    one ply at a time. Position of side to move is won if some move leads
+    to lost position, and it's lost when all its moves lead to won ones,
+    so every position keeps count of its moves which are not known to be won
+    for the opponent yet. Positions which are neither won nor lost at the
+    end are drawn. Table of pawn starts also from positions won by promotion,
+    so queen and rook tables must be in `directory` already.
+
+    Move counting and walking moves backwards are split into chunks of
+    positions computed in a process pool.
+
+    Args:
+        piece_type (type[Piece]): any piece type but king
+        directory (Union[str, Path]): directory to write table to
+        workers (Optional[int]): count of worker processes, table is
+            computed in this process if 1, CPU count if None
+
+    Raises:
+        ValueError: raised if `piece_type` is king or `workers` is not positive.
+        FileNotFoundError: raised if pawn table is generated without queen and rook tables.
+
+    Returns:
+        Path: path of written table
+    """
+
+    if piece_type is King:
+        raise ValueError("king can't be the only piece besides kings")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    type_index = PIECE_TYPES.index(piece_type)
+    if piece_type is Pawn:
+        # Fail before workers are started
+        for table in _promotion_tables(str(directory)):
+            table.close()
+
+    values = bytearray(TABLE_SIZE)
+    counts = bytearray(TABLE_SIZE)
+    promotions: dict[int, list[int]] = {}
+    with ProcessPoolExecutor(workers) if workers > 1 else nullcontext() as executor:
+        map_: Callable = map if executor is None else executor.map
+        starts = range(0, TABLE_SIZE, CHUNK_SIZE)
+        chunks = map_(_initialize_chunk, [(type_index, start, start + CHUNK_SIZE, str(directory)) for start in starts])
+        for start, (chunk_values, chunk_counts, chunk_promotions) in zip(starts, chunks):
+            values[start:start + CHUNK_SIZE] = chunk_values
+            counts[start:start + CHUNK_SIZE] = chunk_counts
+            for index, plies in chunk_promotions:
+                promotions.setdefault(plies, []).append(index)
+
+        frontier = [index for index, value in enumerate(values) if value == LOSS]
+        ply = 0
+        while frontier or any(plies >= ply for plies in promotions):
+            for index in promotions.pop(ply, ()):
+                if counts[index]:
+                    values[index] = ply
+                    counts[index] = 0
+                    frontier.append(index)
+            next_frontier = []
+            chunks = [frontier[i:i + CHUNK_SIZE] for i in range(0, len(frontier), CHUNK_SIZE)]
+            for chunk, chunk_predecessors in zip(chunks, map_(_predecessors_chunk, [(type_index, c) for c in chunks])):
+                for index, predecessors in zip(chunk, chunk_predecessors):
+                    if values[index] >= LOSS:
+                        # Side to move of predecessor wins by moving here
+                        for predecessor in predecessors:
+                            if counts[predecessor]:
+                                counts[predecessor] = 0
+                                values[predecessor] = ply + 1
+                                next_frontier.append(predecessor)
+                    else:
+                        for predecessor in predecessors:
+                            if counts[predecessor]:
+                                counts[predecessor] -= 1
+                                if not counts[predecessor]:
+                                    values[predecessor] = LOSS + ply + 1
+                                    next_frontier.append(predecessor)
+            frontier = next_frontier
+            ply += 1
+
+    # Table is replaced at once, so processes which map the old file keep reading it
+    path = tablebase_path(directory, piece_type)
+    temporary_path = path.with_suffix(".tmp")
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, PIECE_LETTERS[type_index].encode("ascii")))
+        file.write(values)
+    os.replace(temporary_path, path)
+    return path
+
+
+def generate_tablebases(signatures: Iterable[str], directory: Union[str, Path],
+                        workers: Optional[int] = None) -> list[Path]:
+    """Generates tables of `signatures`, queen and rook tables first as pawn table depends on them.
+
+    Args:
+        signatures (Iterable[str]): e.g. ("KQK", "KRK", "KPK")
+        directory (Union[str, Path]): directory to write tables to
+        workers (Optional[int]): count of worker processes, see `generate_tablebase`
+
+    Raises:
+        ValueError: raised if some signature is not supported.
+
+    Returns:
+        list[Path]: paths of written tables
+    """
+
+    piece_types = sorted({parse_signature(signature) for signature in signatures}, key=lambda t: t is Pawn)
+    paths = []
+    for piece_type in piece_types:
+        if piece_type is Pawn:
+            for promotion_type in _PROMOTION_TYPES:
+                path = tablebase_path(directory, PIECE_TYPES[promotion_type])
+                if path not in paths and not path.exists():
+                    paths.append(generate_tablebase(PIECE_TYPES[promotion_type], directory, workers))
+        paths.append(generate_tablebase(piece_type, directory, workers))
+    return paths
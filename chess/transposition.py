@@ -0,0 +1,161 @@
+from array import array
+from typing import Final, NamedTuple, Optional
+
+from .enums import Bound
+
+# Entry data layout: bits 0-17 move, 18-25 depth, 26-27 bound(0 for empty
+# entry), 28-33 search generation, 34-63 score shifted by SCORE_OFFSET.
+_MOVE_MASK: Final[int] = (1 << 18) - 1
+_DEPTH_SHIFT: Final[int] = 18
+_BOUND_SHIFT: Final[int] = 26
+_GENERATION_SHIFT: Final[int] = 28
+_SCORE_SHIFT: Final[int] = 34
+SCORE_OFFSET: Final[int] = 1 << 29
+MAX_DEPTH: Final[int] = 255
+ENTRY_SIZE: Final[int] = 16  # bytes: 8 for key and 8 for data
+
+
+class TTEntry(NamedTuple):
+    key: int
+    depth: int
+    bound: Bound
+    score: int
+    move: int
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results by position Zobrist key.
+
+    Entries live in two preallocated flat arrays, so memory use is set by the
+    budget and never grows. Each bucket has two entries: the first keeps the
+    deepest result of the current search, the second is always replaced.
+    """
+
+    def __init__(self, size_mb: float = 16) -> None:
+        buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_SIZE * 2))
+        buckets = 1 << (buckets.bit_length() - 1)  # power of two for masking
+        self._mask = buckets - 1
+        self._keys = array("Q", bytes(8 * 2 * buckets))
+        self._data = array("Q", bytes(8 * 2 * buckets))
+        self._generation = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+        self._replacements = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._keys) * ENTRY_SIZE
+
+    @property
+    def probes(self) -> int:
+        return self._probes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def stores(self) -> int:
+        return self._stores
+
+    @property
+    def replacements(self) -> int:
+        """Count of stores that overwrote entry of other position."""
+
+        return self._replacements
+
+    @property
+    def hit_rate(self) -> float:
+        return self._hits / self._probes if self._probes else 0.0
+
+    @property
+    def replacement_rate(self) -> float:
+        return self._replacements / self._stores if self._stores else 0.0
+
+    def new_search(self) -> None:
+        """Marks entries stored so far as old so deeper new results don't lose to them."""
+
+        self._generation = (self._generation + 1) & 63
+
+    def clear(self) -> None:
+        """Removes all entries and resets statistics."""
+
+        size = len(self._keys)
+        self._keys = array("Q", bytes(8 * size))
+        self._data = array("Q", bytes(8 * size))
+        self._generation = 0
+        self._probes = self._hits = self._stores = self._replacements = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Returns entry stored for `key` or None.
+
+        Args:
+            key (int): Zobrist key
+
+        Returns:
+            Optional[TTEntry]
+        """
+
+        self._probes += 1
+        index = (key & self._mask) << 1
+        keys = self._keys
+        if keys[index] != key:
+            index += 1
+            if keys[index] != key:
+                return None
+        data = self._data[index]
+        bound = data >> _BOUND_SHIFT & 3
+        if not bound:
+            return None
+        self._hits += 1
+        return TTEntry(key=key, depth=data >> _DEPTH_SHIFT & 255, bound=Bound(bound),
+                       score=(data >> _SCORE_SHIFT) - SCORE_OFFSET, move=data & _MOVE_MASK)
+
+    def store(self, key: int, depth: int, bound: Bound, score: int, move: int = 0) -> None:
+        """Stores search result for `key` position.
+
+        Args:
+            key (int): Zobrist key
+            depth (int): search depth of the result
+            bound (Bound): kind of `score`
+            score (int)
+            move (int): best encoded move, 0 if there is none
+        """
+
+        self._stores += 1
+        index = (key & self._mask) << 1
+        keys = self._keys
+        data = self._data
+        generation = self._generation
+        stored = data[index]
+        if not (keys[index] == key or not stored >> _BOUND_SHIFT & 3 or
+                depth >= stored >> _DEPTH_SHIFT & 255 or
+                stored >> _GENERATION_SHIFT & 63 != generation):
+            index += 1
+            stored = data[index]
+        if keys[index] == key:
+            if not move:
+                move = stored & _MOVE_MASK  # keep known best move of the position
+        elif stored >> _BOUND_SHIFT & 3:
+            self._replacements += 1
+        keys[index] = key
+        data[index] = (move | min(max(depth, 0), MAX_DEPTH) << _DEPTH_SHIFT | bound << _BOUND_SHIFT |
+                       generation << _GENERATION_SHIFT | (score + SCORE_OFFSET) << _SCORE_SHIFT)
+
+    def hashfull(self) -> int:
+        """Returns permille of used entries of current search among the first 1000.
+
+        Returns:
+            int
+        """
+
+        data = self._data
+        sample = min(1000, len(data))
+        generation = self._generation
+        used = sum(1 for i in range(sample)
+                   if data[i] >> _BOUND_SHIFT & 3 and data[i] >> _GENERATION_SHIFT & 63 == generation)
+        return used * 1000 // sample
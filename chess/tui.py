@@ -3,8 +3,8 @@ import typing
 
 from .board_printer import BoardPrinter
 from .consts import letters, nums
-from .exceptions import (ArgumentsCountError, CommandNotExistsError,
-                         MovePathParseError)
+from .exceptions import (ArgumentsCountError, CheckMate,
+                         CommandNotExistsError, MovePathParseError, Stalemate)
 from .game import Game
 from .move_path import MovePath
 from .position import Position
@@ -67,7 +67,16 @@ class TUI:
         from_, to = args[0], args[1]
         path = self._parse_move_path(from_, to)
 
-        self._game.move(path.from_, path.to)
+        try:
+            self._game.move(path.from_, path.to)
+        except CheckMate as error:
+            self._board_printer.print()
+            print(f"Checkmate, {error.color.name.lower()} lost")
+            return
+        except Stalemate as error:
+            self._board_printer.print()
+            print(f"Stalemate, {error.color.name.lower()} has no moves")
+            return
         self._board_printer.print()
         self._print_current_move_color()
 
@@ -0,0 +1,284 @@
+import sys
+import threading
+from typing import Final, Optional, TextIO
+
+from .bitboard import (QUEEN, STARTING_FEN, BitBoard, move_from_square,
+                       move_promotion, move_to_square)
+from .engine import MATE_SCORE, MAX_PLY, Engine, SearchLimits, SearchResult
+from .enums import Color
+from .exceptions import FenParseError
+
+ENGINE_NAME: Final[str] = "chess"
+ENGINE_AUTHOR: Final[str] = "Madara"
+# Moves left to play assumed by time control without `movestogo`.
+DEFAULT_MOVES_TO_GO: Final[int] = 30
+_FILES: Final[str] = "abcdefgh"
+_PROMOTION_LETTERS: Final[str] = " nbrq"
+
+
+def square_name(sq: int) -> str:
+    """Returns name of square in algebraic notation, e.g. "e4".
+
+    Args:
+        sq (int)
+
+    Returns:
+        str
+    """
+
+    return _FILES[sq & 7] + str((sq >> 3) + 1)
+
+
+def move_to_uci(move: int) -> str:
+    """Returns encoded move in UCI long algebraic notation, e.g. "e2e4" or "e7e8q".
+
+    Args:
+        move (int)
+
+    Returns:
+        str
+    """
+
+    text = square_name(move_from_square(move)) + square_name(move_to_square(move))
+    promotion = move_promotion(move)
+    return text + _PROMOTION_LETTERS[promotion] if promotion else text
+
+
+def parse_uci_move(bitboard: BitBoard, text: str) -> Optional[int]:
+    """Returns legal encoded move named by UCI long algebraic notation, None if there is no such move.
+
+    Args:
+        bitboard (BitBoard)
+        text (str): e.g. "e2e4", "e1g1" or "e7e8q"
+
+    Returns:
+        Optional[int]
+    """
+
+    if len(text) not in (4, 5) or text[0] not in _FILES or text[2] not in _FILES or \
+            text[1] not in "12345678" or text[3] not in "12345678":
+        return None
+    from_sq = _FILES.index(text[0]) + 8 * (int(text[1]) - 1)
+    to_sq = _FILES.index(text[2]) + 8 * (int(text[3]) - 1)
+    promotion = _PROMOTION_LETTERS.find(text[4]) if len(text) == 5 else 0
+    if promotion < 1 and len(text) == 5:
+        return None
+    move = bitboard.find_move(from_sq, to_sq, promotion or QUEEN)
+    if move is not None and move_promotion(move) != promotion:
+        return None  # pawn move to the last rank must name its promotion
+    return move
+
+
+def _format_score(score: int) -> str:
+    """Returns UCI score of side to move, mates are in moves of the side which mates.
+
+    Args:
+        score (int)
+
+    Returns:
+        str
+    """
+
+    if abs(score) < MATE_SCORE - MAX_PLY:
+        return f"cp {score}"
+    plies = MATE_SCORE - abs(score)
+    return f"mate {(plies + 1) // 2 if score > 0 else -(plies // 2)}"
+
+
+class UCI:
+    """Universal Chess Interface front end of `Engine` for GUIs and tournament managers.
+
+    Commands are read on the calling thread and search runs on its own
+    thread, so `stop`, `isready` and `quit` are answered while searching.
+    Position is kept between commands, so `position ... moves` made of
+    the previous moves and new ones makes only the new moves and takeback
+    unmakes moves instead of replaying the game from its start.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, input_stream: Optional[TextIO] = None,
+                 output_stream: Optional[TextIO] = None) -> None:
+        self._engine = engine if engine is not None else Engine()
+        self._input = input_stream if input_stream is not None else sys.stdin
+        self._output = output_stream if output_stream is not None else sys.stdout
+        self._output_lock = threading.Lock()
+        self._fen = STARTING_FEN
+        self._moves: list[str] = []
+        self._bitboard = BitBoard.from_fen(STARTING_FEN)
+        self._search_thread: Optional[threading.Thread] = None
+        # Running search has no limits and sends its best move only after `stop`
+        self._search_until_stop = False
+        # Set by `stop`, infinite search holds its best move until then
+        self._stop_event = threading.Event()
+        self._commands = {
+            "uci": self._uci,
+            "isready": self._isready,
+            "ucinewgame": self._ucinewgame,
+            "position": self._position,
+            "go": self._go,
+            "stop": self._stop,
+        }
+
+    @property
+    def bitboard(self) -> BitBoard:
+        return self._bitboard
+
+    def run(self) -> None:
+        """Handles commands until `quit` or end of input."""
+
+        for line in self._input:
+            if not self.handle(line):
+                break
+        self._stop()
+
+    def handle(self, line: str) -> bool:
+        """Handles one command line, unknown commands are ignored.
+
+        Args:
+            line (str)
+
+        Returns:
+            bool: False if it was `quit`
+        """
+
+        command_name, *args = line.split() or [""]
+        if command_name == "quit":
+            return False
+        command_executor = self._commands.get(command_name)
+        if command_executor is not None:
+            if command_name not in ("stop", "isready"):
+                self._wait_search()
+            command_executor(*args)
+        return True
+
+    def wait(self) -> None:
+        """Waits until running search sends its best move, search running until `stop` is stopped."""
+
+        self._wait_search()
+
+    def _send(self, line: str) -> None:
+        with self._output_lock:
+            self._output.write(line + "\n")
+            self._output.flush()
+
+    def _wait_search(self) -> None:
+        if self._search_thread is None:
+            return
+        if self._search_until_stop:
+            # Joining would wait for `stop` forever
+            self._stop()
+            return
+        self._stop_event.set()
+        self._search_thread.join()
+        self._search_thread = None
+
+    def _uci(self, *args: str) -> None:
+        self._send(f"id name {ENGINE_NAME}")
+        self._send(f"id author {ENGINE_AUTHOR}")
+        self._send("uciok")
+
+    def _isready(self, *args: str) -> None:
+        self._send("readyok")
+
+    def _ucinewgame(self, *args: str) -> None:
+        self._engine.table.clear()
+
+    def _stop(self, *args: str) -> None:
+        self._stop_event.set()
+        # Stop asked before search thread enters the search is reset by it, so it's repeated
+        while self._search_thread is not None and self._search_thread.is_alive():
+            self._engine.stop()
+            self._search_thread.join(0.01)
+        self._search_thread = None
+
+    def _position(self, *args: str) -> None:
+        """Sets position by `startpos` or `fen <FEN>` and optional `moves <move>...`.
+
+        Moves shared with the current position are kept, so only moves
+        after the last shared one are unmade and made.
+        """
+
+        fields = list(args)
+        moves: list[str] = []
+        if "moves" in fields:
+            moves = fields[fields.index("moves") + 1:]
+            del fields[fields.index("moves"):]
+        if fields == ["startpos"]:
+            fen = STARTING_FEN
+        elif fields[:1] == ["fen"] and len(fields) > 1:
+            fen = " ".join(fields[1:])
+        else:
+            self._send(f"info string invalid position {' '.join(args)}")
+            return
+
+        if fen != self._fen:
+            try:
+                bitboard = BitBoard.from_fen(fen)
+            except FenParseError:
+                self._send(f"info string invalid fen {fen}")
+                return
+            self._fen, self._moves, self._bitboard = fen, [], bitboard
+        shared = 0
+        for made, move in zip(self._moves, moves):
+            if made != move:
+                break
+            shared += 1
+        for _ in range(len(self._moves) - shared):
+            self._bitboard.unmake_move()
+        del self._moves[shared:]
+        for text in moves[shared:]:
+            move = parse_uci_move(self._bitboard, text)
+            if move is None:
+                self._send(f"info string illegal move {text}")
+                return
+            self._bitboard.make_move(move)
+            self._moves.append(text)
+
+    def _go(self, *args: str) -> None:
+        """Starts search limited by `depth`, `nodes`, `movetime` or clock of side to move.
+
+        Search without limits, `go infinite` and `go ponder` run until `stop`.
+        """
+
+        options: dict[str, int] = {}
+        for name, value in zip(args, args[1:]):
+            if value.lstrip("-").isdigit():
+                options[name] = int(value)
+        infinite = "infinite" in args or "ponder" in args
+        limits = SearchLimits(depth=options.get("depth"), nodes=options.get("nodes"),
+                              time=None if infinite else self._time_budget(options))
+        self._search_until_stop = infinite or limits == SearchLimits()
+        self._stop_event.clear()
+        self._search_thread = threading.Thread(target=self._search, args=(limits, infinite), daemon=True)
+        self._search_thread.start()
+
+    def _time_budget(self, options: dict[str, int]) -> Optional[float]:
+        """Returns seconds to think about the move.
+
+        Args:
+            options (dict[str, int]): numeric `go` options
+
+        Returns:
+            Optional[float]: None if there is no time limit
+        """
+
+        if "movetime" in options:
+            return max(options["movetime"], 1) / 1000
+        white = self._bitboard.turn is Color.WHITE
+        remaining = options.get("wtime" if white else "btime")
+        if remaining is None:
+            return None
+        increment = options.get("winc" if white else "binc", 0)
+        moves_to_go = options.get("movestogo") or DEFAULT_MOVES_TO_GO
+        budget = min(remaining / moves_to_go + increment * 0.75, remaining / 2)
+        return max(budget, 1) / 1000
+
+    def _search(self, limits: SearchLimits, infinite: bool) -> None:
+        result = self._engine.search(self._bitboard, limits, self._send_info)
+        if infinite:
+            self._stop_event.wait()
+        self._send(f"bestmove {'0000' if result.move is None else move_to_uci(result.move)}")
+
+    def _send_info(self, result: SearchResult) -> None:
+        self._send(f"info depth {result.depth} score {_format_score(result.score)} nodes {result.nodes} "
+                   f"nps {result.nodes_per_second:.0f} time {result.seconds * 1000:.0f} "
+                   f"hashfull {self._engine.table.hashfull()} pv {' '.join(move_to_uci(move) for move in result.pv)}")
@@ -1,7 +1,40 @@
+from typing import Final
+
 from chess.enums import Color
 from chess.position import Position
 from chess.rules import (CastlingMoveRule, DiagonalMoveRule,
-                         HorizontalMoveRule, KnightMoveRule, VerticalMoveRule)
+                         HorizontalMoveRule, KnightMoveRule, MoveRule,
+                         VerticalMoveRule)
+
+_HORIZONTAL: Final[int] = 1
+_VERTICAL: Final[int] = 2
+_DIAGONAL: Final[int] = 4
+_KNIGHT: Final[int] = 8
+_CASTLING: Final[int] = 16
+
+
+def _path_types_table() -> bytes:
+    """Returns path type flags by `from_square * 64 + to_square` index.
+
+    Returns:
+        bytes
+    """
+
+    positions = [Position(x=sq % 8, y=sq // 8) for sq in range(64)]
+    flag_rules: tuple[tuple[int, tuple[MoveRule, ...]], ...] = (
+        (_HORIZONTAL, (HorizontalMoveRule(7),)),
+        (_VERTICAL, (VerticalMoveRule(7),)),
+        (_DIAGONAL, (DiagonalMoveRule(7),)),
+        (_KNIGHT, (KnightMoveRule(),)),
+        (_CASTLING, (CastlingMoveRule(Color.WHITE), CastlingMoveRule(Color.BLACK))),
+    )
+    return bytes(
+        sum(flag for flag, rules in flag_rules if any(rule.is_valid_path(from_, to) for rule in rules))
+        for from_ in positions for to in positions)
+
+
+# Positions are expected to be on the board.
+_PATH_TYPES: Final[bytes] = _path_types_table()
 
 
 def is_horizontal_path(from_: Position, to: Position) -> bool:
@@ -14,7 +47,7 @@ def is_horizontal_path(from_: Position, to: Position) -> bool:
         bool
     """
 
-    return HorizontalMoveRule(7).is_valid_path(from_, to)
+    return bool(_PATH_TYPES[(from_.y * 8 + from_.x) << 6 | to.y * 8 + to.x] & _HORIZONTAL)
 
 
 def is_vertical_path(from_: Position, to: Position) -> bool:
@@ -27,7 +60,7 @@ def is_vertical_path(from_: Position, to: Position) -> bool:
         bool
     """
 
-    return VerticalMoveRule(7).is_valid_path(from_, to)
+    return bool(_PATH_TYPES[(from_.y * 8 + from_.x) << 6 | to.y * 8 + to.x] & _VERTICAL)
 
 
 def is_diagonal_path(from_: Position, to: Position) -> bool:
@@ -40,7 +73,7 @@ def is_diagonal_path(from_: Position, to: Position) -> bool:
         bool
     """
 
-    return DiagonalMoveRule(7).is_valid_path(from_, to)
+    return bool(_PATH_TYPES[(from_.y * 8 + from_.x) << 6 | to.y * 8 + to.x] & _DIAGONAL)
 
 
 def is_knight_path(from_: Position, to: Position) -> bool:
@@ -53,7 +86,7 @@ def is_knight_path(from_: Position, to: Position) -> bool:
         bool
     """
 
-    return KnightMoveRule().is_valid_path(from_, to)
+    return bool(_PATH_TYPES[(from_.y * 8 + from_.x) << 6 | to.y * 8 + to.x] & _KNIGHT)
 
 
 def is_castling_path(from_: Position, to: Position) -> bool:
@@ -66,5 +99,4 @@ def is_castling_path(from_: Position, to: Position) -> bool:
         bool
     """
 
-    return (CastlingMoveRule(Color.WHITE).is_valid_path(from_, to) or
-            CastlingMoveRule(Color.BLACK).is_valid_path(from_, to))
+    return bool(_PATH_TYPES[(from_.y * 8 + from_.x) << 6 | to.y * 8 + to.x] & _CASTLING)
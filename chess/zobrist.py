@@ -0,0 +1,17 @@
+import random
+from typing import Final
+
+_random = random.Random(0x5A0B12)
+
+# Random keys XORed together give position key. Piece keys are indexed by
+# piece code(color * 6 + piece type) and square.
+PIECE_KEYS: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(_random.getrandbits(64) for _ in range(64)) for _ in range(12))
+BLACK_TO_MOVE_KEY: Final[int] = _random.getrandbits(64)
+_castling_right_keys = [_random.getrandbits(64) for _ in range(4)]
+# Keys by castling rights mask, so rights change is a single XOR.
+CASTLING_KEYS: Final[tuple[int, ...]] = tuple(
+    _castling_right_keys[0] * (rights & 1) ^ _castling_right_keys[1] * (rights >> 1 & 1) ^
+    _castling_right_keys[2] * (rights >> 2 & 1) ^ _castling_right_keys[3] * (rights >> 3 & 1)
+    for rights in range(16))
+EN_PASSANT_KEYS: Final[tuple[int, ...]] = tuple(_random.getrandbits(64) for _ in range(8))
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+from chess.batch import validate_games, validate_pgn
+from chess.enums import Verdict
+from chess.main import main
+from chess.pgn import read_games, replay_games
+
+PGN = """[Event "Scholar's mate"]
+
+1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0
+
+1. e4 e5 2. Ke3 *
+
+1. d4 d5 2. Nf3 Nf6 1/2-1/2
+""" * 5
+
+
+def test_validate_pgn():
+    results = list(validate_pgn(io.StringIO(PGN), workers=2, chunk_size=2))
+    assert results == list(replay_games(io.StringIO(PGN)))
+    assert [result.verdict for result in results[:3]] == [Verdict.CHECKMATE, Verdict.ILLEGAL, Verdict.LEGAL]
+    assert results[1].illegal_ply == 3
+    assert results[0].illegal_ply is None
+
+
+def test_validate_games_arguments():
+    games = read_games(io.StringIO(PGN))
+    with pytest.raises(ValueError):
+        list(validate_games(games, chunk_size=0))
+    assert list(validate_games([], workers=1)) == []
+
+
+def test_pgn_command_workers(tmp_path, capsys):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    assert main(["pgn", str(path), "-j", "2", "--chunk-size", "4"]) == 1
+    out = capsys.readouterr().out
+    assert "game 5: illegal at ply 3" in out
+    assert "15 games, 10 legal, 5 checkmates" in out
@@ -0,0 +1,66 @@
+import pytest
+from chess.bitboard import COLORS, STARTING_FEN, BitBoard
+from chess.board import Board
+from chess.enums import Color
+from chess.evaluation import material
+from chess.piece_square import PIECE_SQUARE_TABLES
+from chess.game import Game
+from chess.mailbox import Mailbox
+from chess.perft import load_perft_positions
+
+np = pytest.importorskip("numpy")
+batch_evaluation = pytest.importorskip("chess.batch_evaluation")
+
+FENS = [position.fen for position in load_perft_positions()]
+
+
+def _mobility(bitboard, color):
+    bitboard = bitboard.copy()
+    bitboard.turn = color
+    return sum(batch_evaluation.MOBILITY_WEIGHTS[bitboard.piece_type_at(move & 63)]
+               for move in bitboard.pseudo_legal_moves())
+
+
+def test_pack_positions():
+    packed = batch_evaluation.pack_positions([BitBoard.from_fen(fen) for fen in FENS])
+    assert packed.codes.shape == (len(FENS), 64)
+    assert packed.codes.dtype == np.int8
+    assert packed.turns.tolist() == [0, 0, 0, 0, 1, 0, 0]
+    mailboxes = batch_evaluation.pack_positions([Mailbox.from_fen(fen) for fen in FENS])
+    assert (mailboxes.codes == packed.codes).all()
+
+    board = Board()
+    Game(board, Color.WHITE).start_game()
+    boards = batch_evaluation.pack_boards([board], [Color.WHITE])
+    assert (boards.codes[0] == packed.codes[0]).all()
+
+    planes = batch_evaluation.piece_planes(packed.codes)
+    assert planes.shape == (len(FENS), 12, 8, 8)
+    assert planes[0, 5, 0, 4] and planes[0, 11, 7, 4]  # kings on e1 and e8
+    assert planes[0].sum() == 32
+
+
+def test_terms():
+    bitboards = [BitBoard.from_fen(fen) for fen in FENS]
+    codes = batch_evaluation.pack_positions(bitboards).codes
+    for bitboard, material_score, piece_square_score, mobility_score in zip(
+            bitboards, batch_evaluation.material_scores(codes),
+            batch_evaluation.piece_square_scores(codes), batch_evaluation.mobility_scores(codes)):
+        assert material_score == material(bitboard, Color.WHITE) - material(bitboard, Color.BLACK)
+        expected = 0
+        for sq, code in enumerate(bitboard.piece_codes()):
+            if code >= 6:
+                expected -= PIECE_SQUARE_TABLES[code - 6][sq ^ 56]
+            elif code >= 0:
+                expected += PIECE_SQUARE_TABLES[code][sq]
+        assert piece_square_score == expected
+        assert mobility_score == _mobility(bitboard, COLORS[0]) - _mobility(bitboard, COLORS[1])
+
+
+def test_evaluate_batch():
+    packed = batch_evaluation.pack_positions([BitBoard.from_fen(STARTING_FEN), BitBoard.from_fen(
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1"), BitBoard.from_fen(
+        "rnb1kbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1")])
+    scores = batch_evaluation.evaluate_batch(packed)
+    assert scores.tolist()[:2] == [0, 0]
+    assert scores[2] < -800  # black is a queen down
@@ -0,0 +1,241 @@
+import pytest
+from chess.bitboard import (ALL_CASTLING_RIGHTS, BETWEEN, BISHOP, BLACK,
+                            BLACK_QUEENSIDE, CASTLING_MOVE, EN_PASSANT_MOVE,
+                            KING, KING_ATTACKS, KNIGHT, KNIGHT_ATTACKS, PAWN,
+                            PAWN_ATTACKS, ROOK, STARTING_FEN, WHITE,
+                            WHITE_KINGSIDE, WHITE_QUEENSIDE,
+                            BitBoard, bishop_attacks, decode_move,
+                            encode_move, iter_squares, pop_count,
+                            rook_attacks, square, square_position)
+from chess.board import Board
+from chess.enums import Color
+from chess.exceptions import FenParseError
+from chess.game import Game
+from chess.mailbox import Mailbox
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+from chess.position import Position
+
+
+@pytest.fixture()
+def bitboard():
+    board = Board()
+    game = Game(board, Color.WHITE)
+    game.start_game()
+    return BitBoard.from_board(board)
+
+
+def test_square():
+    assert square(Position(x=0, y=0)) == 0
+    assert square(Position(x=7, y=0)) == 7
+    assert square(Position(x=4, y=3)) == 28
+    assert square_position(28) == Position(x=4, y=3)
+    assert square_position(63) == Position(x=7, y=7)
+
+
+def test_iter_squares():
+    assert list(iter_squares(0)) == []
+    assert list(iter_squares(1 | 1 << 9 | 1 << 63)) == [0, 9, 63]
+    assert pop_count(1 | 1 << 9 | 1 << 63) == 3
+
+
+def test_jump_tables():
+    assert set(iter_squares(KNIGHT_ATTACKS[0])) == {10, 17}
+    assert pop_count(KNIGHT_ATTACKS[square(Position(x=4, y=4))]) == 8
+    assert set(iter_squares(KING_ATTACKS[0])) == {1, 8, 9}
+    assert set(iter_squares(PAWN_ATTACKS[WHITE][square(Position(x=4, y=1))])) == {
+        square(Position(x=3, y=2)), square(Position(x=5, y=2))}
+    assert set(iter_squares(PAWN_ATTACKS[BLACK][square(Position(x=0, y=6))])) == {
+        square(Position(x=1, y=5))}
+
+
+def test_between():
+    assert set(iter_squares(BETWEEN[0][3])) == {1, 2}
+    assert set(iter_squares(BETWEEN[0][63])) == {9, 18, 27, 36, 45, 54}
+    assert BETWEEN[0][1] == 0
+    assert BETWEEN[0][17] == 0  # knight path
+
+
+def test_sliding_attacks():
+    occupied = 1 << square(Position(x=4, y=6))
+    attacks = rook_attacks(square(Position(x=4, y=4)), occupied)
+    assert pop_count(attacks) == 7 + 2 + 4
+    assert attacks & occupied
+    assert not attacks & 1 << square(Position(x=4, y=7))
+
+    attacks = bishop_attacks(square(Position(x=0, y=0)), 1 << 27)
+    assert set(iter_squares(attacks)) == {9, 18, 27}
+
+
+def test_from_board(bitboard):
+    assert pop_count(bitboard.occupied) == 32
+    assert bitboard.occupancy(Color.WHITE) == 0xFFFF
+    assert bitboard.occupancy(Color.BLACK) == 0xFFFF << 48
+    assert bitboard.pieces(Color.WHITE, Pawn) == 0xFF00
+    assert bitboard.pieces(Color.BLACK, King) == 1 << 60
+    assert bitboard.piece_at(3) == (Color.WHITE, Queen)
+    assert bitboard.piece_at(62) == (Color.BLACK, Knight)
+    assert bitboard.piece_at(30) is None
+    assert bitboard.castling_rights == ALL_CASTLING_RIGHTS
+
+
+def test_to_board(bitboard):
+    board = bitboard.to_board()
+    assert len(board.get_pieces()) == 32
+    rook = board[7][0].piece
+    assert isinstance(rook, Rook)
+    assert rook.color is Color.BLACK
+    assert rook.pos == Position(x=0, y=7)
+    assert BitBoard.from_board(board).occupied == bitboard.occupied
+
+
+def test_move_piece(bitboard):
+    copy = bitboard.copy()
+    captured = bitboard.move_piece(square(Position(x=3, y=0)), square(Position(x=3, y=6)))
+    assert bitboard.piece_at(square(Position(x=3, y=6))) == (Color.WHITE, Queen)
+    assert bitboard.piece_at(square(Position(x=3, y=0))) is None
+    assert captured != -1
+    assert pop_count(bitboard.occupied) == 31
+    assert pop_count(copy.occupied) == 32
+
+
+def test_is_free_path(bitboard):
+    assert not bitboard.is_free_path(square(Position(x=0, y=0)), square(Position(x=0, y=3)))
+    assert bitboard.is_free_path(square(Position(x=0, y=1)), square(Position(x=0, y=3)))
+    assert bitboard.is_free_path(square(Position(x=1, y=0)), square(Position(x=2, y=2)))
+
+
+def test_is_square_attacked():
+    bitboard = BitBoard()
+    bitboard.put_piece(square(Position(x=0, y=0)), WHITE, 3)  # rook
+    bitboard.put_piece(square(Position(x=0, y=4)), BLACK, 1)  # knight
+    assert bitboard.is_square_attacked(square(Position(x=0, y=3)), Color.WHITE)
+    assert bitboard.is_square_attacked(square(Position(x=0, y=4)), Color.WHITE)
+    assert not bitboard.is_square_attacked(square(Position(x=0, y=5)), Color.WHITE)
+    assert bitboard.is_square_attacked(square(Position(x=1, y=2)), Color.BLACK)
+    assert not bitboard.is_square_attacked(square(Position(x=1, y=2)), Color.WHITE)
+    assert bitboard.attacks_from(square(Position(x=0, y=4))) == KNIGHT_ATTACKS[32]
+
+    board = Board()
+    board[3][3].put_piece(Bishop(Color.BLACK, Position(x=3, y=3)))
+    board[0][0].put_piece(King(Color.WHITE, Position(x=0, y=0)))
+    bitboard = BitBoard.from_board(board)
+    assert bitboard.is_square_attacked(0, Color.BLACK)
+
+
+def perft(bitboard, depth):
+    moves = bitboard.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        bitboard.make_move(move)
+        nodes += perft(bitboard, depth - 1)
+        bitboard.unmake_move()
+    return nodes
+
+
+def test_legal_moves(bitboard):
+    bitboard.castling_rights = ALL_CASTLING_RIGHTS
+    assert len(bitboard.legal_moves()) == 20
+    assert perft(bitboard, 3) == 8902
+    assert sorted(bitboard.legal_moves(1 << square(Position(x=6, y=0)))) == sorted([
+        encode_move(6, square(Position(x=5, y=2))),
+        encode_move(6, square(Position(x=7, y=2)))])
+
+
+def test_legal_moves_pin_and_check():
+    bitboard = BitBoard()
+    bitboard.put_piece(square(Position(x=4, y=0)), WHITE, KING)
+    bitboard.put_piece(square(Position(x=4, y=1)), WHITE, KNIGHT)  # pinned
+    bitboard.put_piece(square(Position(x=4, y=7)), BLACK, ROOK)
+    bitboard.put_piece(square(Position(x=0, y=7)), BLACK, KING)
+    assert not bitboard.legal_moves(1 << square(Position(x=4, y=1)))
+
+    bitboard.remove_piece(square(Position(x=4, y=1)))
+    bitboard.put_piece(square(Position(x=0, y=3)), WHITE, BISHOP)
+    assert bitboard.is_check()
+    # Bishop can only block the check, king can't stay on the file
+    assert [decode_move(move).to for move in bitboard.legal_moves(
+        1 << square(Position(x=0, y=3)))] == [Position(x=4, y=7)]
+    assert Position(x=4, y=1) not in [decode_move(move).to for move in bitboard.legal_moves()]
+
+
+def test_make_unmake_move(bitboard):
+    bitboard.castling_rights = ALL_CASTLING_RIGHTS
+    occupied = bitboard.occupied
+    bitboard.make_move(bitboard.find_move(square(Position(x=4, y=1)), square(Position(x=4, y=3))))
+    assert bitboard.turn is Color.BLACK
+    assert bitboard.ep_square == square(Position(x=4, y=2))
+    bitboard.unmake_move()
+    assert bitboard.turn is Color.WHITE
+    assert bitboard.ep_square == -1
+    assert bitboard.occupied == occupied
+
+
+def test_special_moves():
+    bitboard = BitBoard()
+    bitboard.put_piece(square(Position(x=4, y=0)), WHITE, KING)
+    bitboard.put_piece(square(Position(x=7, y=0)), WHITE, ROOK)
+    bitboard.put_piece(square(Position(x=4, y=4)), WHITE, PAWN)
+    bitboard.put_piece(square(Position(x=1, y=6)), WHITE, PAWN)
+    bitboard.put_piece(square(Position(x=4, y=7)), BLACK, KING)
+    bitboard.put_piece(square(Position(x=3, y=6)), BLACK, PAWN)
+    bitboard.castling_rights = WHITE_KINGSIDE
+
+    move = bitboard.find_move(4, 6)
+    assert move is not None and move & CASTLING_MOVE
+    bitboard.make_move(move)
+    assert bitboard.piece_at(5) == (Color.WHITE, Rook)
+    assert bitboard.castling_rights == 0
+    bitboard.unmake_move()
+    assert bitboard.piece_at(7) == (Color.WHITE, Rook)
+    assert bitboard.castling_rights == WHITE_KINGSIDE
+
+    promotions = bitboard.legal_moves(1 << square(Position(x=1, y=6)))
+    assert len(promotions) == 4
+    bitboard.make_move(bitboard.find_move(square(Position(x=1, y=6)), square(Position(x=1, y=7)), KNIGHT))
+    assert bitboard.piece_at(square(Position(x=1, y=7))) == (Color.WHITE, Knight)
+
+    bitboard.make_move(bitboard.find_move(square(Position(x=3, y=6)), square(Position(x=3, y=4))))
+    move = bitboard.find_move(square(Position(x=4, y=4)), square(Position(x=3, y=5)))
+    assert move is not None and move & EN_PASSANT_MOVE
+    bitboard.make_move(move)
+    assert bitboard.piece_at(square(Position(x=3, y=4))) is None
+    bitboard.unmake_move()
+    assert bitboard.piece_at(square(Position(x=3, y=4))) == (Color.BLACK, Pawn)
+
+
+def test_from_fen(bitboard):
+    fen_bitboard = BitBoard.from_fen(STARTING_FEN)
+    assert fen_bitboard._squares == bitboard._squares
+    assert fen_bitboard.castling_rights == ALL_CASTLING_RIGHTS
+    assert fen_bitboard.turn is Color.WHITE
+
+    fen_bitboard = BitBoard.from_fen("8/8/8/3pP3/8/8/8/k6K w - d6 0 3")
+    assert fen_bitboard.ep_square == square(Position(x=3, y=5))
+    assert fen_bitboard.castling_rights == 0
+
+    with pytest.raises(FenParseError):
+        BitBoard.from_fen("8/8/8 w - -")
+    with pytest.raises(FenParseError):
+        BitBoard.from_fen("8/8/8/8/8/8/8/7X w - -")
+
+
+@pytest.mark.parametrize("position_type", [BitBoard, Mailbox])
+def test_from_fen_drops_castling_rights_without_pieces(position_type):
+    assert position_type.from_fen("4k3/8/8/8/8/8/8/4K3 w K - 0 1").castling_rights == 0
+    assert position_type.from_fen("r3k3/8/8/8/8/8/8/R3K1R1 w KQkq - 0 1").castling_rights == \
+        WHITE_QUEENSIDE | BLACK_QUEENSIDE
+    game = Game.from_fen("4k3/8/8/8/8/8/8/4K3 w K - 0 1")
+    assert all(move.to != Position(x=6, y=0) for move in game.legal_moves())
+
+
+def test_is_repetition(bitboard):
+    moves = [(6, square(Position(x=5, y=2))), (62, square(Position(x=5, y=5))),
+             (square(Position(x=5, y=2)), 6), (square(Position(x=5, y=5)), 62)]
+    for from_sq, to_sq in moves:
+        assert not bitboard.is_repetition()
+        bitboard.make_move(bitboard.find_move(from_sq, to_sq))
+    assert bitboard.is_repetition()
+    assert bitboard.piece_type_at(6) == KNIGHT
+    assert bitboard.piece_type_at(30) == -1
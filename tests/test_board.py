@@ -2,7 +2,8 @@ import pytest
 from chess.board import Board
 from chess.cell import Cell
 from chess.enums import Color
-from chess.pieces import Knight
+from chess.exceptions import NotPieceError
+from chess.pieces import Knight, Rook
 from chess.position import Position
 
 
@@ -92,3 +93,48 @@ def test_is_free_roadmap(board):
     roadmap = board.create_horizontal_roadmap(
         Position(x=5, y=3), Position(x=3, y=3))
     assert board.is_free_roadmap(roadmap[:-1])
+
+
+def test_make_unmake_move(board):
+    knight = Knight(Color.WHITE, Position(x=1, y=0))
+    rook = Rook(Color.BLACK, Position(x=2, y=2))
+    board[0][1].put_piece(knight)
+    board[2][2].put_piece(rook)
+
+    board.make_move(Position(x=1, y=0), Position(x=2, y=2))
+    assert board[0][1].piece is None
+    assert board[2][2].piece is knight
+    assert knight.pos == Position(x=2, y=2)
+    assert knight.was_move
+    assert board.get_pieces() == [knight]
+
+    board.unmake_move()
+    assert board[0][1].piece is knight
+    assert board[2][2].piece is rook
+    assert knight.pos == Position(x=1, y=0)
+    assert not knight.was_move
+
+    with pytest.raises(NotPieceError):
+        board.make_move(Position(x=5, y=5), Position(x=5, y=6))
+
+
+def test_attack_map(board):
+    rook = Rook(Color.WHITE, Position(x=0, y=0))
+    knight = Knight(Color.BLACK, Position(x=0, y=4))
+    board[0][0].put_piece(rook)
+    board[4][0].put_piece(knight)
+    assert board.is_attacked(Position(x=0, y=4), Color.WHITE)
+    assert not board.is_attacked(Position(x=0, y=5), Color.WHITE)
+    assert board.attackers(Position(x=1, y=2), Color.BLACK) == {knight}
+    assert board.attack_count(Position(x=0, y=2), Color.WHITE) == 1
+
+    board.make_move(Position(x=0, y=4), Position(x=1, y=2))  # ray opens
+    assert board.is_attacked(Position(x=0, y=7), Color.WHITE)
+    assert board.attack_count(Position(x=1, y=6), Color.BLACK) == 0
+    assert board.is_attacked(Position(x=0, y=0), Color.BLACK)
+
+    board.unmake_move()
+    assert not board.is_attacked(Position(x=0, y=7), Color.WHITE)
+    assert set(board.piece_attacks(knight)) == {
+        Position(x=1, y=2), Position(x=2, y=3), Position(x=2, y=5),
+        Position(x=1, y=6)}
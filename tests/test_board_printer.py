@@ -0,0 +1,54 @@
+import io
+
+from chess.board import Board
+from chess.board_printer import BoardPrinter
+from chess.enums import Color
+from chess.game import Game
+from chess.position import Position
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def _started_game():
+    board = Board()
+    game = Game(board, Color.WHITE)
+    game.start_game()
+    return board, game
+
+
+def test_prints_whole_board_if_not_terminal():
+    board, game = _started_game()
+    output = io.StringIO()
+    board_printer = BoardPrinter(board, output)
+    board_printer.print()
+    first = f"{board}\n"
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    board_printer.print()
+    assert output.getvalue() == f"{first}{board}\n"
+
+
+def test_redraws_changed_cells_on_terminal():
+    board, game = _started_game()
+    output = _Terminal()
+    board_printer = BoardPrinter(board, output)
+    board_printer.print()
+    assert output.getvalue() == f"\x1b[H\x1b[2J{board}\n"
+
+    output.seek(0)
+    output.truncate()
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    board_printer.print()
+    # e2 is line 2 and e4 is line 4, cell e is column 12
+    assert output.getvalue() == f"\x1b[2;12H{board[1][4]}\x1b[4;12H{board[3][4]}\x1b[12;1H\x1b[J"
+
+    output.seek(0)
+    output.truncate()
+    board_printer.print()
+    assert output.getvalue() == "\x1b[12;1H\x1b[J"
+
+    board_printer.reset()
+    board_printer.print()
+    assert output.getvalue().endswith(f"\x1b[H\x1b[2J{board}\n")
@@ -0,0 +1,66 @@
+import pytest
+from chess.bitboard import STARTING_FEN, BitBoard, square
+from chess.board import Board
+from chess.engine import MATE_SCORE, Engine, SearchLimits
+from chess.enums import Color
+from chess.game import Game
+from chess.position import Position
+from chess.transposition import TranspositionTable
+
+
+@pytest.fixture()
+def engine():
+    return Engine(TranspositionTable(1))
+
+
+def test_mate_in_one(engine):
+    bitboard = BitBoard.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    result = engine.search(bitboard, SearchLimits(depth=3))
+    assert result.best_move.from_ == Position(x=0, y=0)
+    assert result.best_move.to == Position(x=0, y=7)
+    assert result.score == MATE_SCORE - 1
+    assert result.is_mate_score
+    assert result.pv[0] == result.move
+    assert bitboard.key == BitBoard.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1").key
+
+
+def test_wins_material(engine):
+    bitboard = BitBoard.from_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    result = engine.search(bitboard, SearchLimits(depth=2))
+    assert result.move == bitboard.find_move(square(Position(x=3, y=1)), square(Position(x=3, y=4)))
+    assert result.score > 0
+
+
+def test_no_moves(engine):
+    result = engine.search(BitBoard.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"))
+    assert result.move is None
+    assert result.score == 0
+    result = engine.search(BitBoard.from_fen("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1"))
+    assert result.move is None
+    assert result.score == -MATE_SCORE
+
+
+def test_limits(engine):
+    bitboard = BitBoard.from_fen(STARTING_FEN)
+    iterations = []
+    result = engine.search(bitboard, SearchLimits(depth=3), iterations.append)
+    assert [iteration.depth for iteration in iterations] == [1, 2, 3]
+    assert result.depth == 3
+    assert len(result.pv) == 3
+
+    result = engine.search(bitboard, SearchLimits(nodes=3000))
+    assert result.nodes <= 3000
+    assert result.move in bitboard.legal_moves()
+
+    result = engine.search(bitboard, SearchLimits(time=0.2))
+    assert result.seconds < 1
+    assert result.move in bitboard.legal_moves()
+
+
+def test_search_game():
+    game = Game(Board(), Color.WHITE)
+    game.start_game()
+    result = Engine().search(game.bitboard, SearchLimits(depth=2))
+    move = result.best_move
+    game.move(move.from_, move.to, move.promotion)
+    assert game.current_move_color is Color.BLACK
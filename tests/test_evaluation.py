@@ -0,0 +1,55 @@
+import pytest
+from chess.bitboard import BitBoard
+from chess.board import Board
+from chess.enums import Color
+from chess.evaluation import evaluate
+from chess.game import Game
+from chess.mailbox import Mailbox
+from chess.perft import load_perft_positions
+from chess.piece_square import (ENDGAME_SCORES, MAX_PHASE, MIDDLEGAME_SCORES,
+                                PHASES)
+from chess.position import Position
+
+
+def _terms(bitboard):
+    codes = [(sq, code) for sq, code in enumerate(bitboard.piece_codes()) if code >= 0]
+    return (sum(MIDDLEGAME_SCORES[code][sq] for sq, code in codes),
+            sum(ENDGAME_SCORES[code][sq] for sq, code in codes),
+            sum(PHASES[code] for _, code in codes))
+
+
+@pytest.mark.parametrize("position_type", [BitBoard, Mailbox])
+def test_incremental_terms(position_type):
+    # Positions have captures, promotions, castling and en passant among their moves
+    for position in load_perft_positions():
+        bitboard = position_type.from_fen(position.fen)
+        terms = _terms(bitboard)
+        for move in bitboard.legal_moves():
+            bitboard.make_move(move)
+            assert (bitboard.middlegame_score, bitboard.endgame_score, bitboard.phase) == _terms(bitboard)
+            bitboard.unmake_move()
+        assert (bitboard.middlegame_score, bitboard.endgame_score, bitboard.phase) == terms
+
+
+def test_evaluate():
+    bitboard = BitBoard.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert bitboard.phase == MAX_PHASE
+    assert evaluate(bitboard) == 0
+    bitboard.make_move(bitboard.find_move(12, 28))  # e4 centralizes pawn
+    assert evaluate(bitboard) < 0
+
+    bitboard = BitBoard.from_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+    assert bitboard.phase == 0
+    assert evaluate(bitboard) == bitboard.endgame_score
+    bitboard.turn = Color.BLACK
+    assert evaluate(bitboard) == -bitboard.endgame_score
+
+
+def test_game_evaluate():
+    game = Game(Board(), Color.WHITE)
+    game.start_game()
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    game.move(Position(x=3, y=6), Position(x=3, y=4))
+    score = game.evaluate()
+    game.move(Position(x=4, y=3), Position(x=3, y=4))  # pawn takes pawn
+    assert game.evaluate() < -score - 50
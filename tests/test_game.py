@@ -1,7 +1,17 @@
 import pytest
+from chess.bitboard import STARTING_FEN, BitBoard
 from chess.board import Board
+from chess.controlled_cell import ControlledCell
 from chess.enums import Color
-from chess.game import Game
+from chess.exceptions import (CheckMate, FenParseError, HiddenCheckError,
+                              InvalidColorError, NotPieceError,
+                              SnapshotFormatError, Stalemate,
+                              UnpossibleMoveError)
+from chess.game import SNAPSHOT_VERSION, Game
+from chess.mailbox import Mailbox
+from chess.move_path import MovePath
+from chess.pieces import King, Knight, Pawn, Rook
+from chess.position import Position
 
 
 @pytest.fixture()
@@ -19,3 +29,226 @@ def test_revert_color(game):
     assert game._current_move_color is Color.BLACK
     game._revert_color()
     assert game._current_move_color is Color.WHITE
+
+
+def test_move(game):
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    assert game.current_move_color is Color.BLACK
+    assert isinstance(game._board[3][4].piece, Pawn)
+    assert game._board[1][4].piece is None
+
+
+
+def test_pieces_placed_after_construction():
+    board = Board()
+    game = Game(board, Color.WHITE)
+    board[0][4].put_piece(King(Color.WHITE, Position(x=4, y=0)))
+    board[0][0].put_piece(Rook(Color.WHITE, Position(x=0, y=0)))
+    board[7][4].put_piece(King(Color.BLACK, Position(x=4, y=7)))
+    assert MovePath(from_=Position(x=0, y=0), to=Position(x=0, y=6)) in game.legal_moves()
+    game.move(Position(x=0, y=0), Position(x=0, y=6))
+    assert game.to_fen() == "4k3/R7/8/8/8/8/8/4K3 b - - 1 1"
+
+    board[7][0].put_piece(Knight(Color.BLACK, Position(x=0, y=7)))
+    game.move(Position(x=0, y=7), Position(x=1, y=5))
+    assert game.to_fen() == "4k3/R7/1n6/8/8/8/8/4K3 w - - 2 2"
+
+def test_move_blocked_path(game):
+    with pytest.raises(UnpossibleMoveError):
+        game.move(Position(x=0, y=0), Position(x=0, y=3))  # rook behind pawn
+    with pytest.raises(UnpossibleMoveError):
+        game.move(Position(x=1, y=0), Position(x=3, y=1))  # knight on own pawn
+    with pytest.raises(UnpossibleMoveError):
+        game.move(Position(x=4, y=1), Position(x=5, y=2))  # pawn diagonal without beat
+    with pytest.raises(NotPieceError):
+        game.move(Position(x=4, y=3), Position(x=4, y=4))
+    with pytest.raises(InvalidColorError):
+        game.move(Position(x=4, y=6), Position(x=4, y=4))
+
+
+def test_moves_are_not_kept_for_undo(game):
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    game.move(Position(x=6, y=7), Position(x=5, y=5))
+    game.move(Position(x=6, y=0), Position(x=5, y=2))
+    game.move(Position(x=5, y=5), Position(x=4, y=3))
+    game.move(Position(x=5, y=0), Position(x=2, y=3))
+    game.move(Position(x=4, y=3), Position(x=5, y=5))
+    game.move(Position(x=4, y=0), Position(x=6, y=0))  # castling
+    assert game._board._undo_stack == []
+    assert isinstance(game._board[0][5].piece, Rook)
+
+
+
+def test_move_history_is_bounded(game):
+    knights = [(Position(x=6, y=0), Position(x=5, y=2)), (Position(x=6, y=7), Position(x=5, y=5)),
+               (Position(x=5, y=2), Position(x=6, y=0)), (Position(x=5, y=5), Position(x=6, y=7))]
+    for _ in range(60):
+        for from_, to in knights:
+            game.move(from_, to)
+    assert game.halfmove_clock == 240
+    assert len(game._bitboard._history) == 100
+    assert game.bitboard.is_repetition()
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    assert len(game._bitboard._history) == 1
+    assert game.last_move is not None and not game.bitboard.is_repetition()
+
+
+def test_deprecated_check_helpers(game):
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    game.move(Position(x=3, y=6), Position(x=3, y=4))
+    game.move(Position(x=5, y=0), Position(x=1, y=4))  # check by bishop
+    with pytest.warns(DeprecationWarning), pytest.raises(HiddenCheckError):
+        game.check_hidden_check(Position(x=0, y=6), Position(x=0, y=5))
+    with pytest.warns(DeprecationWarning):
+        game.check_hidden_check(Position(x=2, y=6), Position(x=2, y=5))
+    king, bishop = game._board[7][4].piece, game._board[4][1].piece
+    with pytest.warns(DeprecationWarning):
+        assert game.piece_can_will_be_beaten(king, [ControlledCell(pos=king.pos, piece=bishop)])
+    with pytest.warns(DeprecationWarning):
+        assert not game.piece_can_will_be_beaten(king, [ControlledCell(pos=bishop.pos, piece=bishop)])
+
+def test_hidden_check(game):
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    game.move(Position(x=3, y=6), Position(x=3, y=4))
+    game.move(Position(x=5, y=0), Position(x=1, y=4))  # check by bishop
+    with pytest.raises(HiddenCheckError):
+        game.move(Position(x=0, y=6), Position(x=0, y=5))
+    game.move(Position(x=2, y=6), Position(x=2, y=5))
+
+
+def test_checkmate(game):
+    game.move(Position(x=5, y=1), Position(x=5, y=2))
+    game.move(Position(x=4, y=6), Position(x=4, y=4))
+    game.move(Position(x=6, y=1), Position(x=6, y=3))
+    with pytest.raises(CheckMate) as exc_info:
+        game.move(Position(x=3, y=7), Position(x=7, y=3))
+    assert exc_info.value.color is Color.WHITE
+
+
+def test_checkmate_by_evasions():
+    # Check can be escaped only by pawn push blocking the bishop
+    game = Game.from_fen("3rk3/4b3/8/8/8/8/2P1PP2/4KB2 b - - 0 1")
+    game.move(Position(x=4, y=6), Position(x=1, y=3))
+    assert game.legal_moves() == [MovePath(Position(x=2, y=1), Position(x=2, y=2))]
+
+    game = Game.from_fen("3rk3/4b3/8/8/8/8/4PP2/4KB2 b - - 0 1")
+    with pytest.raises(CheckMate):
+        game.move(Position(x=4, y=6), Position(x=1, y=3))
+
+
+def test_stalemate():
+    game = Game.from_fen("7k/8/5QK1/8/8/8/8/8 w - - 0 1")
+    with pytest.raises(Stalemate) as exc_info:
+        game.move(Position(x=5, y=5), Position(x=5, y=6))
+    assert exc_info.value.color is Color.BLACK
+
+
+
+def test_player_without_king_and_moves_is_checkmated():
+    game = Game.from_fen("8/8/8/8/8/8/8/R7 w - - 0 1")
+    with pytest.raises(CheckMate) as exc_info:
+        game.move(Position(x=0, y=0), Position(x=0, y=1))
+    assert exc_info.value.color is Color.BLACK
+
+def test_legal_moves(game):
+    assert len(game.legal_moves()) == 20
+    assert set(game.legal_moves_from(Position(x=1, y=0))) == {
+        MovePath(Position(x=1, y=0), Position(x=0, y=2)),
+        MovePath(Position(x=1, y=0), Position(x=2, y=2))}
+    assert game.legal_moves_from(Position(x=1, y=7)) == []
+
+
+def test_castling_and_promotion():
+    board = Board()
+    board[0][4].put_piece(King(Color.WHITE, Position(x=4, y=0)))
+    board[0][7].put_piece(Rook(Color.WHITE, Position(x=7, y=0)))
+    board[6][0].put_piece(Pawn(Color.WHITE, Position(x=0, y=6)))
+    board[7][7].put_piece(King(Color.BLACK, Position(x=7, y=7)))
+    game = Game(board, Color.WHITE)
+
+    game.move(Position(x=4, y=0), Position(x=6, y=0))
+    assert isinstance(board[0][5].piece, Rook)
+    assert board[0][7].piece is None
+
+    game.move(Position(x=7, y=7), Position(x=6, y=7))
+    game.move(Position(x=0, y=6), Position(x=0, y=7), Knight)
+    assert isinstance(board[7][0].piece, Knight)
+
+
+def test_fen(game):
+    assert game.to_fen() == STARTING_FEN
+    game.move(Position(x=4, y=1), Position(x=4, y=3))
+    game.move(Position(x=6, y=7), Position(x=5, y=5))
+    assert game.to_fen() == "rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 1 2"
+
+    fen = "r3k2r/p6p/8/8/8/8/P6P/RR2K3 b Qkq - 3 20"
+    game = Game.from_fen(fen)
+    assert game.to_fen() == fen
+    assert game.current_move_color is Color.BLACK
+    assert game.zobrist_key == BitBoard.from_fen(fen).key
+    board = game._board
+    assert not board[0][4].piece.was_move
+    assert not board[0][0].piece.was_move
+    assert board[0][1].piece.was_move
+    assert not board[1][0].piece.was_move
+    assert board[6][7].piece.was_move is False
+    game.move(Position(x=4, y=7), Position(x=6, y=7))
+    assert isinstance(board[7][5].piece, Rook)
+
+    game = Game.from_fen("8/8/8/3pP3/8/8/8/k6K w - d6 0 3")
+    assert board is not game._board
+    assert game._board[4][4].piece.was_move
+    game.move(Position(x=4, y=4), Position(x=3, y=5))
+    assert game._board[4][3].piece is None
+
+    with pytest.raises(FenParseError):
+        Game.from_fen("8/8/8/8/8/8/8/k6K w - - x 1")
+
+
+def test_snapshot(game):
+    data = game.to_bytes()
+    assert len(data) == 39
+    assert Game.from_bytes(data).to_fen() == game.to_fen()
+
+    for from_, to in (((4, 1), (4, 3)), ((0, 6), (0, 4)), ((4, 3), (4, 4)), ((3, 6), (3, 4)), ((4, 0), (4, 1))):
+        game.move(Position(*from_), Position(*to))
+    restored = Game.from_bytes(game.to_bytes())
+    assert restored.to_fen() == game.to_fen() == "rnbqkbnr/1pp1pppp/8/p2pP3/8/8/PPPPKPPP/RNBQ1BNR b kq - 1 3"
+    assert restored.zobrist_key == game.zobrist_key
+    assert restored.game_is_started
+    assert restored.current_move_color is Color.BLACK
+    assert restored._board[1][4].piece.was_move
+    assert not restored._board[0][7].piece.was_move
+    restored.move(Position(x=5, y=6), Position(x=5, y=4))
+    restored.move(Position(x=4, y=4), Position(x=5, y=5))  # en passant from restored position
+    assert restored._board[4][5].piece is None
+
+
+def test_snapshot_of_mailbox_and_unstarted_game():
+    game = Game.from_fen("4k3/8/8/8/8/8/8/4K2R b K - 12 40", Mailbox)
+    restored = Game.from_bytes(game.to_bytes())
+    assert isinstance(restored.bitboard, Mailbox)
+    assert restored.to_fen() == "4k3/8/8/8/8/8/8/4K2R b K - 12 40"
+    game = Game(Board(), Color.BLACK)
+    restored = Game.from_bytes(game.to_bytes())
+    assert not restored.game_is_started
+    assert restored._color is Color.BLACK
+    assert restored._board.get_pieces() == []
+
+
+@pytest.mark.parametrize("counters", ["0 65536", "70000 1", "4294967295 4294967295"])
+def test_snapshot_of_large_move_counters(counters):
+    fen = f"4k3/8/8/8/8/8/8/4K3 w - - {counters}"
+    assert Game.from_bytes(Game.from_fen(fen).to_bytes()).to_fen() == fen
+
+
+def test_fen_move_counter_out_of_snapshot_range():
+    with pytest.raises(FenParseError):
+        Game.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 4294967296")
+
+
+def test_snapshot_format_error(game):
+    data = game.to_bytes()
+    for broken in (data[:10], data[:-1], bytes([SNAPSHOT_VERSION + 1]) + data[1:], data + b"\0"):
+        with pytest.raises(SnapshotFormatError):
+            Game.from_bytes(broken)
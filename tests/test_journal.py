@@ -0,0 +1,186 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import suppress
+
+import pytest
+from chess.exceptions import CheckMate, JournalFormatError, Stalemate
+from chess.game import Game
+from chess.journal import MoveJournal, recover_games
+from chess.position import Position
+from chess.server import GameServer
+
+
+def _random_move(game, rng):
+    path = rng.choice(game.legal_moves())
+    with suppress(CheckMate, Stalemate):
+        game.move(path.from_, path.to, path.promotion)
+
+
+def test_replay_move():
+    game = Game.from_fen("r3k3/1P6/8/8/8/8/8/4K2R w K - 7 30")
+    replayed = Game.from_bytes(game.to_bytes())
+    # Promotion with capture, king move and castling
+    for from_, to in [(Position(x=1, y=6), Position(x=0, y=7)), (Position(x=4, y=7), Position(x=3, y=6)),
+                      (Position(x=4, y=0), Position(x=6, y=0))]:
+        game.move(from_, to)
+        replayed.replay_move(game.last_move)
+        assert replayed.to_fen() == game.to_fen()
+    assert replayed.to_bytes() == game.to_bytes()
+
+
+def test_recover_games(tmp_path):
+    path = tmp_path / "games.journal"
+    rng = random.Random(0)
+    games = {game_id: Game.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+             for game_id in range(1, 4)}
+    with MoveJournal(path, checkpoint_interval=5) as journal:
+        for game_id, game in games.items():
+            journal.add_game(game_id, game)
+        for _ in range(12):
+            for game_id, game in games.items():
+                _random_move(game, rng)
+                journal.record_move(game_id, game)
+        journal.remove_game(2)
+
+    recovered = recover_games(path)
+    assert sorted(recovered) == [1, 3]
+    for game_id in recovered:
+        assert recovered[game_id].to_fen() == games[game_id].to_fen()
+        assert recovered[game_id].last_move == games[game_id].last_move
+
+
+def test_torn_record_is_cut_off(tmp_path):
+    path = tmp_path / "games.journal"
+    game = Game.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    with MoveJournal(path) as journal:
+        journal.add_game(1, game)
+        _random_move(game, random.Random(1))
+        journal.record_move(1, game)
+        fen = game.to_fen()
+        _random_move(game, random.Random(1))
+        journal.record_move(1, game)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert recover_games(path)[1].to_fen() == fen
+    with MoveJournal(path) as journal:
+        journal.record_move(1, game)
+    assert recover_games(path)[1].to_fen() == game.to_fen()
+
+
+def test_illegal_move_ends_recovered_game(tmp_path):
+    path = tmp_path / "games.journal"
+    game = Game.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    with MoveJournal(path) as journal:
+        journal.add_game(1, game)
+        game.move(Position(x=4, y=1), Position(x=4, y=3))
+        journal.record_move(1, game)
+        fen = game.to_fen()
+        # The same pawn move again is not legal for black
+        journal.record_move(1, game)
+        game.move(Position(x=4, y=6), Position(x=4, y=4))
+        journal.record_move(1, game)
+    assert recover_games(path)[1].to_fen() == fen
+    with pytest.raises(ValueError):
+        Game.from_fen(fen).replay_move(game.last_move | 1 << 20)
+
+
+def test_compact(tmp_path):
+    path = tmp_path / "games.journal"
+    rng = random.Random(2)
+    game = Game.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    with MoveJournal(path, checkpoint_interval=4) as journal:
+        journal.add_game(1, game)
+        journal.add_game(2, Game.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+        for _ in range(10):
+            _random_move(game, rng)
+            journal.record_move(1, game)
+        journal.remove_game(2)
+        size = path.stat().st_size
+        journal.compact()
+        assert path.stat().st_size < size
+        _random_move(game, rng)
+        journal.record_move(1, game)
+    assert list(recover_games(path)) == [1]
+    assert recover_games(path)[1].to_fen() == game.to_fen()
+
+
+def test_sync_is_shared_by_threads(tmp_path, monkeypatch):
+    syncs = []
+
+    def fsync(fd):
+        syncs.append(fd)
+        time.sleep(0.01)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    games = {game_id: Game.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+             for game_id in range(1, 9)}
+    with MoveJournal(tmp_path / "games.journal", sync=True) as journal:
+        for game_id, game in games.items():
+            journal.add_game(game_id, game)
+        syncs.clear()
+
+        def play(game_id):
+            rng = random.Random(game_id)
+            for _ in range(10):
+                _random_move(games[game_id], rng)
+                journal.record_move(game_id, games[game_id])
+
+        threads = [threading.Thread(target=play, args=(game_id,)) for game_id in games]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert 0 < len(syncs) < 80
+    recovered = recover_games(tmp_path / "games.journal")
+    assert all(recovered[game_id].to_fen() == game.to_fen() for game_id, game in games.items())
+
+
+def test_format_error(tmp_path):
+    path = tmp_path / "games.journal"
+    path.write_bytes(b"\0" * 16)
+    with pytest.raises(JournalFormatError):
+        MoveJournal(path)
+    with pytest.raises(JournalFormatError):
+        recover_games(path)
+
+
+def test_server_recovers_games(tmp_path):
+    path = tmp_path / "games.journal"
+
+    async def play():
+        with MoveJournal(path) as journal:
+            server = GameServer(journal=journal)
+            assert await server.handle("new") == "ok 1"
+            assert await server.handle("new") == "ok 2"
+            assert await server.handle("m 1 e2 e4") == "ok black"
+            assert await server.handle("m 1 e7 e5") == "ok white"
+            assert await server.handle("close 2") == "ok"
+            return server.games[1].to_fen()
+
+    async def recover():
+        with MoveJournal(path) as journal:
+            server = GameServer(journal=journal, games=recover_games(path))
+            assert await server.handle("fen 1") == f"ok {fen}"
+            assert await server.handle("fen 2") == "error GameNotFoundError"
+            assert await server.handle("new") == "ok 2"
+
+    fen = asyncio.run(play())
+    asyncio.run(recover())
+
+
+def test_server_journals_game_restarted_before_move(tmp_path):
+    path = tmp_path / "games.journal"
+
+    async def play():
+        with MoveJournal(path) as journal:
+            server = GameServer(journal=journal)
+            await server.handle("new")
+            await server.handle("m 1 e2 e4")
+            await asyncio.gather(server.handle("s 1"), server.handle("m 1 e7 e5"), server.handle("m 1 d2 d4"))
+            return server.games[1].to_fen()
+
+    fen = asyncio.run(play())
+    assert recover_games(path)[1].to_fen() == fen
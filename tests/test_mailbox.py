@@ -0,0 +1,72 @@
+import pytest
+from chess.bitboard import STARTING_FEN, BitBoard
+from chess.board import Board
+from chess.enums import Color
+from chess.exceptions import CheckMate, HiddenCheckError
+from chess.game import Game
+from chess.mailbox import OFF_BOARD, Mailbox
+from chess.perft import load_perft_positions, perft
+from chess.pieces import Queen, Rook
+from chess.position import Position
+
+
+def test_sentinels():
+    mailbox = Mailbox()
+    assert len(mailbox._squares) == 120
+    assert mailbox._squares.count(OFF_BOARD) == 120 - 64
+
+
+@pytest.mark.parametrize("position", load_perft_positions())
+def test_perft_positions(position):
+    mailbox = Mailbox.from_fen(position.fen)
+    for depth, nodes in enumerate(position.nodes, 1):
+        if nodes > 10000:
+            break
+        assert perft(mailbox, depth) == nodes
+
+
+def test_same_as_bitboard():
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    mailbox = Mailbox.from_fen(fen)
+    bitboard = BitBoard.from_fen(fen)
+    assert mailbox.to_fen() == bitboard.to_fen()
+    assert sorted(mailbox.legal_moves()) == sorted(bitboard.legal_moves())
+    assert mailbox.pieces(Color.BLACK, Rook) == bitboard.pieces(Color.BLACK, Rook)
+    assert mailbox.occupied == bitboard.occupied
+    assert str(mailbox.to_board()) == str(bitboard.to_board())
+    assert Mailbox.from_board(bitboard.to_board()).to_fen() == bitboard.to_fen()
+    for move in bitboard.legal_moves():
+        mailbox.make_move(move)
+        bitboard.make_move(move)
+        assert mailbox.key == bitboard.key
+        assert mailbox.to_fen() == bitboard.to_fen()
+        mailbox.unmake_move()
+        bitboard.unmake_move()
+    assert mailbox.key == bitboard.key
+
+
+def test_copy():
+    mailbox = Mailbox.from_fen(STARTING_FEN)
+    copy = mailbox.copy()
+    copy.make_move(copy.find_move(12, 28))
+    assert mailbox.to_fen() == STARTING_FEN[:-4]
+    assert copy.piece_type_at(28) != mailbox.piece_type_at(28)
+    assert copy.turn is Color.BLACK
+
+
+def test_game_with_mailbox():
+    board = Board()
+    game = Game(board, Color.WHITE, Mailbox())
+    game.start_game()
+    assert isinstance(game.bitboard, Mailbox)
+    assert game.zobrist_key == BitBoard.from_fen(STARTING_FEN).key
+    for from_, to in (((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3))):
+        game.move(Position(*from_), Position(*to))
+    with pytest.raises(CheckMate):
+        game.move(Position(x=3, y=7), Position(x=7, y=3))
+    assert isinstance(board[3][7].piece, Queen)
+
+    game = Game.from_fen("4k3/8/8/8/8/8/3r4/4K3 w - - 0 1", Mailbox)
+    with pytest.raises(HiddenCheckError):
+        game.move(Position(x=4, y=0), Position(x=3, y=0))
+    assert game.to_fen() == "4k3/8/8/8/8/8/3r4/4K3 w - - 0 1"
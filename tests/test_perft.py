@@ -0,0 +1,34 @@
+import pytest
+from chess.bitboard import STARTING_FEN, BitBoard
+from chess.main import main
+from chess.perft import PerftPosition, load_perft_positions, perft, run_perft
+
+
+def test_load_perft_positions():
+    positions = load_perft_positions()
+    assert len(positions) == 7
+    assert positions[0].fen == STARTING_FEN
+    assert positions[0].nodes[:3] == (20, 400, 8902)
+
+
+@pytest.mark.parametrize("position", load_perft_positions())
+def test_perft_positions(position):
+    bitboard = BitBoard.from_fen(position.fen)
+    for depth, nodes in enumerate(position.nodes, 1):
+        if nodes > 100000:
+            break
+        assert perft(bitboard, depth) == nodes
+
+
+def test_run_perft():
+    results = list(run_perft(PerftPosition(fen=STARTING_FEN, nodes=(20, 401)), 2))
+    assert [result.nodes for result in results] == [20, 400]
+    assert results[0].is_correct
+    assert not results[1].is_correct
+
+
+def test_perft_command(capsys):
+    assert main(["perft", "--depth", "2", "--fen", STARTING_FEN]) == 0
+    out = capsys.readouterr().out
+    assert "nodes          400" in out
+    assert "nodes/s" in out
@@ -0,0 +1,90 @@
+import io
+
+import pytest
+from chess.bitboard import KNIGHT, BitBoard, decode_move
+from chess.exceptions import SanParseError
+from chess.main import main
+from chess.pgn import parse_san, read_games, replay, replay_games
+from chess.pieces import Knight
+from chess.position import Position
+
+PGN = """[Event "Scholar's mate"]
+[White "A \\"B\\" C"]
+[Result "1-0"]
+
+1. e4 e5 2. Bc4 {attacks f7 (weak)} Nc6 (2... Nf6 3. d3) 3. Qh5 $2 Nf6?? ; hangs mate
+4. Qxf7# 1-0
+
+[Event "Illegal"]
+
+1. e4 e5 2. Ke3 *
+
+1. d4 d5 2. Nf3 Nf6 1/2-1/2
+"""
+
+
+def test_read_games():
+    games = list(read_games(io.StringIO(PGN)))
+    assert len(games) == 3
+    assert games[0].headers == {"Event": "Scholar's mate", "White": 'A "B" C', "Result": "1-0"}
+    assert games[0].moves == ["e4", "e5", "Bc4", "Nc6", "Qh5", "Nf6??", "Qxf7#"]
+    assert games[0].result == "1-0"
+    assert games[1].result == "*"
+    assert games[2].headers == {}
+    assert games[2].moves == ["d4", "d5", "Nf3", "Nf6"]
+
+
+def test_parse_san():
+    bitboard = BitBoard.from_fen("r3k3/1P6/8/8/8/8/8/R3K1NR w KQq - 0 1")
+    assert decode_move(parse_san(bitboard, "O-O-O")).to == Position(x=2, y=0)
+    assert decode_move(parse_san(bitboard, "Nf3+")).from_ == Position(x=6, y=0)
+    move = parse_san(bitboard, "bxa8=N")
+    assert decode_move(move).promotion is Knight
+    assert move >> 12 & 7 == KNIGHT
+    with pytest.raises(SanParseError):
+        parse_san(bitboard, "O-O")  # knight is in the way
+    with pytest.raises(SanParseError):
+        parse_san(bitboard, "Qd4")
+    with pytest.raises(SanParseError):
+        parse_san(bitboard, "b8")  # promotion piece is missing
+
+    bitboard = BitBoard.from_fen("4k3/8/8/8/8/8/4K3/R6R w - - 0 1")
+    with pytest.raises(SanParseError):
+        parse_san(bitboard, "Rd1")  # ambiguous
+    assert parse_san(bitboard, "Rad1") == bitboard.find_move(0, 3)
+    assert parse_san(bitboard, "Rhd1") == bitboard.find_move(7, 3)
+
+
+def test_replay():
+    results = list(replay_games(io.StringIO(PGN)))
+    assert results[0].is_legal
+    assert results[0].is_checkmate
+    assert results[0].plies == 7
+    assert not results[1].is_legal
+    assert results[1].plies == 2
+    assert "Ke3" in results[1].error
+    assert results[2].is_legal
+    assert not results[2].is_checkmate
+
+    game = next(read_games(io.StringIO('[FEN "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"]\n1. Kxe2 *')))
+    assert replay(game).is_legal
+    game = next(read_games(io.StringIO('[FEN "4k3/8/8/8/8/8/3r4/4K3 w - - 0 1"]\n1. Kd1 *')))
+    assert "HiddenCheckError" in replay(game).error
+
+    game = next(read_games(io.StringIO("1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# Ke7 *")))
+    result = replay(game)
+    assert (result.plies, result.error, result.is_checkmate) == (7, "Ke7 after checkmate", True)
+    game = next(read_games(io.StringIO("1. f3 e5 2. g4 Qh4# Nc3 *")))
+    assert replay(game).error == "Nc3 after checkmate"
+    game = next(read_games(io.StringIO('[FEN "4k3/8/8/8/8/8/8/R7 w - - 0 1"]\n1. O-O *')))
+    assert replay(game).error == "unknown move O-O"
+
+
+def test_pgn_command(tmp_path, capsys):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    assert main(["pgn", str(path)]) == 1
+    out = capsys.readouterr().out
+    assert "game 2: illegal at ply 3" in out
+    assert "3 games, 2 legal, 1 checkmates" in out
+    assert "games/s" in out
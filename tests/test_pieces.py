@@ -136,11 +136,13 @@ def test_pawn():
     piece.move_to(Position(x=3, y=2))
     assert not piece.can_move_to(Position(x=3, y=0))
 
+    # Beat after first move
+    assert piece.can_move_to(Position(x=4, y=1))
+    assert piece.can_move_to(Position(x=2, y=1))
+
     # Knight
     assert not piece.can_move_to(Position(x=4, y=5))
     assert not piece.can_move_to(Position(x=2, y=5))
-    assert not piece.can_move_to(Position(x=4, y=1))
-    assert not piece.can_move_to(Position(x=2, y=1))
     assert not piece.can_move_to(Position(x=1, y=2))
     assert not piece.can_move_to(Position(x=1, y=4))
     assert not piece.can_move_to(Position(x=5, y=2))
@@ -152,3 +154,38 @@ def test_pawn():
     assert not piece.can_move_to(Position(x=1, y=1))
     assert not piece.can_move_to(Position(x=5, y=5))
     assert not piece.can_move_to(Position(x=1, y=5))
+
+
+def test_move_back():
+    piece = Pawn(Color.WHITE, Position(x=3, y=1))
+    piece.move_to(Position(x=3, y=3))
+    assert piece.was_move
+    piece.move_back(Position(x=3, y=1), False)
+    assert not piece.was_move
+    assert piece.pos == Position(x=3, y=1)
+    assert piece.can_move_to(Position(x=3, y=3))
+    assert piece.can_move_to(Position(x=4, y=2))
+
+    piece = King(Color.WHITE, Position(x=4, y=0))
+    piece.move_to(Position(x=4, y=1))
+    assert not piece.can_move_to(Position(x=6, y=1))
+    piece.move_back(Position(x=4, y=0), False)
+    assert piece.can_move_to(Position(x=6, y=0))
+
+
+def test_shared_rules():
+    first = Pawn(Color.WHITE, Position(x=3, y=1))
+    second = Pawn(Color.WHITE, Position(x=4, y=1))
+    assert first.rules is second.rules
+    first.move_to(Position(x=3, y=2))
+    assert first.rules is not second.rules
+    second.move_to(Position(x=4, y=2))
+    assert first.rules is second.rules
+    assert Pawn(Color.BLACK, Position(x=3, y=6)).rules is not Pawn(Color.WHITE, Position(x=3, y=1)).rules
+
+
+def test_slots():
+    piece = Rook(Color.WHITE, Position(x=0, y=0))
+    assert not hasattr(piece, "__dict__")
+    assert str(piece) == str(Rook(Color.WHITE, Position(x=7, y=0)))
+    assert str(piece) != str(Rook(Color.BLACK, Position(x=7, y=0)))
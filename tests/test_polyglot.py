@@ -0,0 +1,104 @@
+import io
+import pickle
+
+import pytest
+from chess.bitboard import STARTING_FEN, BitBoard
+from chess.board import Board
+from chess.enums import Color
+from chess.exceptions import BookFormatError
+from chess.game import Game
+from chess.main import main
+from chess.polyglot import (OpeningBook, build_book, decode_book_move,
+                            encode_book_move, polyglot_key)
+from chess.position import Position
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. O-O 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 1/2-1/2
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+"""
+
+
+@pytest.mark.parametrize("fen, key", [
+    (STARTING_FEN, 0x463B96181691FC9C),
+    ("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1", 0x823C9B50FD114196),
+    ("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3", 0x22A48B5A8E47FF78),
+    ("rnbq1bnr/ppp1pkpp/8/3pPp2/8/8/PPPPKPPP/RNBQ1BNR w - - 0 4", 0x00FDD303C946BDD9),
+])
+def test_polyglot_key(fen, key):
+    assert polyglot_key(BitBoard.from_fen(fen)) == key
+
+
+def test_castling_move():
+    bitboard = BitBoard.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    move = bitboard.find_move(4, 6)
+    book_move = encode_book_move(move)
+    assert book_move == 7 | 4 << 6  # king takes own rook
+    assert decode_book_move(bitboard, book_move) == move
+    assert decode_book_move(bitboard, 0 | 4 << 6) == bitboard.find_move(4, 2)
+    assert decode_book_move(bitboard, 60 | 4 << 6) is None
+
+
+@pytest.fixture()
+def book(tmp_path):
+    path = tmp_path / "book.bin"
+    # moves of the loser score nothing and are left out
+    assert build_book(io.StringIO(PGN), path) == 6
+    with OpeningBook(path) as book:
+        yield book
+
+
+def test_book_moves(book):
+    assert len(book) == 6
+    bitboard = BitBoard.from_fen(STARTING_FEN)
+    moves = book.moves(bitboard)
+    assert [(move.path.from_, move.path.to, move.weight) for move in moves] == [
+        (Position(x=4, y=1), Position(x=4, y=3), 3)]
+    assert book.choose(bitboard).move == moves[0].move
+
+    bitboard = BitBoard.from_fen("r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4")
+    castling = book.moves(bitboard)[0]
+    assert castling.path.to == Position(x=6, y=0)
+    assert book.moves(BitBoard.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")) == []
+
+
+def test_book_with_game(book):
+    game = Game(Board(), Color.WHITE)
+    game.start_game()
+    book_move = book.choose(game.bitboard)
+    while book_move is not None:
+        path = book_move.path
+        game.move(path.from_, path.to, path.promotion)
+        book_move = book.choose(game.bitboard)
+    assert game.to_fen() == "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6 0 2"
+
+
+def test_book_pickle(book):
+    copy = pickle.loads(pickle.dumps(book))
+    assert copy.path == book.path
+    assert copy.moves(BitBoard.from_fen(STARTING_FEN)) == book.moves(BitBoard.from_fen(STARTING_FEN))
+    copy.close()
+
+
+def test_book_format(tmp_path):
+    path = tmp_path / "book.bin"
+    path.write_bytes(b"\0" * 17)
+    with pytest.raises(BookFormatError):
+        OpeningBook(path)
+    path.write_bytes(b"")
+    assert OpeningBook(path).entries(0) == []
+
+
+def test_book_command(tmp_path, capsys):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(PGN)
+    assert main(["book", str(pgn_path), str(tmp_path / "book.bin"), "--plies", "2"]) == 0
+    assert "3 entries" in capsys.readouterr().out
+    assert len(OpeningBook(tmp_path / "book.bin")) == 3
@@ -1,3 +1,4 @@
+import pytest
 from chess.enums import Color
 from chess.position import Position
 from chess.rules import (CastlingMoveRule, DiagonalMoveRule,
@@ -20,36 +21,38 @@ def test_horizontal_move_rule_is_valid_path():
 
 def test_horizontal_move_rule_controlled_fields_from_position():
     rule = HorizontalMoveRule(7)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=0, y=4),
-        Position(x=1, y=4),
-        Position(x=2, y=4),
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=3, y=4),
-        Position(x=7, y=4),
+        Position(x=2, y=4),
+        Position(x=1, y=4),
+        Position(x=0, y=4),
+        Position(x=5, y=4),
         Position(x=6, y=4),
-        Position(x=5, y=4)
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
-        Position(x=7, y=0),
-        Position(x=6, y=0),
-        Position(x=5, y=0),
-        Position(x=4, y=0),
-        Position(x=3, y=0),
+        Position(x=7, y=4),
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
+        Position(x=1, y=0),
         Position(x=2, y=0),
-        Position(x=1, y=0)
-    ]
+        Position(x=3, y=0),
+        Position(x=4, y=0),
+        Position(x=5, y=0),
+        Position(x=6, y=0),
+        Position(x=7, y=0),
+    )
 
     rule = HorizontalMoveRule(2)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=2, y=4),
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=3, y=4),
-        Position(x=6, y=4),
+        Position(x=2, y=4),
         Position(x=5, y=4),
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
+        Position(x=6, y=4),
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
+        Position(x=1, y=0),
         Position(x=2, y=0),
-        Position(x=1, y=0)
-    ]
+    )
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) is rule.controlled_fields_from_position(
+        Position(x=4, y=4))
 
 
 def test_vertical_move_rule_is_valid_path():
@@ -65,36 +68,36 @@ def test_vertical_move_rule_is_valid_path():
 
 def test_vertical_move_rule_controlled_fields_from_position():
     rule = VerticalMoveRule(7)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=4, y=0),
-        Position(x=4, y=1),
-        Position(x=4, y=2),
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=4, y=3),
-        Position(x=4, y=7),
+        Position(x=4, y=2),
+        Position(x=4, y=1),
+        Position(x=4, y=0),
+        Position(x=4, y=5),
         Position(x=4, y=6),
-        Position(x=4, y=5)
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
-        Position(x=0, y=7),
-        Position(x=0, y=6),
-        Position(x=0, y=5),
-        Position(x=0, y=4),
-        Position(x=0, y=3),
+        Position(x=4, y=7),
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
+        Position(x=0, y=1),
         Position(x=0, y=2),
-        Position(x=0, y=1)
-    ]
+        Position(x=0, y=3),
+        Position(x=0, y=4),
+        Position(x=0, y=5),
+        Position(x=0, y=6),
+        Position(x=0, y=7),
+    )
 
     rule = VerticalMoveRule(2)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=4, y=2),
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=4, y=3),
+        Position(x=4, y=2),
+        Position(x=4, y=5),
         Position(x=4, y=6),
-        Position(x=4, y=5)
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
+        Position(x=0, y=1),
         Position(x=0, y=2),
-        Position(x=0, y=1)
-    ]
+    )
 
 
 def test_diagonal_move_rule_is_valid_path():
@@ -111,7 +114,7 @@ def test_diagonal_move_rule_is_valid_path():
 
 def test_diagonal_move_rule_controlled_fields_from_position():
     rule = DiagonalMoveRule(7)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=5, y=3),
         Position(x=6, y=2),
         Position(x=7, y=1),
@@ -127,20 +130,20 @@ def test_diagonal_move_rule_controlled_fields_from_position():
 
         Position(x=3, y=5),
         Position(x=2, y=6),
-        Position(x=1, y=7)
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
+        Position(x=1, y=7),
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
         Position(x=1, y=1),
         Position(x=2, y=2),
         Position(x=3, y=3),
         Position(x=4, y=4),
         Position(x=5, y=5),
         Position(x=6, y=6),
-        Position(x=7, y=7)
-    ]
+        Position(x=7, y=7),
+    )
 
     rule = DiagonalMoveRule(2)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=5, y=3),
         Position(x=6, y=2),
 
@@ -151,12 +154,12 @@ def test_diagonal_move_rule_controlled_fields_from_position():
         Position(x=6, y=6),
 
         Position(x=3, y=5),
-        Position(x=2, y=6)
-    ]
-    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == [
+        Position(x=2, y=6),
+    )
+    assert rule.controlled_fields_from_position(Position(x=0, y=0)) == (
         Position(x=1, y=1),
-        Position(x=2, y=2)
-    ]
+        Position(x=2, y=2),
+    )
 
 
 def test_knight_move_rule_is_valid_path():
@@ -178,7 +181,7 @@ def test_knight_move_rule_is_valid_path():
 
 def test_knight_move_rule_controlled_fields_from_position():
     rule = KnightMoveRule()
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
         Position(x=6, y=5),
         Position(x=6, y=3),
 
@@ -189,16 +192,16 @@ def test_knight_move_rule_controlled_fields_from_position():
         Position(x=3, y=6),
 
         Position(x=5, y=2),
-        Position(x=3, y=2)
-    ]
+        Position(x=3, y=2),
+    )
 
-    assert rule.controlled_fields_from_position(Position(x=1, y=1)) == [
+    assert rule.controlled_fields_from_position(Position(x=1, y=1)) == (
         Position(x=3, y=2),
         Position(x=3, y=0),
 
         Position(x=2, y=3),
-        Position(x=0, y=3)
-    ]
+        Position(x=0, y=3),
+    )
 
 
 def test_pawn_straight_move_rule_is_valid_path():
@@ -223,9 +226,9 @@ def test_pawn_straight_move_rule_is_valid_path():
 
 def test_pawn_straight_move_rule_controlled_fields_from_position():
     rule = PawnStraightMoveRule(1, Color.WHITE)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == []
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == ()
     rule = PawnStraightMoveRule(1, Color.BLACK)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == []
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == ()
 
 
 def test_pawn_beat_move_rule_is_valid_path():
@@ -254,28 +257,28 @@ def test_pawn_beat_move_rule_is_valid_path():
 
 def test_pawn_beat_move_rule_controlled_fields_from_position():
     rule = PawnBeatMoveRule(Color.WHITE)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=3, y=5), Position(x=5, y=5)]
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
+        Position(x=3, y=5), Position(x=5, y=5))
     assert rule.controlled_fields_from_position(
-        Position(x=0, y=0)) == [Position(x=1, y=1)]
-    assert rule.controlled_fields_from_position(Position(x=4, y=7)) == []
-    assert not rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=3, y=3), Position(x=5, y=3)]
+        Position(x=0, y=0)) == (Position(x=1, y=1),)
+    assert rule.controlled_fields_from_position(Position(x=4, y=7)) == ()
+    assert not rule.controlled_fields_from_position(Position(x=4, y=4)) == (
+        Position(x=3, y=3), Position(x=5, y=3))
     assert not rule.controlled_fields_from_position(
-        Position(x=7, y=7)) == [Position(x=6, y=6)]
-    assert not rule.controlled_fields_from_position(Position(x=4, y=0)) == []
+        Position(x=7, y=7)) == (Position(x=6, y=6),)
+    assert not rule.controlled_fields_from_position(Position(x=4, y=0)) == ()
 
     rule = PawnBeatMoveRule(Color.BLACK)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=3, y=3), Position(x=5, y=3)]
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == (
+        Position(x=3, y=3), Position(x=5, y=3))
     assert rule.controlled_fields_from_position(
-        Position(x=7, y=7)) == [Position(x=6, y=6)]
-    assert rule.controlled_fields_from_position(Position(x=4, y=0)) == []
-    assert not rule.controlled_fields_from_position(Position(x=4, y=4)) == [
-        Position(x=3, y=5), Position(x=5, y=5)]
+        Position(x=7, y=7)) == (Position(x=6, y=6),)
+    assert rule.controlled_fields_from_position(Position(x=4, y=0)) == ()
+    assert not rule.controlled_fields_from_position(Position(x=4, y=4)) == (
+        Position(x=3, y=5), Position(x=5, y=5))
     assert not rule.controlled_fields_from_position(
-        Position(x=0, y=0)) == [Position(x=1, y=1)]
-    assert not rule.controlled_fields_from_position(Position(x=4, y=7)) == []
+        Position(x=0, y=0)) == (Position(x=1, y=1),)
+    assert not rule.controlled_fields_from_position(Position(x=4, y=7)) == ()
 
 
 def test_castling_move_rule_is_valid_path():
@@ -294,6 +297,23 @@ def test_castling_move_rule_is_valid_path():
 
 def test_castling_move_rule_controlled_fields_from_position():
     rule = CastlingMoveRule(Color.WHITE)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == []
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == ()
     rule = CastlingMoveRule(Color.BLACK)
-    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == []
+    assert rule.controlled_fields_from_position(Position(x=4, y=4)) == ()
+
+
+def test_rules_are_shared():
+    assert HorizontalMoveRule(7) is HorizontalMoveRule(7)
+    assert HorizontalMoveRule(7) is not HorizontalMoveRule(1)
+    assert HorizontalMoveRule(7) is not VerticalMoveRule(7)
+    assert KnightMoveRule() is KnightMoveRule()
+    assert PawnBeatMoveRule(Color.WHITE) is PawnBeatMoveRule(Color.WHITE)
+    assert PawnBeatMoveRule(Color.WHITE) is not PawnBeatMoveRule(Color.BLACK)
+
+
+def test_rules_are_shared_by_keyword_arguments():
+    assert HorizontalMoveRule(max_move_length=7) is HorizontalMoveRule(7)
+    assert PawnStraightMoveRule(1, color=Color.BLACK) is PawnStraightMoveRule(max_move_length=1, color=Color.BLACK)
+    assert PawnStraightMoveRule(color=Color.WHITE, max_move_length=2) is PawnStraightMoveRule(2, Color.WHITE)
+    with pytest.raises(TypeError):
+        HorizontalMoveRule(length=7)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chess.server import GameServer, generate_load, percentile
+
+
+def test_percentile():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 0.5) == 50
+    assert percentile(samples, 0.99) == 99
+    assert percentile([], 0.5) == 0
+
+
+def test_commands():
+    async def run():
+        server = GameServer()
+        assert await server.handle("new") == "ok 1"
+        assert await server.handle("m 1 f2 f3") == "ok black"
+        assert await server.handle("move 1 f2 f4") == "error NotPieceError"
+        assert await server.handle("move 1 e2 e4") == "error InvalidColorError"
+        assert await server.handle("move 1 e7 e4") == "error UnpossibleMoveError"
+        assert await server.handle("move 1 e7") == "error ArgumentsCountError"
+        assert await server.handle("move 1 e7 e9") == "error MovePathParseError"
+        assert await server.handle("move 2 e7 e5") == "error GameNotFoundError"
+        assert await server.handle("castle 1") == "error CommandNotExistsError"
+        assert "e7e5" in (await server.handle("moves 1")).split()
+        assert await server.handle("move 1 e7 e5") == "ok white"
+        assert await server.handle("move 1 g2 g4") == "ok black"
+        assert await server.handle("move 1 d8 h4") == "checkmate white"
+        assert await server.handle("fen 1") == "ok rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+        assert (await server.handle("stats")).startswith("ok games=1 moves=4 ")
+        assert await server.handle("s 1") == "ok"
+        assert await server.handle("moves 1") == "ok " + " ".join(
+            ["b1a3", "b1c3", "g1f3", "g1h3"] + [f"{file}2{file}{rank}" for file in "abcdefgh" for rank in "34"])
+        assert await server.handle("close 1") == "ok"
+        assert await server.handle("fen 1") == "error GameNotFoundError"
+        assert await server.handle("exit") is None
+
+    asyncio.run(run())
+
+
+def test_slow_move_does_not_stall_other_games():
+    async def run():
+        server = GameServer(ThreadPoolExecutor(2))
+        await server.handle("new")
+        await server.handle("new")
+        server.games[1]._check_checkmate = lambda color: time.sleep(0.5)
+        started_at = time.perf_counter()
+        slow_move = asyncio.ensure_future(server.handle("move 1 e2 e4"))
+        await asyncio.sleep(0.05)
+        assert await server.handle("move 2 e2 e4") == "ok black"
+        assert time.perf_counter() - started_at < 0.4
+        assert await slow_move == "ok black"
+
+    asyncio.run(run())
+
+
+def test_commands_queued_behind_start_and_close():
+    async def run():
+        server = GameServer()
+        await server.handle("new")
+        await server.handle("m 1 e2 e4")
+        replies = await asyncio.gather(server.handle("s 1"), server.handle("m 1 e7 e5"), server.handle("fen 1"))
+        assert replies[:2] == ["ok", "error InvalidColorError"]
+        assert replies[2] == "ok rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+        replies = await asyncio.gather(server.handle("close 1"), server.handle("m 1 e2 e4"), server.handle("fen 1"))
+        assert replies == ["ok", "error GameNotFoundError", "error GameNotFoundError"]
+
+    asyncio.run(run())
+
+
+def test_load_over_sockets(tmp_path):
+    async def run():
+        server = GameServer()
+        for address in ({"path": str(tmp_path / "chess.sock")}, {"port": 0}):
+            listener = await server.start(**address)
+            port = listener.sockets[0].getsockname()[1] if "port" in address else 0
+            async with listener:
+                report = await generate_load(4, 3, port=port, path=address.get("path"), seed=1)
+            assert report.moves == 12
+            assert report.p50 <= report.p99
+            assert report.server_stats.startswith("ok games=0 ")
+        assert len(server.move_latencies) == 24
+
+    asyncio.run(run())
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+from chess.bitboard import BLACK, COLORS, KING, PAWN, ROOK, WHITE, BitBoard
+from chess.engine import MATE_SCORE, Engine, SearchLimits
+from chess.enums import Outcome
+from chess.exceptions import TablebaseFormatError
+from chess.game import Game
+from chess.main import main
+from chess.pieces import Pawn, Queen, Rook
+from chess.position import Position
+from chess.tablebase import (INVALID, LOSS, TABLE_SIZE, Tablebase,
+                             generate_tablebases, open_tablebases,
+                             parse_signature, probe_tablebases)
+
+
+@pytest.fixture(scope="module")
+def tablebases(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("tablebases")
+    generate_tablebases(["KPK"], directory, workers=1)
+    tablebases = open_tablebases(directory)
+    yield {tablebase.piece_type: tablebase for tablebase in tablebases}
+    for tablebase in tablebases:
+        tablebase.close()
+
+
+def _position(piece_type, index):
+    bitboard = BitBoard()
+    bitboard.put_piece(index >> 12 & 63, WHITE, KING)
+    bitboard.put_piece(index >> 6 & 63, WHITE, piece_type)
+    bitboard.put_piece(index & 63, BLACK, KING)
+    bitboard.turn = COLORS[index >> 18]
+    return bitboard
+
+
+def test_parse_signature():
+    assert parse_signature("KQK") is Queen
+    assert parse_signature("kpk") is Pawn
+    for signature in ("KKK", "KQRK", "QKK"):
+        with pytest.raises(ValueError):
+            parse_signature(signature)
+
+
+@pytest.mark.parametrize("piece_type, max_moves", [(Queen, 10), (Rook, 16), (Pawn, 28)])
+def test_longest_mates(tablebases, piece_type, max_moves):
+    tablebase = tablebases[piece_type]
+    values = [tablebase.value(index) for index in range(TABLE_SIZE)]
+    assert max(value for value in values if value < LOSS) == 2 * max_moves - 1
+    assert max(value for value in values if value != INVALID) == LOSS + 2 * max_moves
+
+
+@pytest.mark.parametrize("fen, outcome, plies", [
+    ("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1", Outcome.WIN, 1),
+    ("Q6k/8/6K1/8/8/8/8/8 b - - 0 1", Outcome.LOSS, 0),
+    ("8/8/8/8/8/6k1/8/q6K w - - 0 1", Outcome.LOSS, 0),
+    ("8/8/8/8/8/8/2k5/K2R4 b - - 0 1", Outcome.DRAW, 0),  # rook is not defended
+    ("7k/5K2/6Q1/8/8/8/8/8 b - - 0 1", Outcome.DRAW, 0),  # stalemate
+    ("8/4k3/8/4K3/4P3/8/8/8 w - - 0 1", Outcome.DRAW, 0),  # black has opposition
+    ("8/4k3/8/4K3/4P3/8/8/8 b - - 0 1", Outcome.LOSS, 28),
+    ("8/8/8/4p3/4k3/8/4K3/8 b - - 0 1", Outcome.DRAW, 0),
+    ("k7/8/1K6/P7/8/8/8/8 w - - 0 1", Outcome.DRAW, 0),  # rook pawn
+])
+def test_probe(tablebases, fen, outcome, plies):
+    result = probe_tablebases(tablebases.values(), BitBoard.from_fen(fen))
+    assert (result.outcome, result.plies) == (outcome, plies)
+
+
+@pytest.mark.parametrize("piece_type", [Rook, Pawn])
+def test_values_agree_with_moves(tablebases, piece_type):
+    tablebase = tablebases[piece_type]
+    rng = random.Random(0)
+    checked = 0
+    while checked < 200:
+        index = rng.randrange(TABLE_SIZE)
+        value = tablebase.value(index)
+        if value == INVALID:
+            continue
+        checked += 1
+        bitboard = _position(ROOK if piece_type is Rook else PAWN, index)
+        children = []
+        for move in bitboard.legal_moves():
+            bitboard.make_move(move)
+            children.append(probe_tablebases(tablebases.values(), bitboard))
+            bitboard.unmake_move()
+        # Children without table are drawn captures and minor piece promotions
+        wins = [result.plies for result in children if result is not None and result.outcome is Outcome.LOSS]
+        if value == 0:
+            assert not wins
+        elif value < LOSS:
+            assert min(wins) + 1 == value
+        else:
+            assert all(result is not None and result.outcome is Outcome.WIN for result in children)
+            assert max((result.plies + 1 for result in children), default=0) == value - LOSS
+
+
+def test_engine_uses_tablebases(tablebases):
+    engine = Engine(tablebases=list(tablebases.values()))
+    result = engine.search(BitBoard.from_fen("8/8/8/4k3/8/8/8/KR6 w - - 0 1"), SearchLimits(depth=6))
+    assert result.depth == 1
+    assert result.score == MATE_SCORE - 29
+    result = engine.search(BitBoard.from_fen("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1"))
+    assert result.score == MATE_SCORE - 1
+    assert result.best_move.to == Position(x=1, y=7)
+
+
+def test_game_probe(tablebases):
+    game = Game.from_fen("4k3/8/4K3/4P3/8/8/8/8 b - - 0 1")
+    assert game.probe_tablebases(tablebases.values()).outcome is Outcome.LOSS
+    game = Game.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+    assert game.probe_tablebases(tablebases.values()) is None
+
+
+def test_format_error(tmp_path):
+    path = tmp_path / "KQK.tb"
+    path.write_bytes(b"\0" * 100)
+    with pytest.raises(TablebaseFormatError):
+        Tablebase(path)
+
+
+def test_cli_rejects_signature(tmp_path, capsys):
+    assert main(["tablebase", "KQRK", "-o", str(tmp_path)]) == 2
+    assert "KQRK" in capsys.readouterr().out
@@ -0,0 +1,49 @@
+from chess.enums import Bound
+from chess.transposition import ENTRY_SIZE, TranspositionTable
+
+
+def test_size():
+    table = TranspositionTable(1)
+    assert table.size_bytes == 1024 * 1024
+    assert len(table) == 1024 * 1024 // ENTRY_SIZE
+    assert TranspositionTable(1.5).size_bytes == 1024 * 1024
+
+
+def test_store_and_probe():
+    table = TranspositionTable(1)
+    key = 0x1234_5678_9ABC_DEF0
+    assert table.probe(key) is None
+    table.store(key, 5, Bound.LOWER, -150, 1234)
+    entry = table.probe(key)
+    assert entry is not None
+    assert (entry.depth, entry.bound, entry.score, entry.move) == (5, Bound.LOWER, -150, 1234)
+    assert table.probe(key ^ 1 << 63) is None
+    assert table.hits == 1
+    assert table.probes == 3
+    assert table.hit_rate == 1 / 3
+
+    table.store(key, 6, Bound.EXACT, 20)
+    entry = table.probe(key)
+    assert (entry.depth, entry.bound, entry.score, entry.move) == (6, Bound.EXACT, 20, 1234)
+
+
+def test_replacement():
+    table = TranspositionTable(ENTRY_SIZE * 2 / (1024 * 1024))  # single bucket
+    table.store(1, 8, Bound.EXACT, 1)
+    table.store(2, 3, Bound.EXACT, 2)  # shallower goes to always replace entry
+    table.store(3, 2, Bound.EXACT, 3)
+    assert table.probe(1).score == 1
+    assert table.probe(2) is None
+    assert table.probe(3).score == 3
+    assert table.replacements == 1
+    assert table.replacement_rate == 1 / 3
+
+    table.new_search()
+    table.store(4, 1, Bound.UPPER, 4)  # old deep entry gives way
+    assert table.probe(1) is None
+    assert table.probe(4).score == 4
+    assert table.hashfull() == 500
+
+    table.clear()
+    assert table.probe(4) is None
+    assert table.stores == 0
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 from chess.board import Board
 from chess.board_printer import BoardPrinter
@@ -55,3 +57,15 @@ def test_parse_move_path(tui):
         ...
     else:
         assert False
+
+
+def test_game_end_is_printed(capsys):
+    game = Game.from_fen("7k/8/5QK1/8/8/8/8/8 w - - 0 1")
+    tui = TUI(game, BoardPrinter(game._board, io.StringIO()))
+    tui._handle_command("m f6 f7")
+    assert capsys.readouterr().out == "Stalemate, black has no moves\n"
+
+    game = Game.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    tui = TUI(game, BoardPrinter(game._board, io.StringIO()))
+    tui._handle_command("m a1 a8")
+    assert capsys.readouterr().out == "Checkmate, black lost\n"
@@ -0,0 +1,93 @@
+import io
+import time
+
+from chess.bitboard import STARTING_FEN, BitBoard
+from chess.engine import Engine
+from chess.transposition import TranspositionTable
+from chess.uci import UCI, move_to_uci, parse_uci_move
+
+
+def _uci():
+    output = io.StringIO()
+    return UCI(Engine(TranspositionTable(1)), output_stream=output), output
+
+
+def test_move_notation():
+    bitboard = BitBoard.from_fen("r3k3/1P6/8/8/8/8/8/4K2R w K - 0 1")
+    castling = parse_uci_move(bitboard, "e1g1")
+    assert move_to_uci(castling) == "e1g1"
+    assert move_to_uci(parse_uci_move(bitboard, "b7a8n")) == "b7a8n"
+    assert parse_uci_move(bitboard, "b7b8") is None
+    assert parse_uci_move(bitboard, "e1e3") is None
+    assert parse_uci_move(bitboard, "e1g1x") is None
+    assert parse_uci_move(bitboard, "z9") is None
+
+
+def test_position_is_kept_between_commands():
+    uci, output = _uci()
+    uci.handle("position startpos moves e2e4 e7e5 g1f3")
+    bitboard = uci.bitboard
+    uci.handle("position startpos moves e2e4 e7e5 g1f3 b8c6")
+    assert uci.bitboard is bitboard
+    assert bitboard.to_fen() == "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq -"
+    uci.handle("position startpos moves e2e4 c7c5")
+    assert uci.bitboard is bitboard
+    assert bitboard.to_fen() == "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6"
+    uci.handle("position fen 4k3/8/8/8/8/8/8/4K2R w K - 0 1 moves e1g1")
+    assert uci.bitboard.to_fen() == "4k3/8/8/8/8/8/8/5RK1 b - -"
+    uci.handle("position startpos moves e2e5")
+    assert "illegal move e2e5" in output.getvalue()
+    assert uci.bitboard.to_fen() == STARTING_FEN[:-4]
+
+
+def test_go_depth():
+    uci, output = _uci()
+    uci.handle("uci")
+    uci.handle("position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    uci.handle("go depth 3")
+    uci.wait()
+    lines = output.getvalue().splitlines()
+    assert lines[:3] == ["id name chess", "id author Madara", "uciok"]
+    assert "score mate 1" in lines[-2]
+    assert lines[-1] == "bestmove a1a8"
+
+
+def test_stop_interrupts_search():
+    uci, output = _uci()
+    uci.handle("go infinite")
+    uci.handle("isready")
+    time.sleep(0.2)
+    started_at = time.perf_counter()
+    uci.handle("stop")
+    assert time.perf_counter() - started_at < 1
+    lines = output.getvalue().splitlines()
+    assert "readyok" in lines
+    assert lines[-1].startswith("bestmove ")
+
+
+
+def test_command_during_infinite_search_stops_it():
+    uci, output = _uci()
+    uci.handle("go infinite")
+    time.sleep(0.2)
+    started_at = time.perf_counter()
+    uci.handle("position startpos moves e2e4")
+    assert time.perf_counter() - started_at < 1
+    assert output.getvalue().splitlines()[-1].startswith("bestmove ")
+    assert uci.bitboard.last_move is not None
+
+    uci.handle("go")
+    uci.handle("go depth 1")
+    uci.wait()
+    lines = output.getvalue().splitlines()
+    assert sum(line.startswith("bestmove ") for line in lines) == 3
+    assert lines[-1].startswith("bestmove ")
+
+def test_run_until_quit():
+    output = io.StringIO()
+    commands = io.StringIO("isready\ngo nodes 100\nquit\nisready\n")
+    UCI(Engine(TranspositionTable(1)), commands, output).run()
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "readyok"
+    assert lines[-1].startswith("bestmove ")
+    assert lines.count("readyok") == 1
@@ -4,8 +4,9 @@ from chess.utils import (convert_letter_num_to_letter,
                          convert_letter_to_letter_num,
                          filter_by_valid_positions, only_from_range,
                          reverse_color)
-from chess.utils.path import (is_diagonal_path, is_horizontal_path,
-                              is_knight_path, is_vertical_path)
+from chess.utils.path import (is_castling_path, is_diagonal_path,
+                              is_horizontal_path, is_knight_path,
+                              is_vertical_path)
 
 
 def test_is_horizontal_path():
@@ -100,3 +101,10 @@ def test_convert_letter_num_to_letter():
     assert convert_letter_num_to_letter(5) == "f"
     assert convert_letter_num_to_letter(6) == "g"
     assert convert_letter_num_to_letter(7) == "h"
+
+
+def test_is_castling_path():
+    assert is_castling_path(Position(x=4, y=0), Position(x=6, y=0))
+    assert is_castling_path(Position(x=4, y=7), Position(x=2, y=7))
+    assert not is_castling_path(Position(x=4, y=0), Position(x=6, y=7))
+    assert not is_castling_path(Position(x=4, y=3), Position(x=6, y=3))
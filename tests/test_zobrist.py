@@ -0,0 +1,68 @@
+import random
+
+import pytest
+from chess.bitboard import STARTING_FEN, BitBoard
+from chess.board import Board
+from chess.enums import Color
+from chess.game import Game
+from chess.perft import load_perft_positions
+from chess.position import Position
+
+
+@pytest.fixture()
+def game():
+    board = Board()
+    game = Game(board, Color.WHITE)
+    game.start_game()
+    return game
+
+
+def test_key_is_updated_incrementally():
+    rng = random.Random(0)
+    for position in load_perft_positions():
+        bitboard = BitBoard.from_fen(position.fen)
+        keys = []
+        for _ in range(40):
+            moves = bitboard.legal_moves()
+            if not moves:
+                break
+            keys.append(bitboard.key)
+            bitboard.make_move(rng.choice(moves))
+            assert bitboard.key == bitboard._compute_key()
+        while keys:
+            bitboard.unmake_move()
+            assert bitboard.key == keys.pop()
+
+
+def test_key_covers_position_state():
+    bitboard = BitBoard.from_fen(STARTING_FEN)
+    assert bitboard.key == BitBoard.from_fen(STARTING_FEN).key
+    assert bitboard.key != BitBoard.from_fen(STARTING_FEN.replace(" w ", " b ")).key
+    assert bitboard.key != BitBoard.from_fen(STARTING_FEN.replace("KQkq", "Qkq")).key
+
+    # En passant file counts only if the pawn can beat
+    assert (BitBoard.from_fen("4k3/8/8/8/4P3/8/8/4K3 b - e3").key ==
+            BitBoard.from_fen("4k3/8/8/8/4P3/8/8/4K3 b - -").key)
+    assert (BitBoard.from_fen("4k3/8/8/8/3pP3/8/8/4K3 b - e3").key !=
+            BitBoard.from_fen("4k3/8/8/8/3pP3/8/8/4K3 b - -").key)
+
+
+def test_game_zobrist_key(game):
+    start_key = game.zobrist_key
+    assert start_key == BitBoard.from_fen(STARTING_FEN).key
+
+    game.move(Position(x=6, y=0), Position(x=5, y=2))
+    assert game.zobrist_key != start_key
+    game.move(Position(x=6, y=7), Position(x=5, y=5))
+    game.move(Position(x=5, y=2), Position(x=6, y=0))
+    game.move(Position(x=5, y=5), Position(x=6, y=7))
+    assert game.zobrist_key == start_key
+
+    game.move(Position(x=4, y=1), Position(x=4, y=2))
+    game.move(Position(x=4, y=6), Position(x=4, y=5))
+    game.move(Position(x=4, y=0), Position(x=4, y=1))
+    game.move(Position(x=4, y=7), Position(x=4, y=6))
+    game.move(Position(x=4, y=1), Position(x=4, y=0))
+    game.move(Position(x=4, y=6), Position(x=4, y=7))
+    assert game.zobrist_key == BitBoard.from_fen(
+        "rnbqkbnr/pppp1ppp/4p3/8/8/4P3/PPPP1PPP/RNBQKBNR w - - 0 4").key